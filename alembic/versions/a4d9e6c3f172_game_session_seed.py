@@ -0,0 +1,24 @@
+"""Add game_sessions.seed
+
+Revision ID: a4d9e6c3f172
+Revises: f8c1d3b69e27
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a4d9e6c3f172'
+down_revision = 'f8c1d3b69e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('game_sessions', sa.Column('seed', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('game_sessions') as batch_op:
+        batch_op.drop_column('seed')
@@ -0,0 +1,28 @@
+"""Add job_leases for the background janitor
+
+Revision ID: a96e4b1f7c38
+Revises: f3c29d5e81a7
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a96e4b1f7c38'
+down_revision = 'f3c29d5e81a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_leases',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('holder', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('job_leases')
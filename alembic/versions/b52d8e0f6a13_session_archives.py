@@ -0,0 +1,39 @@
+"""Add session_archives for compacted session questions
+
+Revision ID: b52d8e0f6a13
+Revises: a96e4b1f7c38
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b52d8e0f6a13'
+down_revision = 'a96e4b1f7c38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('session_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('question_count', sa.Integer(), nullable=False),
+    sa.Column('format_version', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['game_sessions.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id')
+    )
+    op.create_index(op.f('ix_session_archives_id'), 'session_archives', ['id'], unique=False)
+    op.create_index(op.f('ix_session_archives_user_id'), 'session_archives', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_session_archives_user_id'), table_name='session_archives')
+    op.drop_index(op.f('ix_session_archives_id'), table_name='session_archives')
+    op.drop_table('session_archives')
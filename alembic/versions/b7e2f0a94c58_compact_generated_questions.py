@@ -0,0 +1,33 @@
+"""Add generator_version and seed to session_questions, age to game_sessions
+
+Revision ID: b7e2f0a94c58
+Revises: a4d9e6c3f172
+Create Date: 2026-10-19 00:00:00.000000
+
+Generated questions are rebuilt from these when stored compact (see
+app/services/question_store.py). Rows written before this revision have
+no seed and keep their payloads; rows written with compaction off can be
+compacted afterwards with `python -m app.services.question_store`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b7e2f0a94c58'
+down_revision = 'a4d9e6c3f172'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('game_sessions', sa.Column('age', sa.Integer(), nullable=True))
+    op.add_column('session_questions', sa.Column('generator_version', sa.String(), nullable=True))
+    op.add_column('session_questions', sa.Column('seed', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('session_questions') as batch_op:
+        batch_op.drop_column('seed')
+        batch_op.drop_column('generator_version')
+    with op.batch_alter_table('game_sessions') as batch_op:
+        batch_op.drop_column('age')
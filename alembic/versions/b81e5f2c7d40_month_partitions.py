@@ -0,0 +1,119 @@
+"""Add session_questions.created_at; optionally month-partition append-only tables
+
+Revision ID: b81e5f2c7d40
+Revises: b52d8e0f6a13
+Create Date: 2026-10-19 00:00:00.000000
+
+The created_at column is added everywhere. Converting session_questions
+and points_ledger to monthly range partitions only happens on PostgreSQL
+with PARTITION_TABLES=1 set; otherwise the tables are left as they are.
+Partitioned tables need the partition key in the primary key, so their
+primary key becomes (id, created_at).
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import get_settings
+from app.services.partitions import (
+    PARTITIONED_TABLES, PARTITION_KEY, add_months, create_month_partition, is_partitioned, month_start,
+)
+
+
+revision = 'b81e5f2c7d40'
+down_revision = 'b52d8e0f6a13'
+branch_labels = None
+depends_on = None
+
+
+def _indexes_and_foreign_keys(conn, table):
+    """Secondary index and foreign key definitions, to re-create on the new table."""
+    indexes = conn.execute(sa.text(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = :t "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE contype IN ('p', 'u'))"
+    ), {"t": table}).fetchall()
+    foreign_keys = conn.execute(sa.text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE contype = 'f' AND conrelid = CAST(:t AS regclass)"
+    ), {"t": table}).fetchall()
+    return indexes, foreign_keys
+
+
+def _swap_table(conn, table, create_sql, primary_key, months=()):
+    """Copy `table` into a new table built by `create_sql` and replace it."""
+    old = f"{table}_old"
+    indexes, foreign_keys = _indexes_and_foreign_keys(conn, table)
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    for name, _ in indexes:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_old")
+
+    op.execute(create_sql.format(table=table, old=old))
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})")
+    for month in months:
+        create_month_partition(conn, table, month)
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {old}")
+
+    for _, definition in indexes:
+        op.execute(definition)
+    for name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def _months_to_cover(conn, table):
+    first = conn.execute(sa.text(f"SELECT MIN({PARTITION_KEY}) FROM {table}")).scalar()
+    this_month = month_start(date.today())
+    month = month_start(first.date()) if first else this_month
+    last = add_months(this_month, get_settings().partition_months_ahead)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def upgrade():
+    op.add_column('session_questions', sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE session_questions SET created_at = COALESCE("
+        "(SELECT gs.started_at FROM game_sessions gs WHERE gs.id = session_questions.session_id), "
+        "started_at, CURRENT_TIMESTAMP) "
+        "WHERE created_at IS NULL"
+    )
+    op.execute("UPDATE points_ledger SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    with op.batch_alter_table('session_questions') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+    with op.batch_alter_table('points_ledger') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql" or not get_settings().partition_tables:
+        return
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(conn, table):
+            continue
+        _swap_table(
+            conn, table,
+            "CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({PARTITION_KEY})",
+            f"id, {PARTITION_KEY}",
+            months=_months_to_cover(conn, table),
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(conn, table):
+            # Dropping the parent drops its partitions with it
+            _swap_table(conn, table, "CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)", "id")
+
+    with op.batch_alter_table('points_ledger') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
+    with op.batch_alter_table('session_questions') as batch_op:
+        batch_op.drop_column('created_at')
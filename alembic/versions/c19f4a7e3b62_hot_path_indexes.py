@@ -0,0 +1,46 @@
+"""Add composite and unique indexes on hot lookup paths
+
+Revision ID: c19f4a7e3b62
+Revises: b81e5f2c7d40
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c19f4a7e3b62'
+down_revision = 'b81e5f2c7d40'
+branch_labels = None
+depends_on = None
+
+
+_UNIQUE = [
+    ('uq_user_character_progress_user_char', 'user_character_progress', ['user_id', 'character_id']),
+    ('uq_user_achievements_user_badge', 'user_achievements', ['user_id', 'badge_key']),
+    ('uq_quest_progress_user', 'quest_progress', ['user_id']),
+]
+
+_NON_UNIQUE = [
+    ('ix_game_sessions_user_completed', 'game_sessions', ['user_id', 'completed_at']),
+    ('ix_session_questions_session', 'session_questions', ['session_id']),
+    ('ix_points_ledger_user_created', 'points_ledger', ['user_id', 'created_at']),
+]
+
+
+def upgrade():
+    for name, table, columns in _UNIQUE:
+        # Racing inserts may have left duplicates; keep the oldest row
+        cols = ', '.join(columns)
+        op.execute(
+            f"DELETE FROM {table} WHERE id NOT IN ("
+            f"SELECT MIN(id) FROM {table} GROUP BY {cols})"
+        )
+        op.create_index(name, table, columns, unique=True)
+    for name, table, columns in _NON_UNIQUE:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(_NON_UNIQUE + _UNIQUE):
+        op.drop_index(name, table_name=table)
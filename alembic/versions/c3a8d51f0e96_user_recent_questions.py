@@ -0,0 +1,24 @@
+"""Add users.recent_questions
+
+Revision ID: c3a8d51f0e96
+Revises: b7e2f0a94c58
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c3a8d51f0e96'
+down_revision = 'b7e2f0a94c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('recent_questions', sa.String(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('recent_questions')
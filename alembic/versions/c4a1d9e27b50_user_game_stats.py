@@ -0,0 +1,40 @@
+"""Add user_game_stats completion counters
+
+Revision ID: c4a1d9e27b50
+Revises: b7e2f4a91c03
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c4a1d9e27b50'
+down_revision = 'b7e2f4a91c03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_game_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('game_type', sa.String(), nullable=False),
+    sa.Column('sessions_completed', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'game_type', name='uq_user_game_stats_user_game')
+    )
+    op.create_index(op.f('ix_user_game_stats_id'), 'user_game_stats', ['id'], unique=False)
+
+    # Seed counters from completed sessions so count badges keep working
+    op.execute(
+        "INSERT INTO user_game_stats (user_id, game_type, sessions_completed) "
+        "SELECT user_id, game_type, COUNT(*) FROM game_sessions "
+        "WHERE completed_at IS NOT NULL GROUP BY user_id, game_type"
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_user_game_stats_id'), table_name='user_game_stats')
+    op.drop_table('user_game_stats')
@@ -0,0 +1,26 @@
+"""Add users.pending_sessions and users.progress_version
+
+Revision ID: d4e1b7a25c39
+Revises: c3a8d51f0e96
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd4e1b7a25c39'
+down_revision = 'c3a8d51f0e96'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('pending_sessions', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('progress_version', sa.Integer(), server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('progress_version')
+        batch_op.drop_column('pending_sessions')
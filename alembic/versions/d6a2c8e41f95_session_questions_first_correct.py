@@ -0,0 +1,24 @@
+"""Add session_questions.first_correct
+
+Revision ID: d6a2c8e41f95
+Revises: c19f4a7e3b62
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd6a2c8e41f95'
+down_revision = 'c19f4a7e3b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('session_questions', sa.Column('first_correct', sa.Boolean(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('session_questions') as batch_op:
+        batch_op.drop_column('first_correct')
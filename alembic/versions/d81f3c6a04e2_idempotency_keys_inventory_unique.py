@@ -0,0 +1,44 @@
+"""Add idempotency_keys and unique (user_id, item_key) on user_inventory
+
+Revision ID: d81f3c6a04e2
+Revises: c4a1d9e27b50
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd81f3c6a04e2'
+down_revision = 'c4a1d9e27b50'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('idempotency_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('endpoint', sa.String(), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('response', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_id'), 'idempotency_keys', ['id'], unique=False)
+
+    # Double-tap purchases may have left duplicates; keep the oldest row
+    op.execute(
+        "DELETE FROM user_inventory WHERE id NOT IN ("
+        "SELECT MIN(id) FROM user_inventory GROUP BY user_id, item_key)"
+    )
+    op.create_index('uq_user_inventory_user_item', 'user_inventory', ['user_id', 'item_key'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_user_inventory_user_item', table_name='user_inventory')
+    op.drop_index(op.f('ix_idempotency_keys_id'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
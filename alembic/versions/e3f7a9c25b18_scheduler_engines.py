@@ -0,0 +1,40 @@
+"""Per-user scheduler choice, FSRS memory state and fitted scheduler weights
+
+Revision ID: e3f7a9c25b18
+Revises: d6a2c8e41f95
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e3f7a9c25b18'
+down_revision = 'd6a2c8e41f95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('scheduler', sa.String(), nullable=False, server_default='sm2'))
+    op.add_column('user_character_progress', sa.Column('fsrs_stability', sa.Float(), nullable=True))
+    op.add_column('user_character_progress', sa.Column('fsrs_difficulty', sa.Float(), nullable=True))
+    op.create_table(
+        'scheduler_params',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('engine', sa.String(), primary_key=True),
+        sa.Column('weights', sa.String(), nullable=False),
+        sa.Column('review_count', sa.Integer(), nullable=True),
+        sa.Column('log_loss', sa.Float(), nullable=True),
+        sa.Column('default_log_loss', sa.Float(), nullable=True),
+        sa.Column('fitted_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_params')
+    with op.batch_alter_table('user_character_progress') as batch_op:
+        batch_op.drop_column('fsrs_difficulty')
+        batch_op.drop_column('fsrs_stability')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('scheduler')
@@ -0,0 +1,23 @@
+"""Add game_sessions.request_results for idempotent answer/complete
+
+Revision ID: e5b07a2c9d14
+Revises: d81f3c6a04e2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e5b07a2c9d14'
+down_revision = 'd81f3c6a04e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('game_sessions', sa.Column('request_results', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('game_sessions', 'request_results')
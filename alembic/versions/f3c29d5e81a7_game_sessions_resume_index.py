@@ -0,0 +1,25 @@
+"""Index game_sessions (user_id, game_type, completed_at) for resuming
+
+Revision ID: f3c29d5e81a7
+Revises: e5b07a2c9d14
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = 'f3c29d5e81a7'
+down_revision = 'e5b07a2c9d14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_game_sessions_user_type_completed', 'game_sessions',
+        ['user_id', 'game_type', 'completed_at'], unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_game_sessions_user_type_completed', table_name='game_sessions')
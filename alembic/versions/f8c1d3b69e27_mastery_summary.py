@@ -0,0 +1,41 @@
+"""Per-user mastery summary kept by update_mastery
+
+Revision ID: f8c1d3b69e27
+Revises: e3f7a9c25b18
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f8c1d3b69e27'
+down_revision = 'e3f7a9c25b18'
+branch_labels = None
+depends_on = None
+
+LEVELS = range(6)
+
+
+def upgrade():
+    op.add_column('user_character_progress', sa.Column('previous_mastery_score', sa.Integer(), nullable=True))
+    op.create_table(
+        'user_mastery_summary',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        *(sa.Column(f'level_{level}', sa.Integer(), nullable=False, server_default='0') for level in LEVELS),
+        sa.Column('mastery_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('character_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        "INSERT INTO user_mastery_summary (user_id, "
+        + ", ".join(f"level_{level}" for level in LEVELS)
+        + ", mastery_sum, character_count) SELECT user_id, "
+        + ", ".join(f"SUM(CASE WHEN COALESCE(mastery_score, 0) = {level} THEN 1 ELSE 0 END)" for level in LEVELS)
+        + ", SUM(COALESCE(mastery_score, 0)), COUNT(*) FROM user_character_progress GROUP BY user_id"
+    )
+
+
+def downgrade():
+    op.drop_table('user_mastery_summary')
+    with op.batch_alter_table('user_character_progress') as batch_op:
+        batch_op.drop_column('previous_mastery_score')
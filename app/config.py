@@ -24,6 +24,7 @@ class Settings(BaseSettings):
     questions_per_session: int = 5
     max_sessions_per_day: int = 2  # 0 = unlimited; override via MAX_SESSIONS_PER_DAY
     distractors_per_question: int = 2  # + 1 correct = 3 options
+    session_resume_hours: int = 12  # reloads resume an unfinished session this recent
 
     # Scoring
     points_correct: int = 2
@@ -52,6 +53,42 @@ class Settings(BaseSettings):
     quest_stage_bonus_coins: int = 1
     quest_season_bonus_coins: int = 5
 
+    # Background janitor (abandoned sessions, stale idempotency keys, archiving)
+    janitor_enabled: bool = True
+    janitor_interval_minutes: int = 30
+    abandoned_session_hours: int = 24   # keep above session_resume_hours
+    idempotency_key_days: int = 7
+    archive_after_days: int = 30        # completed sessions older than this are archived; 0 = never
+    janitor_batch_size: int = 500
+    janitor_max_batches: int = 20       # per table per run
+
+    # PostgreSQL month partitions for session_questions / points_ledger
+    partition_tables: bool = False      # read by the b81e5f2c7d40 migration only
+    partition_months_ahead: int = 2
+
+    # FSRS scheduler (services/fsrs.py); weights are refitted by the janitor
+    fsrs_desired_retention: float = 0.9  # schedule the next review when recall odds fall to this
+    fsrs_min_reviews: int = 50           # fewer scored reviews than this keeps the default weights
+    fsrs_refit_hours: int = 24
+    fsrs_fits_per_run: int = 20
+
+    # Dashboard review forecast (services/forecast.py)
+    forecast_cache_seconds: int = 300   # bounds staleness from answers on other workers
+
+    # Precompiled static-mode questions (services/question_bank.py), built on startup if missing
+    question_bank_path: str = "question_bank.bin"   # "" generates every mode live
+
+    # Generated questions stored as (version, mode, seed) only (services/question_store.py)
+    compact_generated_questions: bool = True
+    rebuilt_session_cache_size: int = 512   # rebuilt sessions kept per worker
+
+    # Repeat suppression across sessions (services/recent_questions.py)
+    recent_question_sessions: int = 3   # a question isn't asked again within this many sessions
+    recent_question_retries: int = 4    # redraws per repeated question before keeping it
+
+    # Next session per game drawn in the background (services/session_pool.py)
+    session_pool: bool = True
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
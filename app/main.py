@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import logging
 import os
 
@@ -12,7 +13,7 @@ from sqlalchemy import text
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.config import get_settings
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal
 from app.routes import auth, game
 from app.routes import dashboard as dashboard_routes
 from app.routes import store as store_routes
@@ -23,6 +24,19 @@ logger = logging.getLogger(__name__)
 _templates = Jinja2Templates(directory="templates")
 
 
+_INDEXES = [
+    # (index name, table, columns, unique)
+    ("uq_user_inventory_user_item", "user_inventory", "user_id, item_key", True),
+    ("ix_game_sessions_user_type_completed", "game_sessions", "user_id, game_type, completed_at", False),
+    ("ix_game_sessions_user_completed", "game_sessions", "user_id, completed_at", False),
+    ("ix_session_questions_session", "session_questions", "session_id", False),
+    ("ix_points_ledger_user_created", "points_ledger", "user_id, created_at", False),
+    ("uq_user_character_progress_user_char", "user_character_progress", "user_id, character_id", True),
+    ("uq_user_achievements_user_badge", "user_achievements", "user_id, badge_key", True),
+    ("uq_quest_progress_user", "quest_progress", "user_id", True),
+]
+
+
 def _run_migrations(engine_instance):
     """Add missing columns to existing tables.
 
@@ -41,13 +55,27 @@ def _run_migrations(engine_instance):
         ("users", "equipped_trail", "VARCHAR", None),
         ("users", "lifetime_coins", "INTEGER", "0"),
         ("users", "pending_drill_char_ids", "VARCHAR", None),
+        ("users", "recent_questions", "VARCHAR", None),
+        ("users", "pending_sessions", "VARCHAR", None),
+        ("users", "progress_version", "INTEGER", "0"),
+        ("users", "scheduler", "VARCHAR", "'sm2'"),
         ("points_ledger", "coins_change", "INTEGER", "0"),
         ("session_questions", "started_at", "TIMESTAMP", None),
+        ("session_questions", "created_at", "TIMESTAMP", None),
+        ("session_questions", "first_correct", "BOOLEAN", None),
+        ("game_sessions", "request_results", "VARCHAR", None),
+        ("game_sessions", "seed", "BIGINT", None),
+        ("game_sessions", "age", "INTEGER", None),
+        ("session_questions", "generator_version", "VARCHAR", None),
+        ("session_questions", "seed", "BIGINT", None),
         # SM-2 spaced repetition columns
         ("user_character_progress", "easiness_factor", "REAL", "2.5"),
         ("user_character_progress", "sm2_interval", "INTEGER", "0"),
         ("user_character_progress", "sm2_repetitions", "INTEGER", "0"),
         ("user_character_progress", "next_review_date", "DATE", None),
+        ("user_character_progress", "previous_mastery_score", "INTEGER", None),
+        ("user_character_progress", "fsrs_stability", "REAL", None),
+        ("user_character_progress", "fsrs_difficulty", "REAL", None),
     ]
 
     dialect = engine_instance.dialect.name  # "postgresql" or "sqlite"
@@ -72,6 +100,34 @@ def _run_migrations(engine_instance):
                 # Column already exists — safe to ignore
                 pass
 
+        # Indexes added after a table was first created; create_all() only
+        # builds them for new tables. Unique indexes drop duplicate rows
+        # first (keeping the oldest) so creation can't fail on old data.
+        for name, table, columns, unique in _INDEXES:
+            try:
+                if unique:
+                    conn.execute(text(
+                        f"DELETE FROM {table} WHERE id NOT IN ("
+                        f"SELECT MIN(id) FROM {table} GROUP BY {columns})"
+                    ))
+                conn.execute(text(
+                    f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS "
+                    f"{name} ON {table} ({columns})"
+                ))
+            except Exception:
+                logger.warning("Could not create index %s", name)
+
+        # Backfill session_questions.created_at from the owning session
+        try:
+            conn.execute(text(
+                "UPDATE session_questions SET created_at = COALESCE("
+                "(SELECT gs.started_at FROM game_sessions gs WHERE gs.id = session_questions.session_id), "
+                "started_at, CURRENT_TIMESTAMP) "
+                "WHERE created_at IS NULL"
+            ))
+        except Exception:
+            pass
+
         # One-time data fix: update Ellie's age from 8 to 9
         try:
             conn.execute(text(
@@ -93,6 +149,39 @@ def _run_migrations(engine_instance):
         except Exception:
             pass
 
+        # Backfill per-game-type completion counters for users that predate
+        # user_game_stats; pairs that already have a row are left alone
+        try:
+            conn.execute(text(
+                "INSERT INTO user_game_stats (user_id, game_type, sessions_completed) "
+                "SELECT gs.user_id, gs.game_type, COUNT(*) FROM game_sessions gs "
+                "WHERE gs.completed_at IS NOT NULL AND NOT EXISTS ("
+                "SELECT 1 FROM user_game_stats s "
+                "WHERE s.user_id = gs.user_id AND s.game_type = gs.game_type) "
+                "GROUP BY gs.user_id, gs.game_type"
+            ))
+        except Exception:
+            pass
+
+        # Backfill mastery summaries for users that predate
+        # user_mastery_summary; update_mastery keeps them current after this
+        try:
+            conn.execute(text(
+                "INSERT INTO user_mastery_summary (user_id, level_0, level_1, level_2, "
+                "level_3, level_4, level_5, mastery_sum, character_count) "
+                "SELECT p.user_id, "
+                + ", ".join(
+                    f"SUM(CASE WHEN COALESCE(p.mastery_score, 0) = {level} THEN 1 ELSE 0 END)"
+                    for level in range(6)
+                )
+                + ", SUM(COALESCE(p.mastery_score, 0)), COUNT(*) "
+                "FROM user_character_progress p WHERE NOT EXISTS ("
+                "SELECT 1 FROM user_mastery_summary s WHERE s.user_id = p.user_id) "
+                "GROUP BY p.user_id"
+            ))
+        except Exception:
+            pass
+
         # Backfill lifetime_coins so existing car levels never demote:
         # at least the coins threshold of the current level, or the
         # current balance if higher
@@ -109,6 +198,41 @@ def _run_migrations(engine_instance):
             pass
 
 
+def _ensure_partitions():
+    """Create upcoming month partitions (PostgreSQL tables converted by the migration only)."""
+    from app.services.partitions import ensure_partitions
+
+    with engine.begin() as conn:
+        ensure_partitions(conn)
+
+
+def _seed_store_catalog():
+    """Reconcile STORE_SEED into store_items once per worker start."""
+    from app.services.store_catalog import reconcile_store_seed
+
+    db = SessionLocal()
+    try:
+        changed = reconcile_store_seed(db)
+        if changed:
+            logger.info("Store catalog reconciled: %d items", changed)
+    finally:
+        db.close()
+
+
+def _load_question_bank():
+    """Map the static-mode question bank, building it if missing or stale."""
+    from app.services.question_bank import load_question_bank
+
+    if not get_settings().question_bank_path:
+        return
+    try:
+        bank = load_question_bank()
+    except OSError:
+        logger.exception("Question bank unavailable; static modes are generated live")
+    else:
+        logger.info("Question bank loaded: %d questions", len(bank))
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
 
@@ -123,7 +247,18 @@ def create_app() -> FastAPI:
     async def lifespan(app: FastAPI):
         Base.metadata.create_all(bind=engine, checkfirst=True)
         _run_migrations(engine)
+        _ensure_partitions()
+        _seed_store_catalog()
+        _load_question_bank()
+        janitor_task = None
+        if settings.janitor_enabled:
+            from app.services.janitor import janitor_loop
+            janitor_task = asyncio.create_task(janitor_loop())
         yield
+        if janitor_task is not None:
+            janitor_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await janitor_task
 
     app = FastAPI(title="Skool - Chinese Character Learning", lifespan=lifespan)
 
@@ -1,21 +1,31 @@
 from app.models.user import User
 from app.models.character import Character
-from app.models.progress import UserCharacterProgress
-from app.models.session import GameSession, SessionQuestion
+from app.models.progress import UserCharacterProgress, UserMasterySummary
+from app.models.session import GameSession, SessionQuestion, SessionArchive
 from app.models.rewards import PointsLedger
 from app.models.achievement import UserAchievement
 from app.models.store import StoreItem, UserInventory
 from app.models.quest import QuestProgress
+from app.models.stats import UserGameStats
+from app.models.idempotency import IdempotencyKey
+from app.models.lease import JobLease
+from app.models.scheduler import SchedulerParams
 
 __all__ = [
     "User",
     "Character",
     "UserCharacterProgress",
+    "UserMasterySummary",
     "GameSession",
     "SessionQuestion",
+    "SessionArchive",
     "PointsLedger",
     "UserAchievement",
     "StoreItem",
     "UserInventory",
     "QuestProgress",
+    "UserGameStats",
+    "IdempotencyKey",
+    "JobLease",
+    "SchedulerParams",
 ]
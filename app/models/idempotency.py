@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint
+from datetime import datetime, timezone
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String, nullable=False)                 # client-generated, from the Idempotency-Key header
+    endpoint = Column(String, nullable=False)            # "store_buy", "buy_streak_freeze"
+    status_code = Column(Integer, nullable=True)         # null while the first request is in flight
+    response = Column(String, nullable=True)             # JSON body returned to the first request
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
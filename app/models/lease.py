@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+
+from app.database import Base
+
+
+class JobLease(Base):
+    __tablename__ = "job_leases"
+
+    name = Column(String, primary_key=True)              # e.g. "janitor"
+    holder = Column(String, nullable=False)              # "<hostname>:<pid>" of the worker holding it
+    expires_at = Column(DateTime, nullable=False)        # naive UTC; free to take once past
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -7,11 +7,16 @@ from app.database import Base
 
 class UserCharacterProgress(Base):
     __tablename__ = "user_character_progress"
+    __table_args__ = (
+        # One row per (user, character); update_mastery looks rows up by this pair
+        Index("uq_user_character_progress_user_char", "user_id", "character_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     character_id = Column(Integer, ForeignKey("characters.id"), nullable=False)
     mastery_score = Column(Integer, default=0)  # 0-5, kept for display/backward compat
+    previous_mastery_score = Column(Integer, nullable=True)  # before the latest answer; NULL until a second one
     correct_count = Column(Integer, default=0)
     wrong_count = Column(Integer, default=0)
     last_seen = Column(DateTime, nullable=True)
@@ -20,7 +25,42 @@ class UserCharacterProgress(Base):
     easiness_factor = Column(Float, default=2.5)       # EF, min 1.3
     sm2_interval = Column(Integer, default=0)           # days until next review
     sm2_repetitions = Column(Integer, default=0)        # consecutive correct count
-    next_review_date = Column(Date, nullable=True)      # when to next show this character
+    next_review_date = Column(Date, nullable=True)      # when to next show this character (set by the user's scheduler)
+
+    # FSRS memory state; only kept current while the user is on the fsrs scheduler
+    fsrs_stability = Column(Float, nullable=True)       # days until recall probability falls to 90%
+    fsrs_difficulty = Column(Float, nullable=True)      # 1-10
 
     user = relationship("User", back_populates="progress")
     character = relationship("Character", back_populates="progress")
+
+
+MASTERY_LEVELS = range(6)
+
+
+class UserMasterySummary(Base):
+    """How many of a user's characters sit at each mastery level.
+
+    Kept in step by update_mastery, so the dashboard bars and the story
+    list's average don't read every progress row. Checked and repaired by
+    services/mastery_summary.py.
+    """
+    __tablename__ = "user_mastery_summary"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    level_0 = Column(Integer, nullable=False, default=0)
+    level_1 = Column(Integer, nullable=False, default=0)
+    level_2 = Column(Integer, nullable=False, default=0)
+    level_3 = Column(Integer, nullable=False, default=0)
+    level_4 = Column(Integer, nullable=False, default=0)
+    level_5 = Column(Integer, nullable=False, default=0)
+    mastery_sum = Column(Integer, nullable=False, default=0)
+    character_count = Column(Integer, nullable=False, default=0)
+
+    @property
+    def levels(self) -> list[int]:
+        return [getattr(self, f"level_{level}") or 0 for level in MASTERY_LEVELS]
+
+    @property
+    def average(self) -> float:
+        return self.mastery_sum / self.character_count if self.character_count else 0.0
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -7,6 +7,10 @@ from app.database import Base
 
 class QuestProgress(Base):
     __tablename__ = "quest_progress"
+    __table_args__ = (
+        # One quest row per user
+        Index("uq_quest_progress_user", "user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
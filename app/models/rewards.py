@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -7,6 +7,10 @@ from app.database import Base
 
 class PointsLedger(Base):
     __tablename__ = "points_ledger"
+    __table_args__ = (
+        # Per-day ledger reads (today's points, daily bonus check)
+        Index("ix_points_ledger_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -14,6 +18,6 @@ class PointsLedger(Base):
     coins_change = Column(Integer, default=0)        # +N on star conversion, -N on store spends
     reason = Column(String, nullable=False)          # "correct_answer", "daily_bonus", "streak_bonus"
     balance_after = Column(Integer, nullable=False)  # running total for audit
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
 
     user = relationship("User", back_populates="ledger_entries")
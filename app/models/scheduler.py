@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from datetime import datetime, timezone
+
+from app.database import Base
+
+
+class SchedulerParams(Base):
+    """Per-user weights for a fitted scheduler (see services/fsrs.py)."""
+    __tablename__ = "scheduler_params"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    engine = Column(String, primary_key=True)           # e.g. "fsrs"
+    weights = Column(String, nullable=False)            # JSON list of floats
+    review_count = Column(Integer, default=0)           # reviews the fit was scored on
+    log_loss = Column(Float, nullable=True)             # per review, fitted weights
+    default_log_loss = Column(Float, nullable=True)     # per review, default weights
+    fitted_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
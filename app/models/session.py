@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime, Boolean, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -7,6 +7,12 @@ from app.database import Base
 
 class GameSession(Base):
     __tablename__ = "game_sessions"
+    __table_args__ = (
+        # In-progress lookup for resuming a reloaded game
+        Index("ix_game_sessions_user_type_completed", "user_id", "game_type", "completed_at"),
+        # Completed-session history and stats per child
+        Index("ix_game_sessions_user_completed", "user_id", "completed_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -16,13 +22,30 @@ class GameSession(Base):
     total_correct = Column(Integer, default=0)
     total_wrong = Column(Integer, default=0)
     points_earned = Column(Integer, default=0)
+    # JSON {idempotency key: response} for replayed answer/complete requests
+    request_results = Column(String, nullable=True)
+    # Seeds the random.Random the questions were generated from (null before seeding)
+    seed = Column(BigInteger, nullable=True)
+    # Player's age when the questions were generated; rebuilds compact questions
+    age = Column(Integer, nullable=True)
 
     user = relationship("User", back_populates="sessions")
     questions = relationship("SessionQuestion", back_populates="session", order_by="SessionQuestion.question_number")
+    archive = relationship("SessionArchive", back_populates="session", uselist=False)
+
+    @property
+    def question_count(self) -> int:
+        """Number of questions, whether still in session_questions or archived."""
+        if self.questions:
+            return len(self.questions)
+        return self.archive.question_count if self.archive else 0
 
 
 class SessionQuestion(Base):
     __tablename__ = "session_questions"
+    __table_args__ = (
+        Index("ix_session_questions_session", "session_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("game_sessions.id"), nullable=False)
@@ -32,10 +55,35 @@ class SessionQuestion(Base):
     correct_answer = Column(String, nullable=False)     # the correct image_url, meaning, or character
     options = Column(String, nullable=False)             # JSON list of 3 options
     prompt_data = Column(String, nullable=True)          # JSON blob for math/logic question details
+    # Generated questions: rebuilt from these when options is "" (services/question_store.py)
+    generator_version = Column(String, nullable=True)
+    seed = Column(BigInteger, nullable=True)
     selected_answer = Column(String, nullable=True)
     is_correct = Column(Boolean, nullable=True)
+    first_correct = Column(Boolean, nullable=True)  # result of the first attempt; is_correct flips on a good retry
     answered_at = Column(DateTime, nullable=True)
     started_at = Column(DateTime, nullable=True)  # for speed bonus tracking
+    # Partition key on PostgreSQL (see services/partitions.py)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
 
     session = relationship("GameSession", back_populates="questions")
     character = relationship("Character")
+
+
+class SessionArchive(Base):
+    """All questions of one completed session, rolled into a compressed blob.
+
+    Written by services/session_archive.py, which deletes the session's
+    session_questions rows in the same transaction.
+    """
+    __tablename__ = "session_archives"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("game_sessions.id"), nullable=False, unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    question_count = Column(Integer, nullable=False)
+    format_version = Column(Integer, nullable=False, default=1)
+    payload = Column(LargeBinary, nullable=False)        # zlib-compressed columnar JSON
+    archived_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    session = relationship("GameSession", back_populates="archive")
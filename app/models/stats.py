@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+
+from app.database import Base
+
+
+class UserGameStats(Base):
+    __tablename__ = "user_game_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "game_type", name="uq_user_game_stats_user_game"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    game_type = Column(String, nullable=False)           # "chinese", "math", "logic", "english"
+    sessions_completed = Column(Integer, default=0)      # bumped in complete_session()
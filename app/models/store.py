@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -18,6 +18,10 @@ class StoreItem(Base):
 
 class UserInventory(Base):
     __tablename__ = "user_inventory"
+    __table_args__ = (
+        # One row per owned item; guards against double-tap purchases
+        Index("uq_user_inventory_user_item", "user_id", "item_key", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
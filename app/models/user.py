@@ -14,6 +14,7 @@ class User(Base):
     age = Column(Integer, nullable=True)
     theme = Column(String, nullable=False, default="racing")  # "racing" or "pony"
     role = Column(String, nullable=False, default="child")     # "child" or "parent"
+    scheduler = Column(String, nullable=False, default="sm2")  # "sm2" or "fsrs"; see services/scheduler.py
 
     # Denormalized balances for instant reads
     points = Column(Integer, default=0)
@@ -36,6 +37,13 @@ class User(Base):
     # Drill queued by the parent; JSON list of character ids, consumed by
     # the child's next Chinese session
     pending_drill_char_ids = Column(String, nullable=True)
+    # Fingerprints of recent questions per game; see services/recent_questions.py
+    recent_questions = Column(String, nullable=True)
+    # Pre-generated next session per game (JSON); see services/session_pool.py.
+    # progress_version counts changes to Chinese progress, which make the
+    # pending Chinese session stale
+    pending_sessions = Column(String, nullable=True)
+    progress_version = Column(Integer, default=0)
 
     # Store / customization
     equipped_car_skin = Column(String, nullable=True)
@@ -59,6 +67,10 @@ class User(Base):
         if self.last_played_date != date.today():
             self.sessions_today = 0
 
+    def bump_progress_version(self):
+        """Mark a change to the Chinese progress the next session is drawn from."""
+        self.progress_version = (self.progress_version or 0) + 1
+
     def record_play_today(self):
         """Stamp today's play and update the streak. Idempotent within a day."""
         today = date.today()
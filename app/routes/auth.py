@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Request, Depends, Form
+from fastapi import APIRouter, BackgroundTasks, Request, Depends, Form
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.services.auth import get_child_users, get_user
+from app.services.session_pool import refill_pool_task
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
@@ -21,6 +22,7 @@ def login_page(request: Request, db: Session = Depends(get_db)):
 @router.post("/login")
 def login(
     request: Request,
+    background_tasks: BackgroundTasks,
     user_id: int = Form(...),
     db: Session = Depends(get_db),
 ):
@@ -28,6 +30,8 @@ def login(
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
+    # Draw the next session of each game while the selector loads
+    background_tasks.add_task(refill_pool_task, db.get_bind(), user.id)
     response = RedirectResponse(url="/game/", status_code=303)
     request.session["user_id"] = user.id
     request.session["user_name"] = user.name
@@ -1,18 +1,22 @@
 import json
 from datetime import date, timedelta
-from collections import defaultdict
 
-from fastapi import APIRouter, Request, Depends
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi import APIRouter, Request, Depends, Query
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.database import get_db
 from app.models.user import User
-from app.models.session import GameSession, SessionQuestion
+from app.models.session import GameSession, SessionQuestion, SessionArchive
 from app.models.progress import UserCharacterProgress
 from app.models.character import Character
+from app.services.forecast import MAX_FORECAST_DAYS, review_forecast
+from app.services.mastery_summary import get_mastery_summary
+from app.services.scheduler import SCHEDULERS, get_scheduler, set_scheduler
+from app.services.worksheet import WORKSHEET_GAMES, build_worksheet
 
 router = APIRouter(prefix="/dashboard")
 templates = Jinja2Templates(directory="templates")
@@ -59,6 +63,11 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
             .filter(GameSession.completed_at.isnot(None))
             .scalar() or 0
         )
+        total_questions_count += (
+            db.query(func.sum(SessionArchive.question_count))
+            .filter(SessionArchive.user_id == child.id)
+            .scalar() or 0
+        )
         accuracy = round(total_correct / total_questions_count * 100) if total_questions_count else 0
 
         # Last 7 days activity
@@ -79,14 +88,10 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
             w["pct"] = round(w["count"] / max(max_day, 1) * 100)
 
         # Mastery distribution
-        mastery_dist = defaultdict(int)
-        progress = db.query(UserCharacterProgress).filter_by(user_id=child.id).all()
-        for p in progress:
-            mastery_dist[p.mastery_score] += 1
-
-        mastery_bars = []
-        for level in range(6):
-            mastery_bars.append({"level": level, "count": mastery_dist.get(level, 0)})
+        mastery_bars = [
+            {"level": level, "count": count}
+            for level, count in enumerate(get_mastery_summary(db, child.id).levels)
+        ]
 
         # Weakest characters
         weak_chars = (
@@ -131,7 +136,7 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
         )
         session_history = []
         for s in recent_sessions:
-            q_count = len(s.questions) if s.questions else 0
+            q_count = s.question_count
             duration_secs = None
             if s.started_at and s.completed_at:
                 sa = s.started_at.replace(tzinfo=None)
@@ -144,28 +149,11 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
                 "duration": f"{duration_secs // 60}m {duration_secs % 60}s" if duration_secs and duration_secs > 0 else "—",
             })
 
-        # ── Review Schedule (SM-2) ──
-        tomorrow = today + timedelta(days=1)
-        end_of_week = today + timedelta(days=7)
-
-        due_today = (
-            db.query(func.count(UserCharacterProgress.id))
-            .filter(UserCharacterProgress.user_id == child.id)
-            .filter(UserCharacterProgress.next_review_date <= today)
-            .scalar() or 0
-        )
-        due_tomorrow = (
-            db.query(func.count(UserCharacterProgress.id))
-            .filter(UserCharacterProgress.user_id == child.id)
-            .filter(UserCharacterProgress.next_review_date == tomorrow)
-            .scalar() or 0
-        )
-        due_this_week = (
-            db.query(func.count(UserCharacterProgress.id))
-            .filter(UserCharacterProgress.user_id == child.id)
-            .filter(UserCharacterProgress.next_review_date <= end_of_week)
-            .scalar() or 0
-        )
+        # ── Review Schedule (next_review_date, set by the child's scheduler) ──
+        forecast = review_forecast(db, child.id)
+        due_today = forecast.due_by(0)
+        due_tomorrow = forecast.counts[1]
+        due_this_week = forecast.due_by(7)
 
         # Characters due today (up to 8)
         due_today_chars = (
@@ -199,14 +187,93 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
             "heatmap": heatmap,
             "session_history": session_history,
             "review_schedule": review_schedule,
+            "scheduler": get_scheduler(child.scheduler),
         })
 
     return templates.TemplateResponse(request, "dashboard.html", {
         "user": user,
         "children": child_data,
+        "schedulers": list(SCHEDULERS.values()),
+    })
+
+
+@router.get("/api/forecast/{child_id}")
+def forecast(
+    child_id: int,
+    request: Request,
+    days: int = Query(30, ge=1, le=MAX_FORECAST_DAYS),
+    db: Session = Depends(get_db),
+):
+    """Characters falling due on each of the next `days` days."""
+    user = _get_current_user(request, db)
+    if not user or user.role != "parent":
+        return JSONResponse({"error": "Not authorized"}, status_code=403)
+
+    child = db.query(User).filter_by(id=child_id, role="child").first()
+    if not child:
+        return JSONResponse({"error": "Child not found"}, status_code=404)
+
+    forecast = review_forecast(db, child.id)
+    return JSONResponse({
+        "child_id": child.id,
+        "start": forecast.start.isoformat(),
+        "days": days,
+        "overdue": forecast.overdue,
+        "counts": list(forecast.horizon(days)),
     })
 
 
+@router.get("/worksheet/{child_id}")
+def worksheet(
+    child_id: int,
+    request: Request,
+    count: int = Query(20, ge=1, le=200),
+    games: str = ",".join(WORKSHEET_GAMES),
+    seed: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """A printable worksheet of `count` questions per game, streamed as HTML."""
+    user = _get_current_user(request, db)
+    if not user or user.role != "parent":
+        return JSONResponse({"error": "Not authorized"}, status_code=403)
+
+    child = db.query(User).filter_by(id=child_id, role="child").first()
+    if not child:
+        return JSONResponse({"error": "Child not found"}, status_code=404)
+
+    game_types = [g for g in games.split(",") if g]
+    unknown = [g for g in game_types if g not in WORKSHEET_GAMES]
+    if unknown or not game_types:
+        return JSONResponse({"error": f"Unknown game type: {','.join(unknown)}"}, status_code=400)
+
+    # Chinese reads the database here; the session is closed once the body streams
+    sheet = build_worksheet(db, child, count, game_types, seed)
+    stream = templates.env.get_template("worksheet.html").stream(sheet=sheet)
+    stream.enable_buffering(100)
+    return StreamingResponse(stream, media_type="text/html; charset=utf-8")
+
+
+class SchedulerRequest(BaseModel):
+    scheduler: str
+
+
+@router.post("/scheduler/{child_id}")
+def change_scheduler(child_id: int, body: SchedulerRequest, request: Request, db: Session = Depends(get_db)):
+    """Move a child to another review scheduler; their due dates are recomputed under it."""
+    user = _get_current_user(request, db)
+    if not user or user.role != "parent":
+        return JSONResponse({"error": "Not authorized"}, status_code=403)
+
+    child = db.query(User).filter_by(id=child_id, role="child").first()
+    if not child:
+        return JSONResponse({"error": "Child not found"}, status_code=404)
+    if body.scheduler not in SCHEDULERS:
+        return JSONResponse({"error": f"Unknown scheduler: {body.scheduler}"}, status_code=400)
+
+    scheduler = set_scheduler(db, child, body.scheduler)
+    return JSONResponse({"scheduler": scheduler.name, "label": scheduler.label})
+
+
 @router.post("/drill/{child_id}")
 def start_drill(child_id: int, request: Request, db: Session = Depends(get_db)):
     """Start a drill session targeting the child's weakest/overdue characters."""
@@ -1,15 +1,22 @@
 import json
 import os
-from fastapi import APIRouter, Request, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Request, Depends, Query
 from fastapi.responses import RedirectResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.database import get_db
 from app.models.user import User
-from app.models.session import GameSession, SessionQuestion
-from app.services.session_engine import create_session, submit_answer, complete_session, can_start_session, SessionLimitReached
+from app.models.session import GameSession
+from app.services.session_engine import (
+    create_session, submit_answer, complete_session, can_start_session, SessionLimitReached,
+    find_resumable_session, resume_index, find_open_question,
+)
+from app.services.idempotency import IDEMPOTENCY_HEADER
+from app.services.session_pool import refill_pool_task, take_pending
+from app.services.question_store import QuestionPayload, question_payloads
 from app.themes import get_theme
 
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "templates")
@@ -89,13 +96,11 @@ def _build_questions_json(questions, db=None, user_id=None) -> list[dict]:
     return result
 
 
-def _build_generic_questions_json(questions) -> list[dict]:
+def _build_generic_questions_json(questions, payloads: list[QuestionPayload]) -> list[dict]:
     """Build questions data for math/logic games (no Character relationship)."""
     result = []
-    for q in questions:
+    for q, (opts, pd) in zip(questions, payloads):
         mode = q.question_mode or "unknown"
-        opts = json.loads(q.options)
-        pd = json.loads(q.prompt_data) if q.prompt_data else {}
         entry = {
             "id": q.id,
             "question_number": q.question_number,
@@ -115,20 +120,8 @@ def _build_generic_questions_json(questions) -> list[dict]:
     return result
 
 
-def _start_game_session(request: Request, db: Session, game_type: str):
-    """Shared logic for starting a game session of any type."""
-    user = get_current_user(request, db)
-    if not user:
-        return RedirectResponse(url="/login", status_code=303)
-
-    # Pre-readers only get the picture-based Chinese game (the selector
-    # hides the others, but guard direct URLs/bookmarks too)
-    if game_type != "chinese" and (user.age or 5) <= 5:
-        return RedirectResponse(url="/game/", status_code=303)
-
-    user.reset_daily_if_needed()
-    db.commit()
-
+def _create_game_session(request: Request, db: Session, user: User, game_type: str):
+    """Create a fresh session, or return the response to show instead."""
     if not can_start_session(user):
         return templates.TemplateResponse(request, resolve_theme_template(user.theme, "limit_reached.html"), {
             "user": user,
@@ -144,8 +137,11 @@ def _start_game_session(request: Request, db: Session, game_type: str):
             drill_char_ids = None
         user.pending_drill_char_ids = None
 
+    # Otherwise the session drawn in the background, if nothing has changed since
+    bundle = take_pending(user, game_type) if drill_char_ids is None else None
+
     try:
-        session = create_session(db, user, game_type=game_type, character_ids=drill_char_ids)
+        return create_session(db, user, game_type=game_type, character_ids=drill_char_ids, bundle=bundle)
     except SessionLimitReached:
         return templates.TemplateResponse(request, resolve_theme_template(user.theme, "limit_reached.html"), {
             "user": user,
@@ -155,18 +151,47 @@ def _start_game_session(request: Request, db: Session, game_type: str):
         request.session["game_error"] = str(e)
         return RedirectResponse(url="/game/", status_code=303)
 
+
+def _start_game_session(request: Request, db: Session, game_type: str):
+    """Shared logic for starting a game session of any type."""
+    user = get_current_user(request, db)
+    if not user:
+        return RedirectResponse(url="/login", status_code=303)
+
+    # Pre-readers only get the picture-based Chinese game (the selector
+    # hides the others, but guard direct URLs/bookmarks too)
+    if game_type != "chinese" and (user.age or 5) <= 5:
+        return RedirectResponse(url="/game/", status_code=303)
+
+    user.reset_daily_if_needed()
+    db.commit()
+
+    # A reload resumes the unfinished session instead of generating a new
+    # one; a drill queued by the parent still takes over the next Chinese game
+    session = None
+    if not (game_type == "chinese" and user.pending_drill_char_ids):
+        session = find_resumable_session(db, user, game_type)
+
+    if session is None:
+        session = _create_game_session(request, db, user, game_type)
+        if not isinstance(session, GameSession):
+            return session
+
     questions = session.questions
-    first_q = questions[0]
-    options = json.loads(first_q.options)
+    start_index = resume_index(session)
+    first_index = min(start_index, len(questions) - 1)
+    first_q = questions[first_index]
 
     # Build questions JSON — Chinese uses character relationship, math/logic use prompt_data
     if game_type == "chinese":
+        options = json.loads(first_q.options)
         questions_json = json.dumps(_build_questions_json(questions, db=db, user_id=user.id))
         character = first_q.character
     else:
-        questions_json = json.dumps(_build_generic_questions_json(questions))
+        payloads = question_payloads(session)
+        options, pd = payloads[first_index]
+        questions_json = json.dumps(_build_generic_questions_json(questions, payloads))
         # Dummy character object for Jinja SSR (racing.js overwrites immediately)
-        pd = json.loads(first_q.prompt_data) if first_q.prompt_data else {}
         character = type("DummyChar", (), {
             "character": pd.get("expression", ""),
             "pinyin": pd.get("prompt_text", ""),
@@ -184,6 +209,7 @@ def _start_game_session(request: Request, db: Session, game_type: str):
         "options": options,
         "question_number": first_q.question_number,
         "total_questions": len(questions),
+        "start_index": start_index,
         "questions_json": questions_json,
         "game_type": game_type,
         "car_info": _car_info(user),
@@ -198,10 +224,15 @@ def _start_game_session(request: Request, db: Session, game_type: str):
 def _get_today_points(db: Session, user_id: int) -> int:
     """Sum points earned today."""
     from app.models.rewards import PointsLedger
-    from datetime import date as date_cls
-    today = date_cls.today()
-    entries = db.query(PointsLedger).filter_by(user_id=user_id).all()
-    return sum(e.change for e in entries if e.created_at and e.created_at.date() == today)
+    from datetime import date as date_cls, datetime as dt, time as time_cls, timedelta
+    day_start = dt.combine(date_cls.today(), time_cls.min)
+    return (
+        db.query(func.sum(PointsLedger.change))
+        .filter(PointsLedger.user_id == user_id)
+        .filter(PointsLedger.created_at >= day_start)
+        .filter(PointsLedger.created_at < day_start + timedelta(days=1))
+        .scalar() or 0
+    )
 
 
 def _get_motivational_message(streak: int) -> str:
@@ -322,7 +353,10 @@ def answer_question(
         return JSONResponse({"error": "Not logged in"}, status_code=401)
 
     try:
-        result = submit_answer(db, user, body.question_id, body.selected_answer)
+        result = submit_answer(
+            db, user, body.question_id, body.selected_answer,
+            request_key=request.headers.get(IDEMPOTENCY_HEADER),
+        )
     except ValueError as e:
         return JSONResponse({"error": str(e)}, status_code=400)
 
@@ -333,6 +367,7 @@ def answer_question(
 def complete(
     session_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     user = get_current_user(request, db)
@@ -340,10 +375,14 @@ def complete(
         return JSONResponse({"error": "Not logged in"}, status_code=401)
 
     try:
-        result = complete_session(db, user, session_id)
+        result = complete_session(
+            db, user, session_id,
+            request_key=request.headers.get(IDEMPOTENCY_HEADER),
+        )
     except ValueError as e:
         return JSONResponse({"error": str(e)}, status_code=400)
 
+    background_tasks.add_task(refill_pool_task, db.get_bind(), user.id)
     return JSONResponse(result)
 
 
@@ -365,7 +404,7 @@ def session_complete_page(
 
     from app.config import get_settings
     settings = get_settings()
-    total_questions = len(session.questions)
+    total_questions = session.question_count
     accuracy = round(session.total_correct / total_questions * 100) if total_questions else 0
     is_perfect = session.total_correct == total_questions
     stars_mod = user.stars % settings.coins_per_stars
@@ -389,16 +428,23 @@ def buy_streak_freeze_route(request: Request, db: Session = Depends(get_db)):
     user = get_current_user(request, db)
     if not user:
         return JSONResponse({"error": "Not logged in"}, status_code=401)
+    from app.services.idempotency import Replay, claim_key, finish_key
     from app.services.rewards import buy_streak_freeze
-    success = buy_streak_freeze(db, user)
-    if not success:
-        return JSONResponse({"error": "Not enough coins"}, status_code=400)
-    db.commit()
-    return JSONResponse({
-        "success": True,
-        "coins": user.coins,
-        "streak_freezes": user.streak_freezes,
-    })
+
+    claim = claim_key(db, user.id, request.headers.get(IDEMPOTENCY_HEADER), "buy_streak_freeze")
+    if isinstance(claim, Replay):
+        return JSONResponse(claim.body, status_code=claim.status_code)
+
+    if buy_streak_freeze(db, user):
+        status_code, result = 200, {
+            "success": True,
+            "coins": user.coins,
+            "streak_freezes": user.streak_freezes,
+        }
+    else:
+        status_code, result = 400, {"error": "Not enough coins"}
+    finish_key(db, claim, status_code, result)
+    return JSONResponse(result, status_code=status_code)
 
 
 @router.post("/start-question/{question_id}")
@@ -408,7 +454,7 @@ def start_question(question_id: int, request: Request, db: Session = Depends(get
     if not user:
         return JSONResponse({"error": "Not logged in"}, status_code=401)
     from datetime import datetime, timezone
-    q = db.query(SessionQuestion).filter_by(id=question_id).first()
+    q = find_open_question(db, question_id)
     if q and not q.started_at:
         q.started_at = datetime.now(timezone.utc)
         db.commit()
@@ -3,11 +3,10 @@ from fastapi import APIRouter, Request, Depends
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.database import get_db
 from app.models.user import User
-from app.models.progress import UserCharacterProgress
+from app.services.mastery_summary import get_mastery_summary
 from app.services.story_generator import STORIES, get_available_stories
 
 router = APIRouter(prefix="/game/stories")
@@ -27,14 +26,7 @@ def stories_list(request: Request, db: Session = Depends(get_db)):
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
-    # Calculate average mastery
-    avg = (
-        db.query(func.avg(UserCharacterProgress.mastery_score))
-        .filter_by(user_id=user.id)
-        .scalar()
-    ) or 0
-
-    stories = get_available_stories(float(avg))
+    stories = get_available_stories(get_mastery_summary(db, user.id).average)
 
     return templates.TemplateResponse(request, "story_list.html", {
         "user": user,
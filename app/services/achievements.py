@@ -2,13 +2,19 @@
 
 Badge definitions are stored here as a dict (not in DB).
 check_badges() is called after complete_session() and returns newly earned badges.
+Rules are registered per trigger event (see badge_rule) and read counters that
+complete_session() maintains, so checking is O(relevant rules).
 """
+from collections import defaultdict
 from datetime import datetime, timezone
+from typing import Callable
+
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.models.achievement import UserAchievement
 from app.models.session import GameSession
+from app.config import get_settings
 
 
 # Badge definitions: key -> { name, description, emoji }
@@ -92,72 +98,89 @@ def _award_badge(db: Session, user_id: int, badge_key: str) -> UserAchievement:
     return ua
 
 
-def check_badges(db: Session, user: User, session_result: dict, game_session: GameSession) -> list[dict]:
-    """Check all badge conditions and award any newly earned badges.
+# ── Rule registry ──
+#
+# Each rule is indexed by the events that can make it true, so a completion
+# only evaluates the rules its events affect. Rules read denormalized
+# counters (user columns, user_game_stats) and the session already in
+# memory — never aggregate queries.
 
-    Returns list of newly earned badge dicts: [{ key, name, emoji, description }]
-    """
-    earned = get_earned_badges(db, user.id)
-    newly_earned = []
+_RULES_BY_EVENT: dict[str, list[tuple[str, Callable[[User, dict], bool]]]] = defaultdict(list)
 
-    def _try_award(key: str):
-        if key not in earned:
-            _award_badge(db, user.id, key)
-            badge = BADGES[key]
-            newly_earned.append({
-                "key": key,
-                "name": badge["name"],
-                "emoji": badge["emoji"],
-                "description": badge["description"],
-            })
 
-    # first_session
-    if user.total_sessions_completed >= 1:
-        _try_award("first_session")
-
-    # perfect_5
-    if session_result.get("total_correct", 0) == len(game_session.questions):
-        _try_award("perfect_5")
-
-    # streak milestones
-    if user.streak >= 3:
-        _try_award("streak_3")
-    if user.streak >= 7:
-        _try_award("streak_7")
-    if user.streak >= 14:
-        _try_award("streak_14")
-
-    # Game type counts
-    game_type = game_session.game_type
-    completed_of_type = (
-        db.query(GameSession)
-        .filter_by(user_id=user.id, game_type=game_type)
-        .filter(GameSession.completed_at.isnot(None))
-        .count()
-    )
+def badge_rule(key: str, *events: str):
+    """Register a badge predicate under one or more trigger events."""
+    def decorator(fn: Callable[[User, dict], bool]):
+        for event in events:
+            _RULES_BY_EVENT[event].append((key, fn))
+        return fn
+    return decorator
+
+
+def completion_events(game_session: GameSession, is_perfect: bool) -> list[str]:
+    """Events raised by completing a session."""
+    events = ["session_completed", f"completed:{game_session.game_type}"]
+    if is_perfect:
+        events.append("perfect_session")
+    return events
+
+
+@badge_rule("first_session", "session_completed")
+def _first_session(user: User, ctx: dict) -> bool:
+    return user.total_sessions_completed >= 1
+
+
+@badge_rule("perfect_5", "perfect_session")
+def _perfect_5(user: User, ctx: dict) -> bool:
+    return True
+
+
+@badge_rule("streak_3", "session_completed")
+def _streak_3(user: User, ctx: dict) -> bool:
+    return user.streak >= 3
+
+
+@badge_rule("streak_7", "session_completed")
+def _streak_7(user: User, ctx: dict) -> bool:
+    return user.streak >= 7
+
+
+@badge_rule("streak_14", "session_completed")
+def _streak_14(user: User, ctx: dict) -> bool:
+    return user.streak >= 14
 
-    if game_type == "math" and completed_of_type >= 10:
-        _try_award("math_whiz")
-    if game_type == "chinese" and completed_of_type >= 10:
-        _try_award("bookworm")
-    if game_type == "english" and completed_of_type >= 10:
-        _try_award("polyglot")
-
-    # century: 100 stars earned. Points are lifetime (never spent) and stars
-    # accrue at stars_per_point per point, so lifetime stars = points * rate.
-    from app.config import get_settings
-    if user.points * get_settings().stars_per_point >= 100:
-        _try_award("century")
-
-    # car collector milestones
-    if user.car_level >= 1:
-        _try_award("collector_5")
-    if user.car_level >= 2:
-        _try_award("collector_15")
-
-    # speed_demon: all 5 questions answered in under 3 seconds each
+
+@badge_rule("math_whiz", "completed:math")
+@badge_rule("bookworm", "completed:chinese")
+@badge_rule("polyglot", "completed:english")
+def _ten_of_type(user: User, ctx: dict) -> bool:
+    return ctx.get("completed_of_type", 0) >= 10
+
+
+@badge_rule("century", "session_completed")
+def _century(user: User, ctx: dict) -> bool:
+    # Points are lifetime (never spent) and stars accrue at stars_per_point
+    # per point, so lifetime stars = points * rate.
+    return user.points * get_settings().stars_per_point >= 100
+
+
+@badge_rule("collector_5", "session_completed")
+def _collector_5(user: User, ctx: dict) -> bool:
+    return user.car_level >= 1
+
+
+@badge_rule("collector_15", "session_completed")
+def _collector_15(user: User, ctx: dict) -> bool:
+    return user.car_level >= 2
+
+
+@badge_rule("speed_demon", "session_completed")
+def _speed_demon(user: User, ctx: dict) -> bool:
+    # All questions answered in under 3 seconds each; the questions are
+    # already loaded by complete_session()
+    questions = ctx["game_session"].questions
     fast_count = 0
-    for q in game_session.questions:
+    for q in questions:
         if q.started_at and q.answered_at:
             # Strip tzinfo before subtracting: PostgreSQL can hand back a
             # naive/aware mix, and mixing raises TypeError
@@ -166,7 +189,60 @@ def check_badges(db: Session, user: User, session_result: dict, game_session: Ga
             delta = (a - s).total_seconds()
             if delta < 3.0:
                 fast_count += 1
-    if fast_count == len(game_session.questions):
-        _try_award("speed_demon")
+    return fast_count == len(questions)
+
+
+def check_badges(
+    db: Session,
+    user: User,
+    session_result: dict,
+    game_session: GameSession,
+    events: list[str] | None = None,
+    completed_of_type: int = 0,
+) -> list[dict]:
+    """Evaluate the rules triggered by `events` and award newly earned badges.
+
+    `completed_of_type` is the user's completion counter for the session's
+    game type, already bumped for this session. Only the keys whose rules
+    pass are looked up in user_achievements.
 
+    Returns list of newly earned badge dicts: [{ key, name, emoji, description }]
+    """
+    if events is None:
+        is_perfect = session_result.get("total_correct", 0) == len(game_session.questions)
+        events = completion_events(game_session, is_perfect)
+
+    ctx = {
+        "session_result": session_result,
+        "game_session": game_session,
+        "completed_of_type": completed_of_type,
+    }
+    candidates = []
+    for event in events:
+        for key, rule in _RULES_BY_EVENT.get(event, ()):
+            if key not in candidates and rule(user, ctx):
+                candidates.append(key)
+    if not candidates:
+        return []
+
+    earned = {
+        r[0]
+        for r in db.query(UserAchievement.badge_key)
+        .filter(UserAchievement.user_id == user.id)
+        .filter(UserAchievement.badge_key.in_(candidates))
+        .all()
+    }
+
+    newly_earned = []
+    # Award in BADGES order so the summary lists badges consistently
+    for key in BADGES:
+        if key in candidates and key not in earned:
+            _award_badge(db, user.id, key)
+            badge = BADGES[key]
+            newly_earned.append({
+                "key": key,
+                "name": badge["name"],
+                "emoji": badge["emoji"],
+                "description": badge["description"],
+            })
     return newly_earned
@@ -1,5 +1,14 @@
 import json
 import random
+import re
+from itertools import combinations
+
+from app.services.generator_registry import registry
+
+# Bump when a change alters the question any (mode, seed) generates.
+# Unfinished compact sessions made under the old version go stale
+# (see services/question_store.py); comments and refactors don't need it.
+GENERATOR_VERSION = "1"
 
 
 # ── Content pools ──
@@ -130,49 +139,40 @@ _CVC_WORDS = [
 ]
 
 
-def generate_english_questions(age: int, count: int = 5) -> list[dict]:
-    """Generate age-appropriate English language questions."""
-    if age <= 5:
-        modes = [
-            "letter_sound", "beginning_sound", "rhyme_match", "cvc_blend",
-        ]
-        weights = [30, 30, 20, 20]
-    elif age >= 8:
-        # Grade 3-4: harder vocab, context clues, homophones, synonyms
-        modes = [
-            "vocabulary_hard", "context_clues", "homophone_pick",
-            "synonym_match", "prefix_suffix_hard", "sentence_complete",
-        ]
-        weights = [18, 20, 16, 16, 15, 15]
-    else:
-        modes = [
-            "sight_word_spell", "vocabulary_match", "antonym_match",
-            "prefix_suffix", "rhyme_match",
-        ]
-        weights = [25, 25, 20, 20, 10]
+# Mode weights per age band (generator_registry.age_band)
+MODE_WEIGHTS = {
+    "early": {"letter_sound": 30, "beginning_sound": 30, "rhyme_match": 20, "cvc_blend": 20},
+    "grade2": {
+        "sight_word_spell": 25, "vocabulary_match": 25, "antonym_match": 20,
+        "prefix_suffix": 20, "rhyme_match": 10,
+    },
+    # Grade 3-4: harder vocab, context clues, homophones, synonyms
+    "grade3": {
+        "vocabulary_hard": 18, "context_clues": 20, "homophone_pick": 16,
+        "synonym_match": 16, "prefix_suffix_hard": 15, "sentence_complete": 15,
+    },
+}
+
 
-    questions = []
-    for _ in range(count):
-        mode = random.choices(modes, weights=weights, k=1)[0]
-        q = _GENERATORS[mode](age)
-        questions.append(q)
-    return questions
+def generate_english_questions(age: int, count: int = 5, rng: random.Random = random) -> list[dict]:
+    """Generate age-appropriate English language questions."""
+    return registry.generate("english", age, count, rng)
 
 
 # ── Young kids (age <= 5) ──
 
-def _gen_letter_sound(age: int) -> dict:
+def _gen_letter_sound(age: int, rng: random.Random) -> dict:
     """What sound does this letter make?"""
-    letter, (sound, example) = random.choice(list(_LETTER_SOUNDS.items()))
+    letter, (sound, example) = rng.choice(list(_LETTER_SOUNDS.items()))
     correct = f"{sound}  ({example})"
 
     # Distractors: sounds from other letters
     others = [v for k, v in _LETTER_SOUNDS.items() if k != letter]
-    random.shuffle(others)
+    rng.shuffle(others)
     distractors = [f"{s}  ({ex})" for s, ex in others[:2]]
 
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="letter_sound",
@@ -184,16 +184,16 @@ def _gen_letter_sound(age: int) -> dict:
     )
 
 
-def _gen_beginning_sound(age: int) -> dict:
+def _gen_beginning_sound(age: int, rng: random.Random) -> dict:
     """What letter does this word start with?"""
-    word_img, correct_letter = random.choice(_BEGINNING_SOUNDS)
+    word_img, correct_letter = rng.choice(_BEGINNING_SOUNDS)
 
-    all_letters = list({l for _, l in _BEGINNING_SOUNDS if l != correct_letter})
-    random.shuffle(all_letters)
+    all_letters = sorted({l for _, l in _BEGINNING_SOUNDS if l != correct_letter})
+    rng.shuffle(all_letters)
     distractors = all_letters[:2]
 
     options = [correct_letter] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="beginning_sound",
@@ -205,21 +205,21 @@ def _gen_beginning_sound(age: int) -> dict:
     )
 
 
-def _gen_rhyme_match(age: int) -> dict:
+def _gen_rhyme_match(age: int, rng: random.Random) -> dict:
     """Which word rhymes with the given word?"""
-    base_word, rhymes = random.choice(_RHYME_GROUPS)
-    correct = random.choice(rhymes)
+    base_word, rhymes = rng.choice(_RHYME_GROUPS)
+    correct = rng.choice(rhymes)
 
     # Distractors: words from other rhyme groups
     other_words = []
     for w, rh in _RHYME_GROUPS:
         if w != base_word:
             other_words.extend(rh[:1])
-    random.shuffle(other_words)
+    rng.shuffle(other_words)
     distractors = [w for w in other_words if w != correct][:2]
 
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="rhyme_match",
@@ -231,18 +231,18 @@ def _gen_rhyme_match(age: int) -> dict:
     )
 
 
-def _gen_cvc_blend(age: int) -> dict:
+def _gen_cvc_blend(age: int, rng: random.Random) -> dict:
     """Blend these sounds together — what word?"""
-    sounds, word, emoji = random.choice(_CVC_WORDS)
+    sounds, word, emoji = rng.choice(_CVC_WORDS)
     correct = f"{word} {emoji}"
 
     # Distractors from other CVC words
     others = [(w, e) for s, w, e in _CVC_WORDS if w != word]
-    random.shuffle(others)
+    rng.shuffle(others)
     distractors = [f"{w} {e}" for w, e in others[:2]]
 
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="cvc_blend",
@@ -256,17 +256,17 @@ def _gen_cvc_blend(age: int) -> dict:
 
 # ── Older kids (age >= 6) ──
 
-def _gen_sight_word_spell(age: int) -> dict:
+def _gen_sight_word_spell(age: int, rng: random.Random) -> dict:
     """Pick the correctly spelled sight word."""
     pool = _SIGHT_WORDS_MEDIUM if age >= 7 else _SIGHT_WORDS_EASY
-    word = random.choice(pool)
+    word = rng.choice(pool)
     correct = word
 
     # Generate plausible misspellings
-    misspellings = _make_misspellings(word, 2)
+    misspellings = _make_misspellings(word, 2, rng)
 
     options = [correct] + misspellings
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="sight_word_spell",
@@ -278,7 +278,7 @@ def _gen_sight_word_spell(age: int) -> dict:
     )
 
 
-def _gen_vocabulary_match(age: int) -> dict:
+def _gen_vocabulary_match(age: int, rng: random.Random) -> dict:
     """Match the word to its meaning."""
     # Deduplicate vocabulary
     seen = set()
@@ -288,16 +288,16 @@ def _gen_vocabulary_match(age: int) -> dict:
             seen.add(w)
             pool.append((w, d))
 
-    word, definition = random.choice(pool)
+    word, definition = rng.choice(pool)
     correct = definition
 
     # Distractors: definitions of other words
     other_defs = [d for w2, d in pool if w2 != word]
-    random.shuffle(other_defs)
+    rng.shuffle(other_defs)
     distractors = other_defs[:2]
 
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="vocabulary_match",
@@ -309,11 +309,11 @@ def _gen_vocabulary_match(age: int) -> dict:
     )
 
 
-def _gen_antonym_match(age: int) -> dict:
+def _gen_antonym_match(age: int, rng: random.Random) -> dict:
     """What is the opposite of this word?"""
-    pair = random.choice(_ANTONYMS)
+    pair = rng.choice(_ANTONYMS)
     # Randomly pick which word to show
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         shown, correct = pair
     else:
         correct, shown = pair
@@ -325,10 +325,10 @@ def _gen_antonym_match(age: int) -> dict:
         all_words.add(b)
     all_words.discard(correct)
     all_words.discard(shown)
-    distractors = random.sample(list(all_words), min(2, len(all_words)))
+    distractors = rng.sample(sorted(all_words), min(2, len(all_words)))
 
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="antonym_match",
@@ -340,18 +340,18 @@ def _gen_antonym_match(age: int) -> dict:
     )
 
 
-def _gen_prefix_suffix(age: int) -> dict:
+def _gen_prefix_suffix(age: int, rng: random.Random) -> dict:
     """What word do you get when you add this prefix?"""
-    parts, combined, meaning = random.choice(_PREFIX_SUFFIX)
+    parts, combined, meaning = rng.choice(_PREFIX_SUFFIX)
     correct = combined
 
     # Distractors: other combined words
     others = [c for p, c, m in _PREFIX_SUFFIX if c != combined]
-    random.shuffle(others)
+    rng.shuffle(others)
     distractors = others[:2]
 
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="prefix_suffix",
@@ -388,14 +388,14 @@ _VOCABULARY_HARD = [
     ("vivid", "very bright and clear"),
 ]
 
-def _gen_vocabulary_hard(age: int) -> dict:
-    word, definition = random.choice(_VOCABULARY_HARD)
+def _gen_vocabulary_hard(age: int, rng: random.Random) -> dict:
+    word, definition = rng.choice(_VOCABULARY_HARD)
     correct = definition
     other_defs = [d for w, d in _VOCABULARY_HARD if w != word]
-    random.shuffle(other_defs)
+    rng.shuffle(other_defs)
     distractors = other_defs[:2]
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="vocabulary_hard",
         expression=f"📚 {word}",
@@ -433,10 +433,10 @@ _CONTEXT_CLUES = [
      ["correct", "wrong", "funny"]),
 ]
 
-def _gen_context_clues(age: int) -> dict:
-    sentence, correct, opts = random.choice(_CONTEXT_CLUES)
+def _gen_context_clues(age: int, rng: random.Random) -> dict:
+    sentence, correct, opts = rng.choice(_CONTEXT_CLUES)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="context_clues",
         expression=sentence,
@@ -466,10 +466,10 @@ _HOMOPHONES = [
     ("The knight rode a white ___.", "horse", ["horse", "hoarse", "house"]),
 ]
 
-def _gen_homophone_pick(age: int) -> dict:
-    sentence, correct, opts = random.choice(_HOMOPHONES)
+def _gen_homophone_pick(age: int, rng: random.Random) -> dict:
+    sentence, correct, opts = rng.choice(_HOMOPHONES)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="homophone_pick",
         expression=sentence,
@@ -499,10 +499,10 @@ _SYNONYMS = [
     ("silent", "quiet", ["quiet", "loud", "bright"]),
 ]
 
-def _gen_synonym_match(age: int) -> dict:
-    word, correct, opts = random.choice(_SYNONYMS)
+def _gen_synonym_match(age: int, rng: random.Random) -> dict:
+    word, correct, opts = rng.choice(_SYNONYMS)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="synonym_match",
         expression=f"🔄 {word}",
@@ -532,14 +532,14 @@ _PREFIX_SUFFIX_HARD = [
     ("out + run", "outrun", "to run faster than"),
 ]
 
-def _gen_prefix_suffix_hard(age: int) -> dict:
-    parts, combined, meaning = random.choice(_PREFIX_SUFFIX_HARD)
+def _gen_prefix_suffix_hard(age: int, rng: random.Random) -> dict:
+    parts, combined, meaning = rng.choice(_PREFIX_SUFFIX_HARD)
     correct = combined
     others = [c for p, c, m in _PREFIX_SUFFIX_HARD if c != combined]
-    random.shuffle(others)
+    rng.shuffle(others)
     distractors = others[:2]
     options = [correct] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="prefix_suffix_hard",
         expression=parts,
@@ -565,10 +565,10 @@ _SENTENCE_COMPLETE = [
     ("She ran fast, ___ she still missed the bus.", "but", ["but", "and", "so"]),
 ]
 
-def _gen_sentence_complete(age: int) -> dict:
-    sentence, correct, opts = random.choice(_SENTENCE_COMPLETE)
+def _gen_sentence_complete(age: int, rng: random.Random) -> dict:
+    sentence, correct, opts = rng.choice(_SENTENCE_COMPLETE)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="sentence_complete",
         expression=sentence,
@@ -581,43 +581,128 @@ def _gen_sentence_complete(age: int) -> dict:
 
 # ── Helpers ──
 
-def _make_misspellings(word: str, count: int) -> list[str]:
-    """Generate plausible misspellings of a word."""
-    misspellings = set()
-    attempts = 0
-    while len(misspellings) < count and attempts < 20:
-        attempts += 1
-        w = list(word)
-        if len(w) < 2:
-            # Very short word — just swap a letter
-            w[0] = random.choice("abcdefghijklmnopqrstuvwxyz")
-            mis = "".join(w)
-        else:
-            op = random.choice(["swap", "replace", "double", "drop"])
-            if op == "swap" and len(w) >= 2:
-                i = random.randint(0, len(w) - 2)
-                w[i], w[i + 1] = w[i + 1], w[i]
-            elif op == "replace":
-                i = random.randint(0, len(w) - 1)
-                vowels = "aeiou"
-                consonants = "bcdfghjklmnpqrstvwxyz"
-                if w[i] in vowels:
-                    w[i] = random.choice([v for v in vowels if v != w[i]])
-                else:
-                    w[i] = random.choice([c for c in consonants if c != w[i]])
-            elif op == "double" and len(w) >= 3:
-                i = random.randint(1, len(w) - 1)
-                w.insert(i, w[i])
-            elif op == "drop" and len(w) >= 3:
-                i = random.randint(1, len(w) - 1)
-                w.pop(i)
-            mis = "".join(w)
-        if mis != word and mis not in misspellings:
-            misspellings.add(mis)
-    # Fallback if we can't generate enough
-    while len(misspellings) < count:
-        misspellings.add(word + random.choice("es"))
-    return list(misspellings)[:count]
+def _make_misspellings(word: str, count: int, rng: random.Random) -> list[str]:
+    """Pick `count` of the word's precomputed misspellings."""
+    return rng.sample(_misspellings(word), count)
+
+
+# ── Misspelling bank ──
+# Ranked once at import for every sight word and vocabulary word: the
+# ways a child plausibly misspells a word (a sound-alike spelling, a wrong
+# vowel, a doubled or dropped letter, ...). Variants are ranked by edit
+# distance, then by how plausible their edit is, and no more than two come
+# from one kind of edit. Real words from any table are never offered as
+# misspellings. A word missing from the bank is ranked on first use.
+
+_VOWELS = "aeiou"
+# (spelling, another spelling of the same sound); lookaheads keep c, k and s
+# to the letters where they sound alike
+_SOUND_ALIKE = [
+    ("ck", "k"), ("c(?=[aou])", "k"), ("k(?=[aeiou])", "c"), ("c(?=[eiy])", "s"), ("s(?=[eiy])", "c"),
+    ("ph", "f"), ("ee", "ea"), ("ea", "ee"), ("ai", "ay"), ("ay", "ai"), ("ou", "ow"), ("ow", "ou"),
+    ("oo", "u"), ("er", "ur"), ("ir", "ur"), ("ur", "er"), ("wh", "w"), ("y$", "ie"), ("ous$", "us"),
+    ("tion", "shun"), ("x", "ks"), ("qu", "kw"), ("ey", "ay"), ("ould", "ood"), ("^kn", "n"),
+    ("^wr", "r"), ("igh", "ie"), ("th", "f"), ("s$", "z"),
+]
+# Letters young readers mirror or mix up by sound
+_LOOK_ALIKE = {"b": "d", "d": "b", "p": "q", "m": "n", "n": "m", "v": "f", "f": "v", "g": "j", "z": "s", "t": "d"}
+# Plausibility of each kind of edit
+_EDIT_SCORES = {
+    "sound": 0.9, "vowel": 0.8, "undouble": 0.8, "drop_e": 0.8, "add_e": 0.7,
+    "swap": 0.6, "double": 0.6, "drop": 0.5, "look": 0.5,
+}
+_MISSPELLINGS_PER_WORD = 4
+_MAX_PER_EDIT = 2
+
+
+def _spelling_variants(word: str) -> dict[str, str]:
+    """Every one-edit misspelling of `word`, mapped to its most plausible kind of edit."""
+    found: dict[str, str] = {}
+
+    def offer(variant: str, edit: str) -> None:
+        if variant and variant != word and _EDIT_SCORES[edit] > _EDIT_SCORES.get(found.get(variant), 0):
+            found[variant] = edit
+
+    for pattern, spelling in _SOUND_ALIKE:
+        for m in re.finditer(pattern, word):
+            offer(word[:m.start()] + spelling + word[m.end():], "sound")
+    for i, ch in enumerate(word):
+        if ch in _VOWELS:
+            for v in _VOWELS:
+                offer(word[:i] + v + word[i + 1:], "vowel")
+        elif ch in _LOOK_ALIKE:
+            offer(word[:i] + _LOOK_ALIKE[ch] + word[i + 1:], "look")
+        if i + 1 < len(word) and word[i] != word[i + 1]:
+            offer(word[:i] + word[i + 1] + word[i] + word[i + 2:], "swap")
+        if i and len(word) >= 3:
+            offer(word[:i] + word[i + 1:], "undouble" if word[i - 1] == ch else "drop")
+            if ch not in _VOWELS and word[i - 1] != ch:
+                offer(word[:i] + ch + word[i:], "double")
+    if word.endswith("e") and len(word) >= 3:
+        offer(word[:-1], "drop_e")
+    elif not word.endswith("e"):
+        offer(word + "e", "add_e")
+    return found
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance, counting a swap of neighbouring letters as one edit."""
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        prev2, prev = prev, row
+    return prev[len(b)]
+
+
+def _rank_misspellings(word: str) -> tuple[str, ...]:
+    variants = {v: edit for v, edit in _spelling_variants(word).items() if v not in _KNOWN_WORDS}
+    if len(variants) < _MISSPELLINGS_PER_WORD:
+        # Very short words have few one-edit misspellings; two edits make up the rest
+        for variant in list(variants):
+            for v, edit in _spelling_variants(variant).items():
+                if v != word and v not in _KNOWN_WORDS:
+                    variants.setdefault(v, edit)
+    ranked = sorted(variants, key=lambda v: (_edit_distance(word, v), -_EDIT_SCORES[variants[v]], v))
+    picked: list[str] = []
+    per_edit: dict[str, int] = {}
+    for v in ranked:
+        if per_edit.get(variants[v], 0) < _MAX_PER_EDIT:
+            picked.append(v)
+            per_edit[variants[v]] = per_edit.get(variants[v], 0) + 1
+            if len(picked) == _MISSPELLINGS_PER_WORD:
+                break
+    # When the cap leaves too few, the next best fill up, whatever their edit
+    picked += [v for v in ranked if v not in picked][:_MISSPELLINGS_PER_WORD - len(picked)]
+    return tuple(picked)
+
+
+def _misspellings(word: str) -> tuple[str, ...]:
+    ranked = _MISSPELLINGS.get(word)
+    if ranked is None:
+        ranked = _MISSPELLINGS[word] = _rank_misspellings(word)
+    return ranked
+
+
+# Every word that appears anywhere in the content pools (single letters
+# are there as letter names, not words)
+_KNOWN_WORDS = frozenset(w for w in re.findall(r"[a-z]+", str([
+    _LETTER_SOUNDS, _BEGINNING_SOUNDS, _RHYME_GROUPS, _SIGHT_WORDS_EASY, _SIGHT_WORDS_MEDIUM,
+    _VOCABULARY, _ANTONYMS, _PREFIX_SUFFIX, _CVC_WORDS, _VOCABULARY_HARD, _CONTEXT_CLUES,
+    _HOMOPHONES, _SYNONYMS, _PREFIX_SUFFIX_HARD, _SENTENCE_COMPLETE,
+]).lower()) if len(w) > 1 or w in ("a", "i")) | {
+    # Real words one edit away from a bank word that no table happens to use
+    "ad", "argent", "bean", "ben", "bye", "de", "doe", "end", "ether", "form", "ha", "hi",
+    "ma", "one", "ore", "os", "same", "thane", "theme", "then", "toe", "vary", "ware", "wen", "whit",
+}
+_MISSPELLINGS: dict[str, tuple[str, ...]] = {}
+for _word in dict.fromkeys(
+    _SIGHT_WORDS_EASY + _SIGHT_WORDS_MEDIUM + [w for w, _ in _VOCABULARY] + [w for w, _ in _VOCABULARY_HARD]
+):
+    _misspellings(_word)
 
 
 def _build(mode: str, expression: str, prompt_text: str, prompt_image: str | None,
@@ -659,3 +744,73 @@ _GENERATORS = {
     "prefix_suffix_hard": _gen_prefix_suffix_hard,
     "sentence_complete": _gen_sentence_complete,
 }
+
+
+# ── Static modes, enumerated for the question bank (services/question_bank.py) ──
+# Each enumerator yields one list per table item: every (expression,
+# prompt_text, prompt_image, correct_answer, options) that item can produce.
+# Picking 2 of the shuffled others is a uniform pair, so pairs are
+# enumerated with combinations; option order is left to the draw.
+
+def _static_letter_sound():
+    for letter, (sound, example) in _LETTER_SOUNDS.items():
+        others = [f"{s}  ({ex})" for k, (s, ex) in _LETTER_SOUNDS.items() if k != letter]
+        correct = f"{sound}  ({example})"
+        yield [(letter, f"What sound does '{letter}' make?", None, correct, (correct, *pair))
+               for pair in combinations(others, 2)]
+
+
+def _static_cvc_blend():
+    for sounds, word, emoji in _CVC_WORDS:
+        others = [f"{w} {e}" for s, w, e in _CVC_WORDS if w != word]
+        correct = f"{word} {emoji}"
+        yield [(sounds, "Blend the sounds! What word?", None, correct, (correct, *pair))
+               for pair in combinations(others, 2)]
+
+
+def _static_vocabulary_hard():
+    for word, definition in _VOCABULARY_HARD:
+        others = [d for w, d in _VOCABULARY_HARD if w != word]
+        yield [(f"📚 {word}", f"What does '{word}' mean?", None, definition, (definition, *pair))
+               for pair in combinations(others, 2)]
+
+
+def _static_context_clues():
+    for sentence, correct, opts in _CONTEXT_CLUES:
+        yield [(sentence, "Which word fits best?", None, correct, opts)]
+
+
+def _static_homophone_pick():
+    for sentence, correct, opts in _HOMOPHONES:
+        yield [(sentence, "Pick the right word!", None, correct, opts)]
+
+
+def _static_synonym_match():
+    for word, correct, opts in _SYNONYMS:
+        yield [(f"🔄 {word}", f"Which word means the SAME as '{word}'?", None, correct, opts)]
+
+
+def _static_prefix_suffix_hard():
+    for parts, combined, meaning in _PREFIX_SUFFIX_HARD:
+        others = [c for p, c, m in _PREFIX_SUFFIX_HARD if c != combined]
+        yield [(parts, f"Put them together! ({meaning})", None, combined, (combined, *pair))
+               for pair in combinations(others, 2)]
+
+
+def _static_sentence_complete():
+    for sentence, correct, opts in _SENTENCE_COMPLETE:
+        yield [(sentence, "Which word completes the sentence?", None, correct, opts)]
+
+
+STATIC_MODES = {
+    "letter_sound": _static_letter_sound,
+    "cvc_blend": _static_cvc_blend,
+    "vocabulary_hard": _static_vocabulary_hard,
+    "context_clues": _static_context_clues,
+    "homophone_pick": _static_homophone_pick,
+    "synonym_match": _static_synonym_match,
+    "prefix_suffix_hard": _static_prefix_suffix_hard,
+    "sentence_complete": _static_sentence_complete,
+}
+
+registry.register("english", MODE_WEIGHTS, _GENERATORS, pass_age=True, version=GENERATOR_VERSION)
@@ -0,0 +1,74 @@
+"""Review-load forecast: how many characters fall due on each coming day.
+
+One GROUP BY next_review_date query per child builds the histogram for
+the longest horizon (MAX_FORECAST_DAYS); shorter horizons are slices of
+it. Histograms are cached per worker until the child's next answer, or a
+scheduler change or refit, calls invalidate_forecast. The cache also
+expires at midnight. Answers handled by another worker show up once the
+entry is forecast_cache_seconds old.
+"""
+import time
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.progress import UserCharacterProgress
+
+MAX_FORECAST_DAYS = 90
+
+
+class Forecast(NamedTuple):
+    start: date
+    overdue: int               # due before start
+    counts: tuple[int, ...]    # counts[i] falls due on start + i days
+    loaded_at: float           # time.monotonic()
+
+    def horizon(self, days: int) -> tuple[int, ...]:
+        return self.counts[:days + 1]
+
+    def due_by(self, days: int) -> int:
+        """Everything due on or before start + days, overdue included."""
+        return self.overdue + sum(self.counts[:days + 1])
+
+
+_forecasts: dict[int, Forecast] = {}
+
+
+def invalidate_forecast(user_id: int) -> None:
+    _forecasts.pop(user_id, None)
+
+
+def _load_forecast(db: Session, user_id: int, today: date) -> Forecast:
+    p = UserCharacterProgress
+    rows = (
+        db.query(p.next_review_date, func.count(p.id))
+        .filter(p.user_id == user_id)
+        .filter(p.next_review_date <= today + timedelta(days=MAX_FORECAST_DAYS))
+        .group_by(p.next_review_date)
+        .all()
+    )
+    counts = [0] * (MAX_FORECAST_DAYS + 1)
+    overdue = 0
+    for due, n in rows:
+        offset = (due - today).days
+        if offset < 0:
+            overdue += n
+        else:
+            counts[offset] += n
+    return Forecast(today, overdue, tuple(counts), time.monotonic())
+
+
+def review_forecast(db: Session, user_id: int) -> Forecast:
+    """The user's due-count histogram from today, served from cache when fresh."""
+    today = date.today()
+    forecast = _forecasts.get(user_id)
+    if (
+        forecast is None
+        or forecast.start != today
+        or time.monotonic() - forecast.loaded_at > get_settings().forecast_cache_seconds
+    ):
+        forecast = _forecasts[user_id] = _load_forecast(db, user_id, today)
+    return forecast
@@ -0,0 +1,332 @@
+"""FSRS-style scheduler with per-user weights fitted from the answer log.
+
+Each character has a memory stability S, the days until recall
+probability falls to 90%, and a difficulty D from 1 to 10. After t days
+the recall probability is R = (1 + FACTOR * t / S) ** DECAY. Reviews move
+S and D by the FSRS-4.5 update rules, cut down to the two grades this app
+has: a first attempt is either recalled or not. Same-day retries are
+ignored because they don't change memory state. The next review is
+scheduled for the day R falls to fsrs_desired_retention.
+
+fit_weights fits the 13 weights per user. Every review after a
+character's first predicts R, and that prediction is scored against the
+first-attempt result. The objective is the log loss of those predictions
+plus a pull towards DEFAULT_WEIGHTS, so short histories stay close to
+the defaults. Adam minimises it using central finite differences. The
+model is evaluated for every perturbed weight vector and every character
+at once, so one optimizer step is a single vectorized pass over the
+history. The janitor calls fit_due_users to refit users on this
+scheduler once their weights are fsrs_refit_hours old.
+
+At answer time, update_mastery only adds a primary-key read of the
+user's stored weights.
+"""
+import json
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.progress import UserCharacterProgress
+from app.models.scheduler import SchedulerParams
+from app.models.user import User
+from app.services import spaced_repetition as sr
+from app.services.forecast import invalidate_forecast
+from app.services.session_archive import iter_question_history
+from app.services.sm2_batch import ReviewEvents, review_events
+
+logger = logging.getLogger(__name__)
+
+ENGINE = "fsrs"
+DECAY = -0.5
+FACTOR = 19 / 81          # makes R(S, S) = 0.9
+MIN_STABILITY = 0.01
+
+
+class FSRSWeights(NamedTuple):
+    s0_forgot: float = 0.4872       # stability after a first review that was missed
+    s0_recalled: float = 3.7145     # ... and one that was recalled
+    d0: float = 5.1618              # initial difficulty when recalled
+    d0_forgot: float = 1.2298       # half the extra initial difficulty when missed
+    d_forgot: float = 0.8975        # half the difficulty added by a lapse
+    d_reversion: float = 0.031      # pull of difficulty back towards d0
+    recall_scale: float = 1.6474    # log-scale of stability growth on recall
+    recall_s_decay: float = 0.1367  # growth shrinks as stability grows
+    recall_r_gain: float = 1.0461   # growth rises as recall odds fall
+    forget_scale: float = 2.1072    # post-lapse stability
+    forget_d_decay: float = 0.0793
+    forget_s_power: float = 0.3246
+    forget_r_gain: float = 1.587
+
+
+DEFAULT_WEIGHTS = FSRSWeights()
+LOWER = FSRSWeights(0.1, 0.1, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.1, 0.0, 0.0, 0.0)
+UPPER = FSRSWeights(10.0, 100.0, 10.0, 5.0, 5.0, 0.5, 3.0, 0.8, 3.0, 5.0, 0.5, 0.8, 3.0)
+
+
+def retrievability(elapsed_days, stability):
+    return (1 + FACTOR * np.asarray(elapsed_days) / stability) ** DECAY
+
+
+def next_interval(stability: float, retention: float) -> int:
+    """Days until recall odds fall to `retention` (equal to S at 0.9)."""
+    days = stability / FACTOR * (retention ** (1 / DECAY) - 1)
+    return int(min(max(np.rint(days), 1), sr.MAX_INTERVAL))
+
+
+# w below is indexable by weight position: an FSRSWeights for one user, or
+# (K, 1) columns when evaluating K weight vectors at once.
+
+def _initial_state(w, recalled):
+    s = np.where(recalled, w[1], w[0])
+    d = np.clip(w[2] + np.where(recalled, 0.0, 2 * w[3]), 1.0, 10.0)
+    return s, d
+
+
+def _next_state(w, s, d, elapsed, recalled):
+    """One review `elapsed` days after the last. Returns (S, D, R before the review)."""
+    r = retrievability(elapsed, s)
+    s_recalled = s * (1 + np.exp(w[6]) * (11 - d) * s ** -w[7] * np.expm1(w[8] * (1 - r)))
+    s_forgot = np.minimum(s, w[9] * d ** -w[10] * ((s + 1) ** w[11] - 1) * np.exp(w[12] * (1 - r)))
+    new_s = np.maximum(np.where(recalled, s_recalled, s_forgot), MIN_STABILITY)
+    new_d = np.clip(w[5] * w[2] + (1 - w[5]) * (d + np.where(recalled, 0.0, 2 * w[4])), 1.0, 10.0)
+    return new_s, new_d, r
+
+
+def first_attempts(events: ReviewEvents) -> ReviewEvents:
+    """Drop the quality-3 retry reviews; the rest are first attempts (5 or 1)."""
+    keep = events.quality != 3
+    return ReviewEvents(*(column[keep] for column in events))
+
+
+class _History(NamedTuple):
+    events: ReviewEvents
+    character_id: np.ndarray
+    counts: np.ndarray
+    order: np.ndarray    # event indices grouped by character, in time order
+    starts: np.ndarray
+
+
+def _history(events: ReviewEvents) -> _History:
+    chars, pair = np.unique(events.character_id, return_inverse=True)
+    counts = np.bincount(pair, minlength=len(chars))
+    order = np.argsort(pair, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+    return _History(events, chars, counts, order, starts)
+
+
+def _run(weights: np.ndarray, h: _History):
+    """Evaluate K weight vectors over the history.
+
+    Returns per-vector log-loss sums, the number of scored reviews, and
+    the final (K, characters) stability and difficulty with the day of
+    each character's last review.
+    """
+    k, n = len(weights), len(h.character_id)
+    w = weights.T[:, :, None]
+    s = np.zeros((k, n))
+    d = np.zeros((k, n))
+    last_day = np.zeros(n, dtype=np.int64)
+    loss = np.zeros(k)
+    scored = 0
+    for step in range(int(h.counts.max(initial=0))):
+        live = np.flatnonzero(h.counts > step)
+        idx = h.order[h.starts[live] + step]
+        recalled = h.events.quality[idx] >= 3
+        day = h.events.day[idx]
+        if step == 0:
+            s[:, live], d[:, live] = _initial_state(w, recalled)
+        else:
+            elapsed = day - last_day[live]
+            s[:, live], d[:, live], r = _next_state(w, s[:, live], d[:, live], elapsed, recalled)
+            # Same-day reviews say nothing about forgetting
+            mask = elapsed >= 1
+            p = np.clip(r[:, mask], 1e-6, 1 - 1e-6)
+            y = recalled[mask]
+            loss -= np.where(y, np.log(p), np.log1p(-p)).sum(axis=1)
+            scored += int(mask.sum())
+        last_day[live] = day
+    return loss, scored, s, d, last_day
+
+
+class FitResult(NamedTuple):
+    weights: FSRSWeights
+    review_count: int
+    log_loss: float           # per scored review
+    default_log_loss: float
+
+
+def fit_weights(
+    events: ReviewEvents,
+    min_reviews: int = 50,
+    iterations: int = 150,
+    learning_rate: float = 0.03,
+    prior_strength: float = 20.0,
+) -> FitResult:
+    """Fit weights to first-attempt reviews. Too few reviews keeps the defaults.
+
+    prior_strength is roughly how many reviews' worth of evidence the
+    defaults count for.
+    """
+    h = _history(first_attempts(events))
+    lower, span = np.array(LOWER), np.array(UPPER) - np.array(LOWER)
+    z0 = (np.array(DEFAULT_WEIGHTS) - lower) / span
+    default_loss, scored, *_ = _run(np.array([DEFAULT_WEIGHTS]), h)
+    default_mean = float(default_loss[0]) / scored if scored else 0.0
+    if scored < max(min_reviews, 1):
+        return FitResult(DEFAULT_WEIGHTS, scored, default_mean, default_mean)
+
+    # Optimize in the unit box between LOWER and UPPER
+    n = len(z0)
+    step = 1e-3
+    probes = np.vstack([np.zeros(n), np.eye(n) * step, -np.eye(n) * step])
+
+    def objective(z):
+        losses, *_ = _run(lower + z * span, h)
+        return (losses + prior_strength * ((z - z0) ** 2).sum(axis=1)) / scored
+
+    z = z0.copy()
+    m = np.zeros(n)
+    v = np.zeros(n)
+    for t in range(1, iterations + 1):
+        values = objective(z + probes)
+        grad = (values[1:n + 1] - values[n + 1:]) / (2 * step)
+        m = 0.9 * m + 0.1 * grad
+        v = 0.999 * v + 0.001 * grad ** 2
+        z = np.clip(z - learning_rate * (m / (1 - 0.9 ** t)) / (np.sqrt(v / (1 - 0.999 ** t)) + 1e-8), 0.0, 1.0)
+
+    weights = FSRSWeights(*(lower + z * span).tolist())
+    fitted_loss, *_ = _run(np.array([weights]), h)
+    return FitResult(weights, scored, float(fitted_loss[0]) / scored, default_mean)
+
+
+def user_weights(db: Session, user_id: int) -> FSRSWeights:
+    params = db.get(SchedulerParams, (user_id, ENGINE))
+    if params is None:
+        return DEFAULT_WEIGHTS
+    return FSRSWeights(*json.loads(params.weights))
+
+
+def update_mastery(
+    db: Session,
+    user_id: int,
+    character_id: int,
+    is_correct: bool,
+    is_first_attempt: bool = True,
+) -> None:
+    """Record an answer and schedule the character's next review by FSRS.
+
+    spaced_repetition.update_mastery still keeps the SM-2 bookkeeping
+    (counts, repetitions, mastery_score), then next_review_date is
+    overwritten with the FSRS due date. A retry leaves the FSRS state and
+    due date as they were.
+    """
+    p = UserCharacterProgress
+    # Row lock (no-op on SQLite) until the FSRS state is written back
+    before = db.execute(
+        select(p.fsrs_stability, p.fsrs_difficulty, p.next_review_date, p.last_seen)
+        .where(p.user_id == user_id, p.character_id == character_id)
+        .with_for_update()
+    ).first()
+    row = sr.update_mastery(db, user_id, character_id, is_correct, is_first_attempt)
+
+    if not is_first_attempt:
+        if before is None or before.fsrs_stability is None:
+            return
+        values = {"next_review_date": before.next_review_date}
+    else:
+        w = user_weights(db, user_id)
+        if before is None or before.fsrs_stability is None or before.last_seen is None:
+            s, d = _initial_state(w, is_correct)
+        else:
+            elapsed = (row.last_seen.date() - before.last_seen.date()).days
+            s, d, _ = _next_state(w, before.fsrs_stability, before.fsrs_difficulty, elapsed, is_correct)
+        retention = get_settings().fsrs_desired_retention
+        values = {
+            "fsrs_stability": float(s),
+            "fsrs_difficulty": float(d),
+            "next_review_date": date.today() + timedelta(days=next_interval(float(s), retention)),
+        }
+    db.connection().execute(update(p).where(p.id == row.id).values(**values))
+
+
+_REPLAY_UPDATE = (
+    update(UserCharacterProgress)
+    .where(UserCharacterProgress.user_id == bindparam("uid"))
+    .where(UserCharacterProgress.character_id == bindparam("cid"))
+    .values(
+        fsrs_stability=bindparam("s"),
+        fsrs_difficulty=bindparam("d"),
+        next_review_date=bindparam("due"),
+    )
+)
+
+
+def refit_user(db: Session, user_id: int, fit: bool = True) -> SchedulerParams:
+    """Fit a user's weights and replay their history to reset FSRS state and due dates.
+
+    Characters missing from the history (purged abandoned sessions) keep
+    their rows as they are.
+    """
+    settings = get_settings()
+    events = review_events(iter_question_history(db, user_id, include_unfinished=True))
+    params = db.get(SchedulerParams, (user_id, ENGINE))
+    if fit or params is None:
+        result = fit_weights(events, min_reviews=settings.fsrs_min_reviews)
+        if params is None:
+            params = SchedulerParams(user_id=user_id, engine=ENGINE)
+            db.add(params)
+        params.weights = json.dumps(list(result.weights))
+        params.review_count = result.review_count
+        params.log_loss = result.log_loss
+        params.default_log_loss = result.default_log_loss
+        params.fitted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    weights = FSRSWeights(*json.loads(params.weights))
+    h = _history(first_attempts(events))
+    _, _, s, d, last_day = _run(np.array([weights]), h)
+    rows = [
+        {
+            "uid": user_id,
+            "cid": int(h.character_id[i]),
+            "s": float(s[0, i]),
+            "d": float(d[0, i]),
+            "due": date.fromordinal(int(last_day[i]) + next_interval(float(s[0, i]), settings.fsrs_desired_retention)),
+        }
+        for i in range(len(h.character_id))
+    ]
+    if rows:
+        db.connection().execute(_REPLAY_UPDATE, rows)
+        db.get(User, user_id).bump_progress_version()
+    db.commit()
+    invalidate_forecast(user_id)
+    return params
+
+
+def fit_due_users(db: Session, max_age: timedelta, limit: int) -> int:
+    """Refit users on this scheduler whose weights are missing or older than max_age."""
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - max_age
+    user_ids = [
+        row[0]
+        for row in db.query(User.id)
+        .outerjoin(
+            SchedulerParams,
+            (SchedulerParams.user_id == User.id) & (SchedulerParams.engine == ENGINE),
+        )
+        .filter(User.scheduler == ENGINE)
+        .filter(or_(SchedulerParams.fitted_at.is_(None), SchedulerParams.fitted_at < cutoff))
+        .order_by(SchedulerParams.fitted_at.is_not(None), SchedulerParams.fitted_at, User.id)
+        .limit(limit)
+        .all()
+    ]
+    for user_id in user_ids:
+        params = refit_user(db, user_id)
+        logger.info(
+            "FSRS weights for user %d: %d reviews, log loss %.4f (defaults %.4f)",
+            user_id, params.review_count, params.log_loss or 0.0, params.default_log_loss or 0.0,
+        )
+    return len(user_ids)
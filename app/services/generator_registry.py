@@ -0,0 +1,162 @@
+"""One registry for every game's question modes and generators.
+
+Each game module registers its mode weights per band, and usually the
+generator for each mode, when it is imported:
+
+    registry.register("math", MODE_WEIGHTS, _GENERATORS)
+
+For math, logic and English the bands are age bands (see age_band). The
+Chinese path registers its own keys, because its modes depend on reading
+ability and on whether a character is a compound.
+
+Each weight table is compiled once into an AliasSampler, which makes a
+weighted draw in O(1) from a single random() call. Nothing is rebuilt per
+question, unlike random.choices over freshly built lists.
+registry.plan(game_type, age, n, rng) draws n modes from the band's
+sampler, each with a seed of its own, and registry.make builds one
+question from a (mode, seed). Each question depends only on its mode, its
+seed and the version of the generator serving the mode, so it can be
+rebuilt on its own later. registry.generate does both steps.
+registry.override swaps in other generators for some modes (the question
+bank's draws), with their own version, without changing any weights.
+"""
+import random
+from typing import Callable, Hashable, NamedTuple, Sequence
+
+AGE_BANDS = ("early", "grade2", "grade3")
+
+
+def age_band(age: int) -> str:
+    """Ages 5 and under, 6-7 (grade 2 level) and 8+ (grade 3-4 level)."""
+    if age <= 5:
+        return "early"
+    if age <= 7:
+        return "grade2"
+    return "grade3"
+
+
+class AliasSampler:
+    """Weighted choice in O(1) per draw (Vose's alias method)."""
+
+    __slots__ = ("items", "_n", "_prob", "_alias")
+
+    def __init__(self, items: Sequence, weights: Sequence[float]):
+        if not items or len(items) != len(weights) or min(weights) < 0 or sum(weights) <= 0:
+            raise ValueError("AliasSampler needs matching items and non-negative weights with a positive sum")
+        n = len(items)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left is 1.0 up to rounding
+        self.items = tuple(items)
+        self._n = n
+        self._prob = tuple(prob)
+        self._alias = tuple(alias)
+
+    def sample(self, rng: random.Random = random):
+        u = rng.random() * self._n
+        i = int(u)
+        return self.items[i] if u - i < self._prob[i] else self.items[self._alias[i]]
+
+    def sample_n(self, n: int, rng: random.Random = random) -> list:
+        items, prob, alias, size, draw = self.items, self._prob, self._alias, self._n, rng.random
+        out = []
+        for _ in range(n):
+            u = draw() * size
+            i = int(u)
+            out.append(items[i] if u - i < prob[i] else items[alias[i]])
+        return out
+
+    def probabilities(self) -> dict:
+        """Each item's chance of being drawn, rebuilt from the table (for tests)."""
+        chance = dict.fromkeys(self.items, 0.0)
+        for i, item in enumerate(self.items):
+            chance[item] += self._prob[i] / self._n
+            chance[self.items[self._alias[i]]] += (1 - self._prob[i]) / self._n
+        return chance
+
+
+class _Game(NamedTuple):
+    weights: dict[Hashable, dict[str, int]]
+    generators: dict[str, Callable[..., dict]]  # as registered, before overrides
+    version: str
+    pass_age: bool
+    modes: dict[Hashable, AliasSampler]         # band -> sampler over mode names
+    active: dict[str, tuple[Callable[..., dict], str]]  # mode -> (generator, version) after overrides
+
+
+class GeneratorRegistry:
+    def __init__(self):
+        self._games: dict[str, _Game] = {}
+
+    def register(
+        self,
+        game_type: str,
+        band_weights: dict[Hashable, dict[str, int]],
+        generators: dict[str, Callable[..., dict]] | None = None,
+        pass_age: bool = False,
+        version: str = "",
+    ) -> None:
+        """Compile a game's samplers.
+
+        Generators are called as fn(rng), or fn(age, rng) with `pass_age`.
+        `version` must change whenever the same rng could produce a
+        different question (see services/question_store.py).
+        """
+        modes = {
+            band: AliasSampler(list(weights), list(weights.values()))
+            for band, weights in band_weights.items()
+        }
+        generators = generators or {}
+        active = {mode: (fn, version) for mode, fn in generators.items()}
+        self._games[game_type] = _Game(band_weights, generators, version, pass_age, modes, active)
+
+    def override(
+        self, game_type: str, generators: dict[str, Callable[..., dict]] | None, version: str = "",
+    ) -> None:
+        """Serve some modes from other generators (e.g. the question bank); None restores."""
+        game = self._games[game_type]
+        active = {mode: (fn, game.version) for mode, fn in game.generators.items()}
+        active.update({mode: (fn, version) for mode, fn in (generators or {}).items()})
+        self._games[game_type] = game._replace(active=active)
+
+    def __contains__(self, game_type: str) -> bool:
+        return game_type in self._games
+
+    def mode_sampler(self, game_type: str, band: Hashable) -> AliasSampler:
+        return self._games[game_type].modes[band]
+
+    def version(self, game_type: str, mode: str) -> str:
+        """The version of the generator currently serving `mode`."""
+        return self._games[game_type].active[mode][1]
+
+    def plan(self, game_type: str, age: int, n: int, rng: random.Random = random) -> list[tuple[str, int]]:
+        """Draw n (mode, seed) pairs for a child of this age: what make() will build."""
+        game = self._games.get(game_type)
+        if game is None or not game.active:
+            raise ValueError(f"No generators registered for {game_type!r}")
+        modes = game.modes[age_band(age)].sample_n(n, rng)
+        return [(mode, rng.getrandbits(63)) for mode in modes]
+
+    def make(self, game_type: str, mode: str, age: int, seed: int) -> dict:
+        """The question `mode` generates from random.Random(seed); always the same for a version."""
+        game = self._games[game_type]
+        fn = game.active[mode][0]
+        rng = random.Random(seed)
+        return fn(age, rng) if game.pass_age else fn(rng)
+
+    def generate(self, game_type: str, age: int, n: int, rng: random.Random = random) -> list[dict]:
+        """n questions for a child of this age."""
+        return [self.make(game_type, mode, age, seed) for mode, seed in self.plan(game_type, age, n, rng)]
+
+
+registry = GeneratorRegistry()
@@ -0,0 +1,71 @@
+"""Idempotency keys for endpoints that spend coins.
+
+The client sends an Idempotency-Key header with each purchase. claim_key()
+reserves the key inside the request's transaction (the unique constraint
+makes a concurrent duplicate fail), and finish_key() stores the response
+so a retry of the same key replays it instead of spending again.
+"""
+import json
+from typing import NamedTuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.idempotency import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 64
+
+
+class Replay(NamedTuple):
+    status_code: int
+    body: dict
+
+
+def _lookup(db: Session, user_id: int, key: str) -> IdempotencyKey | None:
+    return db.query(IdempotencyKey).filter_by(user_id=user_id, key=key).first()
+
+
+def _as_replay(record: IdempotencyKey) -> Replay:
+    if record.status_code is None:
+        return Replay(409, {"error": "Request already in progress"})
+    return Replay(record.status_code, json.loads(record.response))
+
+
+def claim_key(db: Session, user_id: int, key: str | None, endpoint: str) -> IdempotencyKey | Replay | None:
+    """Reserve `key` for this request.
+
+    Returns None when the client sent no key, a Replay when the key was
+    already used (the caller returns it as-is), or the new IdempotencyKey
+    row to pass to finish_key().
+    """
+    if not key:
+        return None
+    key = key[:MAX_KEY_LENGTH]
+
+    existing = _lookup(db, user_id, key)
+    if existing:
+        return _as_replay(existing)
+
+    record = IdempotencyKey(user_id=user_id, key=key, endpoint=endpoint)
+    db.add(record)
+    try:
+        db.flush()
+    except IntegrityError:
+        # A concurrent request with the same key won the insert
+        db.rollback()
+        existing = _lookup(db, user_id, key)
+        if existing:
+            return _as_replay(existing)
+        return Replay(409, {"error": "Request already in progress"})
+    return record
+
+
+def finish_key(db: Session, claim: IdempotencyKey | None, status_code: int, body: dict) -> None:
+    """Record the response for a claimed key and commit it with the request's changes."""
+    if claim is not None:
+        # Re-add in case the request rolled back after claiming
+        db.add(claim)
+        claim.status_code = status_code
+        claim.response = json.dumps(body)
+    db.commit()
@@ -0,0 +1,195 @@
+"""Background janitor for abandoned sessions and stale rows.
+
+Started from the lifespan hook. Each run takes a lease row in job_leases so
+only one worker does the work, then deletes in bounded batches:
+
+- game sessions started more than abandoned_session_hours ago and never
+  completed, together with their session_questions
+- idempotency keys older than idempotency_key_days
+
+and rolls completed sessions older than archive_after_days into
+session_archives (see services/session_archive.py). It repairs any
+mastery summary that drifted from the progress rows (see
+services/mastery_summary.py), refits the FSRS
+weights of children on that scheduler once a day (see services/fsrs.py),
+and on PostgreSQL creates upcoming month partitions (see
+services/partitions.py).
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.idempotency import IdempotencyKey
+from app.models.lease import JobLease
+from app.models.session import GameSession, SessionQuestion
+from app.services.fsrs import fit_due_users
+from app.services.mastery_summary import check_mastery_summaries
+from app.services.partitions import ensure_partitions
+from app.services.session_archive import archive_completed_sessions
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "janitor"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def acquire_lease(db: Session, name: str, holder: str, ttl: timedelta) -> bool:
+    """Take or renew a named lease. Returns False while another holder's lease is live."""
+    now = _utcnow()
+    taken = db.execute(
+        update(JobLease)
+        .where(JobLease.name == name)
+        .where(or_(JobLease.expires_at < now, JobLease.holder == holder))
+        .values(holder=holder, expires_at=now + ttl)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if taken:
+        db.commit()
+        return True
+
+    db.add(JobLease(name=name, holder=holder, expires_at=now + ttl))
+    try:
+        db.commit()
+    except IntegrityError:
+        # The row exists and someone else holds it
+        db.rollback()
+        return False
+    return True
+
+
+def purge_abandoned_sessions(db: Session, older_than: timedelta, batch_size: int, max_batches: int) -> dict:
+    """Delete unfinished sessions older than `older_than`. Returns row counts removed."""
+    cutoff = _utcnow() - older_than
+    removed = {"sessions": 0, "questions": 0}
+    for _ in range(max_batches):
+        ids = [
+            row[0]
+            for row in db.query(GameSession.id)
+            .filter(GameSession.completed_at.is_(None))
+            .filter(GameSession.started_at < cutoff)
+            .order_by(GameSession.id)
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            break
+        removed["questions"] += (
+            db.query(SessionQuestion)
+            .filter(SessionQuestion.session_id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        removed["sessions"] += (
+            db.query(GameSession)
+            .filter(GameSession.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if len(ids) < batch_size:
+            break
+    return removed
+
+
+def purge_idempotency_keys(db: Session, older_than: timedelta, batch_size: int, max_batches: int) -> int:
+    """Delete idempotency keys older than `older_than`. Returns rows removed."""
+    cutoff = _utcnow() - older_than
+    removed = 0
+    for _ in range(max_batches):
+        ids = [
+            row[0]
+            for row in db.query(IdempotencyKey.id)
+            .filter(IdempotencyKey.created_at < cutoff)
+            .order_by(IdempotencyKey.id)
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            break
+        removed += (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if len(ids) < batch_size:
+            break
+    return removed
+
+
+def run_janitor(db: Session, holder: str | None = None) -> dict | None:
+    """One janitor pass. Returns what was removed, or None if another worker holds the lease."""
+    settings = get_settings()
+    holder = holder or _holder_id()
+    ttl = timedelta(minutes=max(settings.janitor_interval_minutes, 1))
+    if not acquire_lease(db, LEASE_NAME, holder, ttl):
+        return None
+
+    ensure_partitions(db.connection())
+    db.commit()
+
+    sessions = purge_abandoned_sessions(
+        db, timedelta(hours=settings.abandoned_session_hours),
+        settings.janitor_batch_size, settings.janitor_max_batches,
+    )
+    keys = purge_idempotency_keys(
+        db, timedelta(days=settings.idempotency_key_days),
+        settings.janitor_batch_size, settings.janitor_max_batches,
+    )
+    archived = {"sessions": 0, "questions": 0}
+    if settings.archive_after_days > 0:
+        archived = archive_completed_sessions(
+            db, timedelta(days=settings.archive_after_days),
+            settings.janitor_batch_size, settings.janitor_max_batches,
+        )
+    repaired = check_mastery_summaries(db)
+    if repaired:
+        logger.warning("Repaired mastery summaries for users %s", repaired)
+    fitted = 0
+    if settings.fsrs_fits_per_run > 0:
+        fitted = fit_due_users(db, timedelta(hours=settings.fsrs_refit_hours), settings.fsrs_fits_per_run)
+    report = {
+        "abandoned_sessions": sessions["sessions"],
+        "session_questions": sessions["questions"],
+        "idempotency_keys": keys,
+        "archived_sessions": archived["sessions"],
+        "archived_questions": archived["questions"],
+        "mastery_summaries_repaired": len(repaired),
+        "fsrs_fits": fitted,
+    }
+    if any(report.values()):
+        logger.info("Janitor pass: %s", report)
+    return report
+
+
+def _run_janitor_once() -> dict | None:
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return run_janitor(db)
+    finally:
+        db.close()
+
+
+async def janitor_loop() -> None:
+    """Run the janitor every janitor_interval_minutes until cancelled."""
+    interval = max(get_settings().janitor_interval_minutes, 1) * 60
+    while True:
+        try:
+            await asyncio.to_thread(_run_janitor_once)
+        except Exception:
+            logger.exception("Janitor run failed")
+        await asyncio.sleep(interval)
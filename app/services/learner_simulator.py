@@ -0,0 +1,183 @@
+"""Monte Carlo learner simulator for tuning session rules and scheduling.
+
+Runs synthetic learners through months of simulated days and reports, per
+configuration, how much they retain, how much they had to answer and how
+much of the catalog they reached. Each learner's day is vectorized across
+the catalog:
+
+- characters are picked with the same review-priority weights and the
+  same no-replacement weighted draw as select_characters
+- answers update the schedule with sm2_batch.sm2_step_batch, which
+  matches update_mastery exactly, including the quality-3 retry review
+- whether a learner actually remembers is an exponential forgetting
+  curve, p = exp(-days_since_review / stability). Stability grows on
+  successful recall and shrinks on a lapse. Multiple choice lets a
+  learner guess 1 in `options`.
+
+Learners run in a process pool. Compare configurations from the shell:
+
+    python -m app.services.learner_simulator --questions 5 8 --sessions 1 2 --learners 2000 --days 120
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.question_generator import SELECTION_WEIGHTS, SelectionWeights
+from app.services.sm2_batch import DEFAULT_PARAMS, SM2Params, mastery_from_repetitions, sm2_step_batch
+
+
+class RecallModel(NamedTuple):
+    initial_stability: float = 1.5   # days of memory after the first exposure
+    success_growth: float = 2.2      # stability multiplier on a successful recall
+    lapse_factor: float = 0.5        # stability multiplier on a failed recall
+    ability_sigma: float = 0.3       # lognormal spread of per-learner ability
+    options: int = 3                 # answer options per question
+
+
+class SimConfig(NamedTuple):
+    questions_per_session: int = 5
+    max_sessions_per_day: int = 2
+    play_probability: float = 0.8    # chance each allowed session is played
+    days: int = 90
+    catalog_size: int = 300
+    weights: SelectionWeights = SELECTION_WEIGHTS
+    sm2: SM2Params = DEFAULT_PARAMS
+    recall: RecallModel = RecallModel()
+
+
+METRICS = ("retention", "coverage", "mastered", "questions_per_day", "first_try_accuracy", "backlog")
+
+
+def selection_weights(seen, next_day, today: int, weights: SelectionWeights = SELECTION_WEIGHTS) -> np.ndarray:
+    """Vectorized question_generator.review_weight over the catalog."""
+    w = np.where(
+        next_day <= today, weights.overdue,
+        np.where(next_day <= today + weights.soon_days, weights.due_soon, weights.not_due),
+    )
+    return np.maximum(np.where(seen, w, weights.new), 1)
+
+
+def simulate_learner(config: SimConfig, seed: np.random.SeedSequence) -> dict:
+    """One learner over config.days. Returns the METRICS for that learner."""
+    rng = np.random.default_rng(seed)
+    n = config.catalog_size
+    recall = config.recall
+    ability = rng.lognormal(0.0, recall.ability_sigma)
+
+    seen = np.zeros(n, dtype=bool)
+    ef = np.full(n, config.sm2.initial_ef)
+    interval = np.zeros(n, dtype=np.int64)
+    reps = np.zeros(n, dtype=np.int64)
+    next_day = np.zeros(n, dtype=np.int64)
+    stability = np.full(n, recall.initial_stability)
+    last_review = np.zeros(n, dtype=np.int64)
+
+    answered = first_correct_total = first_total = 0
+    for day in range(config.days):
+        for _ in range(config.max_sessions_per_day):
+            if rng.random() >= config.play_probability:
+                continue
+            w = selection_weights(seen, next_day, day, config.weights)
+            # Weighted draw without replacement (Efraimidis-Spirakis keys), the
+            # same distribution as select_characters' sequential draw
+            keys = np.log(rng.random(n)) / w
+            k = min(config.questions_per_session, n)
+            pick = np.argpartition(-keys, k - 1)[:k]
+
+            p_recall = np.where(seen[pick], np.exp(-(day - last_review[pick]) / stability[pick]), 0.0)
+            first = rng.random(len(pick)) < p_recall + (1 - p_recall) / recall.options
+            retry = ~first & (rng.random(len(pick)) < p_recall + (1 - p_recall) / (recall.options - 1))
+
+            # Same review sequence as submit_answer: q5 or q1, then q3 on a good retry
+            e, i, r = sm2_step_batch(ef[pick], interval[pick], reps[pick], np.where(first, 5, 1), config.sm2)
+            e3, i3, r3 = sm2_step_batch(e, i, r, np.full(len(pick), 3), config.sm2)
+            ef[pick] = np.where(retry, e3, e)
+            interval[pick] = np.where(retry, i3, i)
+            reps[pick] = np.where(retry, r3, r)
+            next_day[pick] = day + interval[pick]
+
+            remembered = seen[pick] & first
+            stability[pick] = np.where(
+                ~seen[pick], recall.initial_stability * ability,
+                np.where(remembered, stability[pick] * recall.success_growth * ability,
+                         np.maximum(stability[pick] * recall.lapse_factor, recall.initial_stability)),
+            )
+            last_review[pick] = day
+            first_total += int(seen[pick].sum())
+            first_correct_total += int(remembered.sum())
+            seen[pick] = True
+            answered += len(pick) + int((~first).sum())
+
+    retention = np.exp(-(config.days - last_review[seen]) / stability[seen])
+    return {
+        "retention": float(retention.mean()) if seen.any() else 0.0,
+        "coverage": float(seen.mean()),
+        "mastered": float((mastery_from_repetitions(reps) >= 3).mean()),
+        "questions_per_day": answered / config.days,
+        "first_try_accuracy": first_correct_total / first_total if first_total else 0.0,
+        "backlog": int((seen & (next_day <= config.days)).sum()),
+    }
+
+
+def _simulate_chunk(args) -> list[dict]:
+    config, seeds = args
+    return [simulate_learner(config, s) for s in seeds]
+
+
+def run_config(config: SimConfig, learners: int, seed: int = 0, workers: int | None = None) -> dict:
+    """Simulate `learners` learners; returns the mean and 10th/90th percentile of each metric."""
+    seeds = np.random.SeedSequence(seed).spawn(learners)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = _simulate_chunk((config, seeds))
+    else:
+        chunks = [(config, seeds[i::workers]) for i in range(workers) if seeds[i::workers]]
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            results = [r for chunk in pool.map(_simulate_chunk, chunks) for r in chunk]
+
+    report = {}
+    for metric in METRICS:
+        values = np.array([r[metric] for r in results], dtype=np.float64)
+        report[metric] = (float(values.mean()), *np.percentile(values, [10, 90]).tolist())
+    return report
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Simulate learners under different session rules.")
+    parser.add_argument("--questions", type=int, nargs="+", default=[settings.questions_per_session])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[settings.max_sessions_per_day or 2])
+    parser.add_argument(
+        "--weights", nargs="+", default=[",".join(map(str, SELECTION_WEIGHTS[:4]))],
+        help="overdue,new,due_soon,not_due (e.g. 10,6,3,1)",
+    )
+    parser.add_argument("--learners", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--catalog", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'q/sess':>6} {'sess/day':>8} {'weights':>10} "
+          + " ".join(f"{m:>22}" for m in METRICS))
+    for weights in args.weights:
+        sel = SELECTION_WEIGHTS._replace(**dict(zip(("overdue", "new", "due_soon", "not_due"), map(int, weights.split(",")))))
+        for sessions in args.sessions:
+            for questions in args.questions:
+                config = SimConfig(
+                    questions_per_session=questions, max_sessions_per_day=sessions,
+                    days=args.days, catalog_size=args.catalog, weights=sel,
+                )
+                report = run_config(config, args.learners, args.seed, args.workers)
+                cells = " ".join(
+                    f"{mean:8.2f} [{lo:5.2f},{hi:5.2f}]" for mean, lo, hi in (report[m] for m in METRICS)
+                )
+                print(f"{questions:>6} {sessions:>8} {weights:>10} {cells}")
+
+
+if __name__ == "__main__":
+    main()
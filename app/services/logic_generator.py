@@ -1,35 +1,42 @@
 import json
 import random
+from itertools import permutations
+
+from app.services.generator_registry import registry
+
+# Bump when a change alters the question any (mode, seed) generates.
+# Unfinished compact sessions made under the old version go stale
+# (see services/question_store.py); comments and refactors don't need it.
+GENERATOR_VERSION = "1"
+
+
+# Mode weights per age band (generator_registry.age_band)
+MODE_WEIGHTS = {
+    "early": {
+        "pattern_next": 20, "odd_one_out": 20, "size_order": 15, "matching_pairs": 15,
+        "color_match": 15, "counting_objects": 15,
+    },
+    # Grade 2 level: mix visual modes with intermediate reasoning modes
+    "grade2": {
+        "pattern_next": 15, "odd_one_out": 15, "number_pattern": 15, "analogy": 15,
+        "sequence_completion": 15, "comparison": 15, "before_after": 10,
+    },
+    # Grade 3-4 level: harder reasoning, multi-step, deduction
+    "grade3": {
+        "number_pattern_hard": 15, "analogy_hard": 15, "logic_deduction": 15,
+        "matrix_pattern": 15, "word_analogy": 12, "sequence_hard": 12,
+        "odd_one_out_hard": 8, "comparison": 8,
+    },
+}
 
 
-def generate_logic_questions(age: int, count: int = 5) -> list[dict]:
+def generate_logic_questions(age: int, count: int = 5, rng: random.Random = random) -> list[dict]:
     """Generate age-appropriate logic questions.
 
     Returns list of dicts with: mode, expression, prompt_text, prompt_image,
     correct_answer, options, prompt_data (JSON string).
     """
-    if age <= 5:
-        modes = ["pattern_next", "odd_one_out", "size_order", "matching_pairs",
-                 "color_match", "counting_objects"]
-        weights = [20, 20, 15, 15, 15, 15]
-    elif age >= 8:
-        # Grade 3-4 level: harder reasoning, multi-step, deduction
-        modes = ["number_pattern_hard", "analogy_hard", "logic_deduction",
-                 "matrix_pattern", "word_analogy", "sequence_hard",
-                 "odd_one_out_hard", "comparison"]
-        weights = [15, 15, 15, 15, 12, 12, 8, 8]
-    else:
-        # Grade 2 level: mix visual modes with intermediate reasoning modes
-        modes = ["pattern_next", "odd_one_out", "number_pattern", "analogy",
-                 "sequence_completion", "comparison", "before_after"]
-        weights = [15, 15, 15, 15, 15, 15, 10]
-
-    questions = []
-    for _ in range(count):
-        mode = random.choices(modes, weights=weights, k=1)[0]
-        q = _GENERATORS[mode]()
-        questions.append(q)
-    return questions
+    return registry.generate("logic", age, count, rng)
 
 
 # ── Young kids (age <= 5) ──
@@ -40,11 +47,11 @@ _COLOR_EMOJIS = [
     ("🍎", "🍊"), ("❤️", "💙"), ("🌸", "⭐"), ("🎈", "🎀"),
 ]
 
-def _gen_pattern_next() -> dict:
-    pair = random.choice(_COLOR_EMOJIS)
+def _gen_pattern_next(rng: random.Random) -> dict:
+    pair = rng.choice(_COLOR_EMOJIS)
     a, b = pair
     # Pattern: ABABAB?
-    pattern_len = random.choice([4, 5, 6])
+    pattern_len = rng.choice([4, 5, 6])
     pattern = []
     for i in range(pattern_len):
         pattern.append(a if i % 2 == 0 else b)
@@ -54,9 +61,9 @@ def _gen_pattern_next() -> dict:
     expression = "".join(pattern) + " ?"
     # Third distractor from a different emoji
     others = ["⬛", "⬜", "🔶", "🔷", "💜", "💚"]
-    third = random.choice([e for e in others if e != correct and e != wrong])
+    third = rng.choice([e for e in others if e != correct and e != wrong])
     options = [correct, wrong, third]
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="pattern_next",
         expression=expression,
@@ -86,14 +93,14 @@ _ODD_ONE_OUT_SETS = [
     (["🔴", "🔵", "🟢"], "🐶", "colors"),
 ]
 
-def _gen_odd_one_out() -> dict:
-    group_items, odd, category = random.choice(_ODD_ONE_OUT_SETS)
+def _gen_odd_one_out(rng: random.Random) -> dict:
+    group_items, odd, category = rng.choice(_ODD_ONE_OUT_SETS)
     all_items = group_items + [odd]
-    random.shuffle(all_items)
+    rng.shuffle(all_items)
     expression = "  ".join(all_items)
     # Options: all 4 items, correct is the odd one
     options = list(all_items)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="odd_one_out",
         expression=expression,
@@ -119,13 +126,13 @@ _SIZE_SETS = [
     (["🍉", "🍊", "🍇"], "🍉"),   # watermelon biggest
 ]
 
-def _gen_size_order() -> dict:
-    items, biggest = random.choice(_SIZE_SETS)
+def _gen_size_order(rng: random.Random) -> dict:
+    items, biggest = rng.choice(_SIZE_SETS)
     display = list(items)
-    random.shuffle(display)
+    rng.shuffle(display)
     expression = "  ".join(display)
     options = list(display)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="size_order",
         expression=expression,
@@ -154,11 +161,11 @@ _MATCHING_PAIRS = [
     ("📷", "🖼️", ["🖼️", "🧣", "⚽"]),
 ]
 
-def _gen_matching_pairs() -> dict:
-    item, correct, opts = random.choice(_MATCHING_PAIRS)
+def _gen_matching_pairs(rng: random.Random) -> dict:
+    item, correct, opts = rng.choice(_MATCHING_PAIRS)
     expression = item + " goes with ?"
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="matching_pairs",
         expression=expression,
@@ -182,12 +189,12 @@ _COLOR_MATCH_GROUPS = [
     ("pink", "🌸", ["🎀", "🟢", "⭐"]),
 ]
 
-def _gen_color_match() -> dict:
-    color, prompt_emoji, opts = random.choice(_COLOR_MATCH_GROUPS)
+def _gen_color_match(rng: random.Random) -> dict:
+    color, prompt_emoji, opts = rng.choice(_COLOR_MATCH_GROUPS)
     correct = opts[0]
     expression = prompt_emoji
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="color_match",
         expression=expression,
@@ -198,18 +205,18 @@ def _gen_color_match() -> dict:
     )
 
 
-def _gen_counting_objects() -> dict:
+def _gen_counting_objects(rng: random.Random) -> dict:
     targets = ["🐶", "🐱", "🐟", "⭐", "🍎", "🌸", "🎈", "🐸"]
     distractors = ["🐶", "🐱", "🐟", "⭐", "🍎", "🌸", "🎈", "🐸"]
-    target = random.choice(targets)
-    distractor = random.choice([d for d in distractors if d != target])
-    target_count = random.randint(2, 5)
-    distractor_count = random.randint(2, 4)
+    target = rng.choice(targets)
+    distractor = rng.choice([d for d in distractors if d != target])
+    target_count = rng.randint(2, 5)
+    distractor_count = rng.randint(2, 4)
     items = [target] * target_count + [distractor] * distractor_count
-    random.shuffle(items)
+    rng.shuffle(items)
     expression = "".join(items)
     prompt_text = "How many " + target + "?"
-    options = _make_num_distractors_list(target_count)
+    options = _make_num_distractors_list(target_count, rng)
     return _build(
         mode="counting_objects",
         expression=expression,
@@ -222,16 +229,16 @@ def _gen_counting_objects() -> dict:
 
 # ── Older kids (age >= 6) — grade 2 level ──
 
-def _gen_number_pattern() -> dict:
+def _gen_number_pattern(rng: random.Random) -> dict:
     # Simple arithmetic sequences only (no geometric/squares)
-    start = random.randint(1, 10)
-    step = random.randint(1, 3)
+    start = rng.randint(1, 10)
+    step = rng.randint(1, 3)
     seq = [start + step * i for i in range(4)]
     ans = seq[-1] + step
 
     display = ", ".join(str(n) for n in seq)
     expression = display + ", ?"
-    options = _make_num_distractors_list(ans)
+    options = _make_num_distractors_list(ans, rng)
     return _build(
         mode="number_pattern",
         expression=expression,
@@ -253,12 +260,12 @@ _ANALOGIES = [
     ("Hand", "Glove", "Foot", "Shoe", ["Shoe", "Hat", "Sock"]),
 ]
 
-def _gen_analogy() -> dict:
-    a, b, c, correct, opts = random.choice(_ANALOGIES)
+def _gen_analogy(rng: random.Random) -> dict:
+    a, b, c, correct, opts = rng.choice(_ANALOGIES)
     expression = a + " : " + b + " = " + c + " : ?"
     prompt = a + " is to " + b + " as " + c + " is to ?"
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="analogy",
         expression=expression,
@@ -269,22 +276,22 @@ def _gen_analogy() -> dict:
     )
 
 
-def _gen_sequence_completion() -> dict:
-    seq_type = random.choice(["aabb", "abc", "growing"])
+def _gen_sequence_completion(rng: random.Random) -> dict:
+    seq_type = rng.choice(["aabb", "abc", "growing"])
     if seq_type == "aabb":
-        pair = random.choice(_COLOR_EMOJIS)
+        pair = rng.choice(_COLOR_EMOJIS)
         a, b = pair
         # AABB pattern: AABBAABB?  → next is determined by position
         pattern = [a, a, b, b, a, a]
         correct = b
         wrong = a
         others = ["⬛", "⬜", "🔶", "🔷", "💜", "💚"]
-        third = random.choice([e for e in others if e != correct and e != wrong])
+        third = rng.choice([e for e in others if e != correct and e != wrong])
         expression = "".join(pattern) + " ?"
         options = [correct, wrong, third]
     elif seq_type == "abc":
         emojis = ["🔴", "🔵", "🟢", "🟡", "🟠", "🟣"]
-        trio = random.sample(emojis, 3)
+        trio = rng.sample(emojis, 3)
         a, b, c = trio
         pattern = [a, b, c, a, b]
         correct = c
@@ -295,8 +302,8 @@ def _gen_sequence_completion() -> dict:
         options = [correct, wrong1, wrong2]
     else:
         # Growing: ⭐ ⭐⭐ ⭐⭐⭐ ?  → ⭐⭐⭐⭐
-        emoji = random.choice(["⭐", "🔴", "🌸", "🎈"])
-        start = random.randint(1, 2)
+        emoji = rng.choice(["⭐", "🔴", "🌸", "🎈"])
+        start = rng.randint(1, 2)
         seq = [emoji * (start + i) for i in range(3)]
         correct_str = emoji * (start + 3)
         expression = "  ".join(seq) + "  ?"
@@ -304,7 +311,7 @@ def _gen_sequence_completion() -> dict:
         wrong2 = emoji * (start + 4)
         options = [correct_str, wrong1, wrong2]
         correct = correct_str
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="sequence_completion",
         expression=expression,
@@ -328,13 +335,13 @@ _COMPARISON_SETS = [
     ("Which holds the most water?", ["🌊", "🥛", "💧"], "🌊"),
 ]
 
-def _gen_comparison() -> dict:
-    prompt, items, correct = random.choice(_COMPARISON_SETS)
+def _gen_comparison(rng: random.Random) -> dict:
+    prompt, items, correct = rng.choice(_COMPARISON_SETS)
     display = list(items)
-    random.shuffle(display)
+    rng.shuffle(display)
     expression = "  ".join(display)
     options = list(display)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="comparison",
         expression=expression,
@@ -358,10 +365,10 @@ _BEFORE_AFTER_SETS = [
     ("What comes after breakfast?", "Lunch", ["Lunch", "Dinner", "Snack"]),
 ]
 
-def _gen_before_after() -> dict:
-    prompt, correct, opts = random.choice(_BEFORE_AFTER_SETS)
+def _gen_before_after(rng: random.Random) -> dict:
+    prompt, correct, opts = rng.choice(_BEFORE_AFTER_SETS)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="before_after",
         expression=prompt,
@@ -372,11 +379,11 @@ def _gen_before_after() -> dict:
     )
 
 
-def _make_num_distractors_list(correct: int) -> list[str]:
+def _make_num_distractors_list(correct: int, rng: random.Random) -> list[str]:
     """Generate 2 plausible distractors near the correct answer."""
     distractors = set()
     offsets = [-3, -2, -1, 1, 2, 3]
-    random.shuffle(offsets)
+    rng.shuffle(offsets)
     for off in offsets:
         d = correct + off
         if d != correct and d >= 0:
@@ -384,42 +391,42 @@ def _make_num_distractors_list(correct: int) -> list[str]:
         if len(distractors) >= 2:
             break
     while len(distractors) < 2:
-        d = correct + random.choice([4, 5, -4, -5])
+        d = correct + rng.choice([4, 5, -4, -5])
         if d != correct and d >= 0:
             distractors.add(d)
     options = [str(correct)] + [str(d) for d in list(distractors)[:2]]
-    random.shuffle(options)
+    rng.shuffle(options)
     return options
 
 
 # ── Grade 3-4 (age >= 8) ──
 
-def _gen_number_pattern_hard() -> dict:
+def _gen_number_pattern_hard(rng: random.Random) -> dict:
     """Harder number patterns: multiply, double+add, skip-count, triangular."""
-    pattern_type = random.choice(["multiply", "double_add", "skip_big", "square", "triangular"])
+    pattern_type = rng.choice(["multiply", "double_add", "skip_big", "square", "triangular"])
     if pattern_type == "multiply":
-        base = random.randint(2, 5)
-        multiplier = random.randint(2, 4)
+        base = rng.randint(2, 5)
+        multiplier = rng.randint(2, 4)
         seq = [base * (multiplier ** i) for i in range(4)]
         ans = base * (multiplier ** 4)
     elif pattern_type == "double_add":
-        start = random.randint(1, 5)
-        add = random.randint(1, 3)
+        start = rng.randint(1, 5)
+        add = rng.randint(1, 3)
         seq = [start]
         for _ in range(3):
             seq.append(seq[-1] * 2 + add)
         ans = seq[-1] * 2 + add
     elif pattern_type == "skip_big":
-        start = random.randint(5, 20)
-        step = random.choice([5, 7, 9, 11])
+        start = rng.randint(5, 20)
+        step = rng.choice([5, 7, 9, 11])
         seq = [start + step * i for i in range(4)]
         ans = seq[-1] + step
     elif pattern_type == "square":
-        start = random.randint(1, 5)
+        start = rng.randint(1, 5)
         seq = [(start + i) ** 2 for i in range(4)]
         ans = (start + 4) ** 2
     else:  # triangular: +1, +2, +3, +4...
-        start = random.randint(1, 5)
+        start = rng.randint(1, 5)
         seq = [start]
         for i in range(1, 4):
             seq.append(seq[-1] + i + 1)
@@ -427,7 +434,7 @@ def _gen_number_pattern_hard() -> dict:
 
     display = ", ".join(str(n) for n in seq)
     expression = display + ", ?"
-    options = _make_num_distractors_list(ans)
+    options = _make_num_distractors_list(ans, rng)
     return _build(
         mode="number_pattern_hard",
         expression=expression,
@@ -453,12 +460,12 @@ _ANALOGIES_HARD = [
     ("Oar", "Boat", "Pedal", "Bicycle", ["Bicycle", "Car", "Wheel"]),
 ]
 
-def _gen_analogy_hard() -> dict:
-    a, b, c, correct, opts = random.choice(_ANALOGIES_HARD)
+def _gen_analogy_hard(rng: random.Random) -> dict:
+    a, b, c, correct, opts = rng.choice(_ANALOGIES_HARD)
     expression = f"{a} : {b} = {c} : ?"
     prompt = f"{a} is to {b} as {c} is to ?"
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="analogy_hard",
         expression=expression,
@@ -492,10 +499,10 @@ _LOGIC_DEDUCTIONS = [
      ["The water will freeze", "The water will boil", "The water stays the same"]),
 ]
 
-def _gen_logic_deduction() -> dict:
-    premise, correct, opts = random.choice(_LOGIC_DEDUCTIONS)
+def _gen_logic_deduction(rng: random.Random) -> dict:
+    premise, correct, opts = rng.choice(_LOGIC_DEDUCTIONS)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="logic_deduction",
         expression=premise,
@@ -526,10 +533,10 @@ _MATRIX_PATTERNS = [
      ["🟢", "🔴", "🟡"]),
 ]
 
-def _gen_matrix_pattern() -> dict:
-    grid, prompt, correct, opts = random.choice(_MATRIX_PATTERNS)
+def _gen_matrix_pattern(rng: random.Random) -> dict:
+    grid, prompt, correct, opts = rng.choice(_MATRIX_PATTERNS)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="matrix_pattern",
         expression=grid,
@@ -555,10 +562,10 @@ _WORD_ANALOGIES = [
     ("Keyboard is to type as microphone is to ___", "speak", ["speak", "read", "write"]),
 ]
 
-def _gen_word_analogy() -> dict:
-    prompt, correct, opts = random.choice(_WORD_ANALOGIES)
+def _gen_word_analogy(rng: random.Random) -> dict:
+    prompt, correct, opts = rng.choice(_WORD_ANALOGIES)
     options = list(opts)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="word_analogy",
         expression=prompt,
@@ -569,42 +576,42 @@ def _gen_word_analogy() -> dict:
     )
 
 
-def _gen_sequence_hard() -> dict:
+def _gen_sequence_hard(rng: random.Random) -> dict:
     """Harder sequences: alternating operations, Fibonacci-like, decreasing."""
-    seq_type = random.choice(["alternating", "fibonacci", "decreasing", "prime_skip"])
+    seq_type = rng.choice(["alternating", "fibonacci", "decreasing", "prime_skip"])
     if seq_type == "alternating":
         # +2, +3, +2, +3...
-        a = random.randint(1, 3)
-        b = random.randint(4, 6)
-        start = random.randint(1, 10)
+        a = rng.randint(1, 3)
+        b = rng.randint(4, 6)
+        start = rng.randint(1, 10)
         seq = [start]
         for i in range(4):
             seq.append(seq[-1] + (a if i % 2 == 0 else b))
         correct = seq[-1] + (a if 4 % 2 == 0 else b)
         seq_display = seq
     elif seq_type == "fibonacci":
-        a, b = random.randint(1, 3), random.randint(2, 5)
+        a, b = rng.randint(1, 3), rng.randint(2, 5)
         seq = [a, b]
         for _ in range(3):
             seq.append(seq[-1] + seq[-2])
         correct = seq[-1] + seq[-2]
         seq_display = seq
     elif seq_type == "decreasing":
-        start = random.randint(50, 100)
-        step = random.choice([3, 5, 7, 9])
+        start = rng.randint(50, 100)
+        step = rng.choice([3, 5, 7, 9])
         seq = [start - step * i for i in range(5)]
         correct = seq[-1] - step
         seq_display = seq
     else:  # prime_skip: skip counting by primes
-        primes_step = random.choice([2, 3, 5, 7])
-        start = random.randint(1, 10)
+        primes_step = rng.choice([2, 3, 5, 7])
+        start = rng.randint(1, 10)
         seq = [start + primes_step * i for i in range(5)]
         correct = seq[-1] + primes_step
         seq_display = seq
 
     display = ", ".join(str(n) for n in seq_display)
     expression = display + ", ?"
-    options = _make_num_distractors_list(correct)
+    options = _make_num_distractors_list(correct, rng)
     return _build(
         mode="sequence_hard",
         expression=expression,
@@ -630,13 +637,13 @@ _ODD_ONE_OUT_HARD = [
     (["Jupiter", "Saturn", "Neptune"], "Moon", "planets vs satellite"),
 ]
 
-def _gen_odd_one_out_hard() -> dict:
-    group_items, odd, category = random.choice(_ODD_ONE_OUT_HARD)
+def _gen_odd_one_out_hard(rng: random.Random) -> dict:
+    group_items, odd, category = rng.choice(_ODD_ONE_OUT_HARD)
     all_items = group_items + [odd]
-    random.shuffle(all_items)
+    rng.shuffle(all_items)
     expression = " · ".join(all_items)
     options = list(all_items)
-    random.shuffle(options)
+    rng.shuffle(options)
     return _build(
         mode="odd_one_out_hard",
         expression=expression,
@@ -690,3 +697,87 @@ _GENERATORS = {
     "sequence_hard": _gen_sequence_hard,
     "odd_one_out_hard": _gen_odd_one_out_hard,
 }
+
+
+# ── Static modes, enumerated for the question bank (services/question_bank.py) ──
+# Each enumerator yields one list per table item: every (expression,
+# prompt_text, prompt_image, correct_answer, options) that item can produce.
+# Option order is left to the draw, which shuffles.
+
+def _static_odd_one_out():
+    for group_items, odd, _ in _ODD_ONE_OUT_SETS:
+        yield [("  ".join(p), "Which one is different?", "  ".join(p), odd, p)
+               for p in permutations(group_items + [odd])]
+
+
+def _static_size_order():
+    for items, biggest in _SIZE_SETS:
+        yield [("  ".join(p), "Which is the biggest?", "  ".join(p), biggest, p) for p in permutations(items)]
+
+
+def _static_matching_pairs():
+    for item, correct, opts in _MATCHING_PAIRS:
+        yield [(item + " goes with ?", item + " goes with?", item, correct, opts)]
+
+
+def _static_color_match():
+    for _, prompt_emoji, opts in _COLOR_MATCH_GROUPS:
+        yield [(prompt_emoji, "Which is the same color?", prompt_emoji, opts[0], opts)]
+
+
+def _static_analogy():
+    for a, b, c, correct, opts in _ANALOGIES:
+        yield [(a + " : " + b + " = " + c + " : ?", a + " is to " + b + " as " + c + " is to ?", None, correct, opts)]
+
+
+def _static_comparison():
+    for prompt, items, correct in _COMPARISON_SETS:
+        yield [("  ".join(p), prompt, "  ".join(p), correct, p) for p in permutations(items)]
+
+
+def _static_before_after():
+    for prompt, correct, opts in _BEFORE_AFTER_SETS:
+        yield [(prompt, prompt, None, correct, opts)]
+
+
+def _static_analogy_hard():
+    for a, b, c, correct, opts in _ANALOGIES_HARD:
+        yield [(f"{a} : {b} = {c} : ?", f"{a} is to {b} as {c} is to ?", None, correct, opts)]
+
+
+def _static_logic_deduction():
+    for premise, correct, opts in _LOGIC_DEDUCTIONS:
+        yield [(premise, "What must be true?", None, correct, opts)]
+
+
+def _static_matrix_pattern():
+    for grid, prompt, correct, opts in _MATRIX_PATTERNS:
+        yield [(grid, prompt, None, correct, opts)]
+
+
+def _static_word_analogy():
+    for prompt, correct, opts in _WORD_ANALOGIES:
+        yield [(prompt, "Complete the analogy", None, correct, opts)]
+
+
+def _static_odd_one_out_hard():
+    for group_items, odd, _ in _ODD_ONE_OUT_HARD:
+        yield [(" · ".join(p), "Which one doesn't belong?", None, odd, p) for p in permutations(group_items + [odd])]
+
+
+STATIC_MODES = {
+    "odd_one_out": _static_odd_one_out,
+    "size_order": _static_size_order,
+    "matching_pairs": _static_matching_pairs,
+    "color_match": _static_color_match,
+    "analogy": _static_analogy,
+    "comparison": _static_comparison,
+    "before_after": _static_before_after,
+    "analogy_hard": _static_analogy_hard,
+    "logic_deduction": _static_logic_deduction,
+    "matrix_pattern": _static_matrix_pattern,
+    "word_analogy": _static_word_analogy,
+    "odd_one_out_hard": _static_odd_one_out_hard,
+}
+
+registry.register("logic", MODE_WEIGHTS, _GENERATORS, version=GENERATOR_VERSION)
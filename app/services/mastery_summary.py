@@ -0,0 +1,135 @@
+"""Per-user mastery histogram, kept on write.
+
+user_mastery_summary holds, per user, how many characters are at each
+mastery level (0-5) plus their sum and count. update_mastery's upsert
+returns the row's mastery before and after the answer. When they differ,
+apply_mastery_change moves one count between levels with a single upsert
+on the summary row, so readers get the histogram and the average from one
+primary-key read.
+
+check_mastery_summaries recomputes summaries from user_character_progress
+with one GROUP BY and repairs any that drifted, for example after rows
+were written outside update_mastery. The janitor runs it every pass, and
+sm2_batch.rebuild_progress runs it for the user it rebuilt. From the
+shell:
+
+    python -m app.services.mastery_summary            # report only
+    python -m app.services.mastery_summary --repair
+"""
+import argparse
+import logging
+from functools import lru_cache
+
+from sqlalchemy import bindparam, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.progress import MASTERY_LEVELS, UserCharacterProgress, UserMasterySummary
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _change_statement(dialect: str):
+    """Add per-level deltas to a user's summary, creating it if needed."""
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    s = UserMasterySummary
+    deltas = {f"level_{level}": bindparam(f"d{level}") for level in MASTERY_LEVELS}
+    deltas["mastery_sum"] = bindparam("dsum")
+    deltas["character_count"] = bindparam("dcount")
+    return (
+        insert(s)
+        .values(user_id=bindparam("user_id"), **deltas)
+        .on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={column: getattr(s, column) + delta for column, delta in deltas.items()},
+        )
+    )
+
+
+def apply_mastery_change(conn: Connection, user_id: int, old: int | None, new: int) -> None:
+    """Move one character from level `old` to `new`; `old` None means a new character."""
+    params = {f"d{level}": int(level == new) - int(level == old) for level in MASTERY_LEVELS}
+    params.update(user_id=user_id, dsum=new - (old or 0), dcount=int(old is None))
+    conn.execute(_change_statement(conn.dialect.name), params)
+
+
+def get_mastery_summary(db: Session, user_id: int) -> UserMasterySummary:
+    """The user's summary; an all-zero one (not added to the session) if they have none."""
+    summary = db.get(UserMasterySummary, user_id)
+    if summary is None:
+        summary = UserMasterySummary(
+            user_id=user_id, mastery_sum=0, character_count=0,
+            **{f"level_{level}": 0 for level in MASTERY_LEVELS},
+        )
+    return summary
+
+
+def _expected(db: Session, user_ids: list[int] | None) -> dict[int, dict]:
+    p = UserCharacterProgress
+    level = func.coalesce(p.mastery_score, 0)
+    query = db.query(p.user_id, level, func.count(p.id)).group_by(p.user_id, level)
+    if user_ids is not None:
+        query = query.filter(p.user_id.in_(user_ids))
+    expected: dict[int, dict] = {}
+    for user_id, mastery, n in query:
+        row = expected.setdefault(user_id, {
+            **{f"level_{lv}": 0 for lv in MASTERY_LEVELS}, "mastery_sum": 0, "character_count": 0,
+        })
+        row[f"level_{min(max(mastery, 0), 5)}"] += n
+        row["mastery_sum"] += mastery * n
+        row["character_count"] += n
+    return expected
+
+
+def check_mastery_summaries(db: Session, user_ids: list[int] | None = None, repair: bool = True) -> list[int]:
+    """Compare summaries with the progress rows. Returns users whose summary was wrong.
+
+    With repair, wrong or missing summaries are rewritten and committed.
+    """
+    expected = _expected(db, user_ids)
+    query = db.query(UserMasterySummary)
+    if user_ids is not None:
+        query = query.filter(UserMasterySummary.user_id.in_(user_ids))
+    summaries = {s.user_id: s for s in query}
+
+    empty = {f"level_{lv}": 0 for lv in MASTERY_LEVELS} | {"mastery_sum": 0, "character_count": 0}
+    wrong = []
+    for user_id in sorted(expected.keys() | summaries.keys()):
+        want = expected.get(user_id, empty)
+        summary = summaries.get(user_id)
+        if summary is not None and all(getattr(summary, k) == v for k, v in want.items()):
+            continue
+        wrong.append(user_id)
+        if not repair:
+            continue
+        if summary is None:
+            db.add(UserMasterySummary(user_id=user_id, **want))
+        else:
+            for column, value in want.items():
+                setattr(summary, column, value)
+    if repair and wrong:
+        db.commit()
+    return wrong
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check user_mastery_summary against user_character_progress.")
+    parser.add_argument("--repair", action="store_true", help="rewrite summaries that are wrong")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        wrong = check_mastery_summaries(db, repair=args.repair)
+        action = "repaired" if args.repair else "wrong"
+        print(f"{len(wrong)} summaries {action}" + (f": users {wrong}" if wrong else ""))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Vectorized math questions for worksheets and pre-generated pools.
+
+math_generator makes one question per call: a few rng.randint calls, a
+distractor loop and a json.dumps. This module makes N questions of a
+mode at once as NumPy arrays (operands, answers and shuffled option
+triples) and only formats them when a caller iterates rows() or
+questions().
+
+Every mode follows its scalar generator's rules. Operands are drawn
+uniformly from the same ranges, including ranges that depend on the
+other operand, such as b <= 10 - a. Results are never negative.
+Distractors come from the same window around the answer (within 3, and
+inside the mode's low/high bounds). They are distinct from the answer
+and from each other. The window-then-fill rule uses random sort keys and
+masks instead of a loop. Sessions keep using the scalar generators,
+which are cheaper for five questions; batches use their own
+np.random.Generator and don't reproduce a session's seed.
+"""
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+from app.services import math_generator as mg
+from app.services.generator_registry import age_band
+
+_OPS = ("+", "-", "x")
+_FRACTION_NAMES = [name for name, _ in mg._FRACTION_POOL]
+_FRACTION_VALUES = np.array([value for _, value in mg._FRACTION_POOL])
+# Distractor offsets: the scalar window first, then its fill-in offsets
+_WINDOW = np.array([-3, -2, -1, 1, 2, 3])
+_FILL = np.array([-1, 1, -2, 2, 3])
+
+
+class MathBatch(NamedTuple):
+    """N questions of one mode. Column meaning depends on the mode:
+
+    counting: left = the count, right = emoji index
+    a op b modes: left, right = operands (division: dividend, divisor)
+    missing_number_*: left = the other operand, right = the result, op per row
+    fractions_compare: left, right = fraction indices, options = fraction indices
+    """
+    mode: str
+    left: np.ndarray
+    right: np.ndarray
+    op: np.ndarray        # index into "+", "-", "x"
+    answer: np.ndarray
+    options: np.ndarray   # (n, 3), answer included, display order
+
+    def __len__(self) -> int:
+        return len(self.answer)
+
+
+def _between(rng: np.random.Generator, low, high, n: int) -> np.ndarray:
+    """Uniform integers in [low, high]; either bound may be an array."""
+    low = np.asarray(low)
+    return low + (rng.random(n) * (np.asarray(high) - low + 1)).astype(np.int64)
+
+
+def _distractors(rng: np.random.Generator, answer: np.ndarray, low, high) -> np.ndarray:
+    """Two distinct wrong answers per row, as _make_number_distractors picks them."""
+    n = len(answer)
+    low = np.broadcast_to(low, n)[:, None]
+    high = np.broadcast_to(high, n)[:, None]
+    window = answer[:, None] + _WINDOW
+    fill = answer[:, None] + _FILL
+    # Window candidates sort first (keys in [0, 1)), fill-ins after ([1, 2)), the rest never
+    window_keys = np.where((window >= low) & (window <= high), rng.random(window.shape), np.inf)
+    fill_keys = np.where(fill >= 0, 1 + rng.random(fill.shape), np.inf)
+    candidates = np.concatenate([window, fill], axis=1)
+    keys = np.concatenate([window_keys, fill_keys], axis=1)
+    first = np.argmin(keys, axis=1)
+    rows = np.arange(n)
+    picked = candidates[rows, first]
+    # The second pick must differ from the first (a fill-in can repeat a window value)
+    keys[candidates == picked[:, None]] = np.inf
+    second = candidates[rows, np.argmin(keys, axis=1)]
+    return np.stack([picked, second], axis=1)
+
+
+def _shuffled(rng: np.random.Generator, answer: np.ndarray, distractors: np.ndarray) -> np.ndarray:
+    options = np.concatenate([answer[:, None], distractors], axis=1)
+    order = np.argsort(rng.random(options.shape), axis=1)
+    return np.take_along_axis(options, order, axis=1)
+
+
+def _arithmetic(mode: str, rng: np.random.Generator, n: int):
+    """(left, right, op, answer, distractor low, distractor high) for an arithmetic mode."""
+    zeros = np.zeros(n, dtype=np.int64)
+    if mode == "counting":
+        count = _between(rng, 1, 10, n)
+        return count, _between(rng, 0, len(mg._COUNTING_EMOJIS) - 1, n), zeros, count, 1, 10
+    if mode == "addition_simple":
+        a = _between(rng, 1, 9, n)
+        b = _between(rng, 1, 10 - a, n)
+        return a, b, zeros, a + b, 1, 10
+    if mode == "subtraction_simple":
+        a = _between(rng, 2, 10, n)
+        b = _between(rng, 1, a, n)
+        return a, b, zeros + 1, a - b, 0, 10
+    if mode == "addition_easy":
+        a, b = _between(rng, 10, 60, n), _between(rng, 1, 40, n)
+        return a, b, zeros, a + b, np.maximum(0, a + b - 10), a + b + 10
+    if mode == "subtraction_easy":
+        a = _between(rng, 20, 80, n)
+        b = _between(rng, 1, np.minimum(a, 30), n)
+        return a, b, zeros + 1, a - b, np.maximum(0, a - b - 10), a - b + 10
+    if mode == "multiplication_easy":
+        a, b = _between(rng, 2, 5, n), _between(rng, 2, 5, n)
+        return a, b, zeros + 2, a * b, np.maximum(1, a * b - 5), a * b + 5
+    if mode == "addition_medium":
+        a = _between(rng, 100, 700, n)
+        b = _between(rng, 50, np.minimum(999 - a, 300), n)
+        return a, b, zeros, a + b, np.maximum(0, a + b - 20), a + b + 20
+    if mode == "subtraction_medium":
+        a = _between(rng, 200, 900, n)
+        b = _between(rng, 50, np.minimum(a, 300), n)
+        return a, b, zeros + 1, a - b, np.maximum(0, a - b - 20), a - b + 20
+    if mode == "multiplication_medium":
+        a, b = _between(rng, 2, 12, n), _between(rng, 2, 12, n)
+        return a, b, zeros + 2, a * b, np.maximum(1, a * b - 8), a * b + 8
+    if mode == "division_basic":
+        divisor, quotient = _between(rng, 2, 10, n), _between(rng, 2, 12, n)
+        return divisor * quotient, divisor, zeros, quotient, np.maximum(1, quotient - 3), quotient + 3
+    if mode in ("missing_number_easy", "missing_number_medium"):
+        return _missing_number(mode, rng, n)
+    raise ValueError(f"No batch generator for math mode {mode!r}")
+
+
+def _missing_number(mode: str, rng: np.random.Generator, n: int):
+    if mode == "missing_number_easy":
+        op = _between(rng, 0, 1, n)
+        plus = op == 0
+        ans = np.where(plus, _between(rng, 1, 15, n), _between(rng, 5, 20, n))
+        b = np.where(plus, _between(rng, 1, 10, n), _between(rng, 1, np.minimum(ans - 1, 10), n))
+    else:
+        op = _between(rng, 0, 2, n)
+        ans = np.select([op == 0, op == 1], [_between(rng, 20, 200, n), _between(rng, 50, 300, n)],
+                        _between(rng, 2, 12, n))
+        b = np.select(
+            [op == 0, op == 1],
+            [_between(rng, 10, 100, n), _between(rng, 10, np.minimum(ans - 1, 100), n)],
+            _between(rng, 2, 12, n),
+        )
+    result = np.select([op == 0, op == 1], [ans + b, ans - b], ans * b)
+    return b, result, op, ans, np.maximum(1, ans - 5), ans + 5
+
+
+def _fractions(rng: np.random.Generator, n: int) -> MathBatch:
+    """Two fractions of different value, and a third different from both."""
+    k = len(_FRACTION_NAMES)
+    first = _between(rng, 0, k - 1, n)
+    second = (first + _between(rng, 1, k - 1, n)) % k
+    # Redraw pairs of equal value (none in the pool today; kept for parity with the scalar loop)
+    same = np.abs(_FRACTION_VALUES[first] - _FRACTION_VALUES[second]) < 0.001
+    while same.any():
+        second[same] = (first[same] + _between(rng, 1, k - 1, int(same.sum()))) % k
+        same = np.abs(_FRACTION_VALUES[first] - _FRACTION_VALUES[second]) < 0.001
+    # Third: uniform over the k - 2 others, skipping past the two picked indices
+    third = _between(rng, 0, k - 3, n)
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    third += third >= low
+    third += third >= high
+    bigger = np.where(_FRACTION_VALUES[first] > _FRACTION_VALUES[second], first, second)
+    options = np.stack([first, second, third], axis=1)
+    options = np.take_along_axis(options, np.argsort(rng.random(options.shape), axis=1), axis=1)
+    return MathBatch("fractions_compare", first, second, np.zeros(n, dtype=np.int64), bigger, options)
+
+
+def generate_batch(mode: str, n: int, rng: np.random.Generator | int | None = None) -> MathBatch:
+    """`n` questions of one math mode, as arrays."""
+    rng = np.random.default_rng(rng)
+    if mode == "fractions_compare":
+        return _fractions(rng, n)
+    left, right, op, answer, low, high = _arithmetic(mode, rng, n)
+    options = _shuffled(rng, answer, _distractors(rng, answer, low, high))
+    return MathBatch(mode, left, right, op, answer, options)
+
+
+def age_batches(age: int, n: int, rng: np.random.Generator | int | None = None) -> list[MathBatch]:
+    """`n` questions for an age, split across its band's modes by weight."""
+    rng = np.random.default_rng(rng)
+    weights = mg.MODE_WEIGHTS[age_band(age)]
+    p = np.array(list(weights.values()), dtype=float)
+    counts = rng.multinomial(n, p / p.sum())
+    return [generate_batch(mode, int(k), rng) for mode, k in zip(weights, counts) if k]
+
+
+def rows(batch: MathBatch) -> Iterator[tuple[str, str, str | None, str, list[str]]]:
+    """(expression, prompt_text, prompt_image, correct_answer, options) per question."""
+    mode = batch.mode
+    left, right, op = batch.left.tolist(), batch.right.tolist(), batch.op.tolist()
+    answers, options = batch.answer.tolist(), batch.options.tolist()
+    if mode == "fractions_compare":
+        names = _FRACTION_NAMES
+        for a, b, ans, opts in zip(left, right, answers, options):
+            yield f"{names[a]}  or  {names[b]} ?", "Which fraction is BIGGER?", None, names[ans], [names[o] for o in opts]
+    elif mode == "counting":
+        emojis = mg._COUNTING_EMOJIS
+        for count, emoji, opts in zip(left, right, options):
+            visual = emojis[emoji] * count
+            yield visual, "How many?", visual, str(count), [str(o) for o in opts]
+    elif mode.startswith("missing_number"):
+        for b, result, o, ans, opts in zip(left, right, op, answers, options):
+            expression = f"___ {_OPS[o]} {b} = {result}"
+            yield expression, expression, None, str(ans), [str(x) for x in opts]
+    else:
+        sign = "÷" if mode == "division_basic" else _OPS[op[0]] if op else ""
+        for a, b, ans, opts in zip(left, right, answers, options):
+            yield f"{a} {sign} {b} = ?", f"What is {a} {sign} {b}?", None, str(ans), [str(x) for x in opts]
+
+
+def questions(batch: MathBatch) -> Iterator[dict]:
+    """The batch as math_generator-style question dicts."""
+    for expression, prompt_text, prompt_image, correct, options in rows(batch):
+        yield mg._build(batch.mode, expression, prompt_text, prompt_image, correct, options)
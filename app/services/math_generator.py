@@ -1,46 +1,46 @@
 import json
 import random
 
+from app.services.generator_registry import registry
+
+# Bump when a change alters the question any (mode, seed) generates.
+# Unfinished compact sessions made under the old version go stale
+# (see services/question_store.py); comments and refactors don't need it.
+GENERATOR_VERSION = "1"
+
 
 # Emoji sets for counting mode
 _COUNTING_EMOJIS = ["🍎", "🍊", "🍋", "🍉", "🍇", "🍓", "🌟", "🚗", "🐟", "🎈"]
 
 
-def generate_math_questions(age: int, count: int = 5) -> list[dict]:
+# Mode weights per age band (generator_registry.age_band)
+MODE_WEIGHTS = {
+    "early": {"counting": 40, "addition_simple": 35, "subtraction_simple": 25},
+    # Grade 2 level: two-digit add/subtract, simple times tables, easy missing number
+    "grade2": {"addition_easy": 30, "subtraction_easy": 30, "multiplication_easy": 25, "missing_number_easy": 15},
+    # Grade 3-4 level: full times tables, division, fractions, 3-digit arithmetic
+    "grade3": {
+        "addition_medium": 15, "subtraction_medium": 15, "multiplication_medium": 25,
+        "division_basic": 20, "fractions_compare": 15, "missing_number_medium": 10,
+    },
+}
+
+
+def generate_math_questions(age: int, count: int = 5, rng: random.Random = random) -> list[dict]:
     """Generate age-appropriate math questions.
 
     Returns list of dicts with: mode, expression, prompt_text, prompt_image,
     correct_answer, options, prompt_data (JSON string).
     """
-    if age <= 5:
-        modes = ["counting", "addition_simple", "subtraction_simple"]
-        weights = [40, 35, 25]
-    elif age <= 7:
-        # Grade 2 level: two-digit add/subtract, simple times tables, easy missing number
-        modes = ["addition_easy", "subtraction_easy", "multiplication_easy", "missing_number_easy"]
-        weights = [30, 30, 25, 15]
-    else:
-        # Grade 3-4 level: full times tables, division, fractions, 3-digit arithmetic
-        modes = [
-            "addition_medium", "subtraction_medium", "multiplication_medium",
-            "division_basic", "fractions_compare", "missing_number_medium",
-        ]
-        weights = [15, 15, 25, 20, 15, 10]
-
-    questions = []
-    for _ in range(count):
-        mode = random.choices(modes, weights=weights, k=1)[0]
-        q = _GENERATORS[mode]()
-        questions.append(q)
-    return questions
-
-
-def _gen_counting() -> dict:
-    n = random.randint(1, 10)
-    emoji = random.choice(_COUNTING_EMOJIS)
+    return registry.generate("math", age, count, rng)
+
+
+def _gen_counting(rng: random.Random) -> dict:
+    n = rng.randint(1, 10)
+    emoji = rng.choice(_COUNTING_EMOJIS)
     visual = emoji * n
     correct = str(n)
-    options = _make_number_distractors(n, 1, 10)
+    options = _make_number_distractors(n, 1, 10, rng)
     return _build(
         mode="counting",
         expression=visual,
@@ -51,12 +51,12 @@ def _gen_counting() -> dict:
     )
 
 
-def _gen_addition_simple() -> dict:
-    a = random.randint(1, 9)
-    b = random.randint(1, 10 - a)
+def _gen_addition_simple(rng: random.Random) -> dict:
+    a = rng.randint(1, 9)
+    b = rng.randint(1, 10 - a)
     ans = a + b
     expression = f"{a} + {b} = ?"
-    options = _make_number_distractors(ans, 1, 10)
+    options = _make_number_distractors(ans, 1, 10, rng)
     return _build(
         mode="addition_simple",
         expression=expression,
@@ -67,12 +67,12 @@ def _gen_addition_simple() -> dict:
     )
 
 
-def _gen_subtraction_simple() -> dict:
-    a = random.randint(2, 10)
-    b = random.randint(1, a)
+def _gen_subtraction_simple(rng: random.Random) -> dict:
+    a = rng.randint(2, 10)
+    b = rng.randint(1, a)
     ans = a - b
     expression = f"{a} - {b} = ?"
-    options = _make_number_distractors(ans, 0, 10)
+    options = _make_number_distractors(ans, 0, 10, rng)
     return _build(
         mode="subtraction_simple",
         expression=expression,
@@ -83,13 +83,13 @@ def _gen_subtraction_simple() -> dict:
     )
 
 
-def _gen_addition_easy() -> dict:
+def _gen_addition_easy(rng: random.Random) -> dict:
     """Grade 2: two-digit + single/two-digit, sums up to 100."""
-    a = random.randint(10, 60)
-    b = random.randint(1, 40)
+    a = rng.randint(10, 60)
+    b = rng.randint(1, 40)
     ans = a + b
     expression = f"{a} + {b} = ?"
-    options = _make_number_distractors(ans, max(0, ans - 10), ans + 10)
+    options = _make_number_distractors(ans, max(0, ans - 10), ans + 10, rng)
     return _build(
         mode="addition_easy",
         expression=expression,
@@ -100,13 +100,13 @@ def _gen_addition_easy() -> dict:
     )
 
 
-def _gen_subtraction_easy() -> dict:
+def _gen_subtraction_easy(rng: random.Random) -> dict:
     """Grade 2: two-digit - single/two-digit, result >= 0."""
-    a = random.randint(20, 80)
-    b = random.randint(1, min(a, 30))
+    a = rng.randint(20, 80)
+    b = rng.randint(1, min(a, 30))
     ans = a - b
     expression = f"{a} - {b} = ?"
-    options = _make_number_distractors(ans, max(0, ans - 10), ans + 10)
+    options = _make_number_distractors(ans, max(0, ans - 10), ans + 10, rng)
     return _build(
         mode="subtraction_easy",
         expression=expression,
@@ -117,13 +117,13 @@ def _gen_subtraction_easy() -> dict:
     )
 
 
-def _gen_multiplication_easy() -> dict:
+def _gen_multiplication_easy(rng: random.Random) -> dict:
     """Grade 2: times tables up to 5 x 5."""
-    a = random.randint(2, 5)
-    b = random.randint(2, 5)
+    a = rng.randint(2, 5)
+    b = rng.randint(2, 5)
     ans = a * b
     expression = f"{a} x {b} = ?"
-    options = _make_number_distractors(ans, max(1, ans - 5), ans + 5)
+    options = _make_number_distractors(ans, max(1, ans - 5), ans + 5, rng)
     return _build(
         mode="multiplication_easy",
         expression=expression,
@@ -134,22 +134,22 @@ def _gen_multiplication_easy() -> dict:
     )
 
 
-def _gen_missing_number_easy() -> dict:
+def _gen_missing_number_easy(rng: random.Random) -> dict:
     """Grade 2: simple missing number with + or - only, numbers up to 20."""
-    op = random.choice(["+", "-"])
+    op = rng.choice(["+", "-"])
     if op == "+":
-        ans = random.randint(1, 15)
-        b = random.randint(1, 10)
+        ans = rng.randint(1, 15)
+        b = rng.randint(1, 10)
         result = ans + b
         expression = f"___ + {b} = {result}"
         prompt_text = f"___ + {b} = {result}"
     else:
-        ans = random.randint(5, 20)
-        b = random.randint(1, min(ans - 1, 10))
+        ans = rng.randint(5, 20)
+        b = rng.randint(1, min(ans - 1, 10))
         result = ans - b
         expression = f"___ - {b} = {result}"
         prompt_text = f"___ - {b} = {result}"
-    options = _make_number_distractors(ans, max(1, ans - 5), ans + 5)
+    options = _make_number_distractors(ans, max(1, ans - 5), ans + 5, rng)
     return _build(
         mode="missing_number_easy",
         expression=expression,
@@ -162,13 +162,13 @@ def _gen_missing_number_easy() -> dict:
 
 # ── Grade 3-4 (age 8+) ──
 
-def _gen_addition_medium() -> dict:
+def _gen_addition_medium(rng: random.Random) -> dict:
     """Grade 3: 3-digit addition, sums up to 1000."""
-    a = random.randint(100, 700)
-    b = random.randint(50, min(999 - a, 300))
+    a = rng.randint(100, 700)
+    b = rng.randint(50, min(999 - a, 300))
     ans = a + b
     expression = f"{a} + {b} = ?"
-    options = _make_number_distractors(ans, max(0, ans - 20), ans + 20)
+    options = _make_number_distractors(ans, max(0, ans - 20), ans + 20, rng)
     return _build(
         mode="addition_medium",
         expression=expression,
@@ -179,13 +179,13 @@ def _gen_addition_medium() -> dict:
     )
 
 
-def _gen_subtraction_medium() -> dict:
+def _gen_subtraction_medium(rng: random.Random) -> dict:
     """Grade 3: 3-digit subtraction, result >= 0."""
-    a = random.randint(200, 900)
-    b = random.randint(50, min(a, 300))
+    a = rng.randint(200, 900)
+    b = rng.randint(50, min(a, 300))
     ans = a - b
     expression = f"{a} - {b} = ?"
-    options = _make_number_distractors(ans, max(0, ans - 20), ans + 20)
+    options = _make_number_distractors(ans, max(0, ans - 20), ans + 20, rng)
     return _build(
         mode="subtraction_medium",
         expression=expression,
@@ -196,13 +196,13 @@ def _gen_subtraction_medium() -> dict:
     )
 
 
-def _gen_multiplication_medium() -> dict:
+def _gen_multiplication_medium(rng: random.Random) -> dict:
     """Grade 3-4: full times tables up to 12 x 12."""
-    a = random.randint(2, 12)
-    b = random.randint(2, 12)
+    a = rng.randint(2, 12)
+    b = rng.randint(2, 12)
     ans = a * b
     expression = f"{a} x {b} = ?"
-    options = _make_number_distractors(ans, max(1, ans - 8), ans + 8)
+    options = _make_number_distractors(ans, max(1, ans - 8), ans + 8, rng)
     return _build(
         mode="multiplication_medium",
         expression=expression,
@@ -213,14 +213,14 @@ def _gen_multiplication_medium() -> dict:
     )
 
 
-def _gen_division_basic() -> dict:
+def _gen_division_basic(rng: random.Random) -> dict:
     """Grade 3: basic division with no remainder."""
-    divisor = random.randint(2, 10)
-    quotient = random.randint(2, 12)
+    divisor = rng.randint(2, 10)
+    quotient = rng.randint(2, 12)
     dividend = divisor * quotient
     ans = quotient
     expression = f"{dividend} ÷ {divisor} = ?"
-    options = _make_number_distractors(ans, max(1, ans - 3), ans + 3)
+    options = _make_number_distractors(ans, max(1, ans - 3), ans + 3, rng)
     return _build(
         mode="division_basic",
         expression=expression,
@@ -239,14 +239,14 @@ _FRACTION_POOL = [
 ]
 
 
-def _gen_fractions_compare() -> dict:
+def _gen_fractions_compare(rng: random.Random) -> dict:
     """Grade 3: compare two fractions — which is bigger?"""
-    pair = random.sample(_FRACTION_POOL, 2)
+    pair = rng.sample(_FRACTION_POOL, 2)
     name1, val1 = pair[0]
     name2, val2 = pair[1]
     # Ensure they're not equal
     while abs(val1 - val2) < 0.001:
-        pair = random.sample(_FRACTION_POOL, 2)
+        pair = rng.sample(_FRACTION_POOL, 2)
         name1, val1 = pair[0]
         name2, val2 = pair[1]
 
@@ -257,10 +257,10 @@ def _gen_fractions_compare() -> dict:
 
     # Third option: pick another fraction
     others = [n for n, v in _FRACTION_POOL if n != name1 and n != name2]
-    third = random.choice(others) if others else "1/6"
+    third = rng.choice(others) if others else "1/6"
 
     options = [name1, name2, third]
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return _build(
         mode="fractions_compare",
@@ -272,28 +272,28 @@ def _gen_fractions_compare() -> dict:
     )
 
 
-def _gen_missing_number_medium() -> dict:
+def _gen_missing_number_medium(rng: random.Random) -> dict:
     """Grade 3-4: missing number with +, -, or x, larger numbers."""
-    op = random.choice(["+", "-", "x"])
+    op = rng.choice(["+", "-", "x"])
     if op == "+":
-        ans = random.randint(20, 200)
-        b = random.randint(10, 100)
+        ans = rng.randint(20, 200)
+        b = rng.randint(10, 100)
         result = ans + b
         expression = f"___ + {b} = {result}"
         prompt_text = f"___ + {b} = {result}"
     elif op == "-":
-        ans = random.randint(50, 300)
-        b = random.randint(10, min(ans - 1, 100))
+        ans = rng.randint(50, 300)
+        b = rng.randint(10, min(ans - 1, 100))
         result = ans - b
         expression = f"___ - {b} = {result}"
         prompt_text = f"___ - {b} = {result}"
     else:
-        ans = random.randint(2, 12)
-        b = random.randint(2, 12)
+        ans = rng.randint(2, 12)
+        b = rng.randint(2, 12)
         result = ans * b
         expression = f"___ x {b} = {result}"
         prompt_text = f"___ x {b} = {result}"
-    options = _make_number_distractors(ans, max(1, ans - 5), ans + 5)
+    options = _make_number_distractors(ans, max(1, ans - 5), ans + 5, rng)
     return _build(
         mode="missing_number_medium",
         expression=expression,
@@ -304,23 +304,23 @@ def _gen_missing_number_medium() -> dict:
     )
 
 
-def _make_number_distractors(correct: int, low: int, high: int) -> list[str]:
+def _make_number_distractors(correct: int, low: int, high: int, rng: random.Random) -> list[str]:
     """Generate 2 plausible wrong answers near the correct one, return shuffled list of 3."""
     distractors = set()
     nearby = list(range(max(low, correct - 3), min(high, correct + 3) + 1))
     nearby = [n for n in nearby if n != correct]
-    random.shuffle(nearby)
+    rng.shuffle(nearby)
     for n in nearby:
         distractors.add(n)
         if len(distractors) >= 2:
             break
     # Fill remaining if needed
     while len(distractors) < 2:
-        d = correct + random.choice([-1, 1, -2, 2, 3])
+        d = correct + rng.choice([-1, 1, -2, 2, 3])
         if d != correct and d >= 0:
             distractors.add(d)
     options = [str(correct)] + [str(d) for d in list(distractors)[:2]]
-    random.shuffle(options)
+    rng.shuffle(options)
     return options
 
 
@@ -359,3 +359,5 @@ _GENERATORS = {
     "fractions_compare": _gen_fractions_compare,
     "missing_number_medium": _gen_missing_number_medium,
 }
+
+registry.register("math", MODE_WEIGHTS, _GENERATORS, version=GENERATOR_VERSION)
@@ -0,0 +1,77 @@
+"""Monthly range partitions for the append-only tables on PostgreSQL.
+
+session_questions and points_ledger are only ever appended to, so on
+PostgreSQL they can be range-partitioned by created_at, one partition per
+month. Converting the tables is opt-in: the b81e5f2c7d40 migration does it
+when PARTITION_TABLES is set. Everything here is a no-op on SQLite and on
+tables that were never converted, so callers don't need to check.
+
+There is no default partition (a new month couldn't be attached while the
+default held rows for it), so future months have to exist before rows
+arrive. The lifespan hook and every janitor pass create the current month
+plus partition_months_ahead months.
+"""
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("session_questions", "points_ledger")
+PARTITION_KEY = "created_at"
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table AND c.relnamespace = current_schema()::regnamespace"
+    ), {"table": table}).first() is not None
+
+
+def create_month_partition(conn: Connection, table: str, month: date) -> str:
+    """Create the partition holding `month` if it doesn't exist. Returns its name."""
+    name = partition_name(table, month)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    return name
+
+
+def ensure_partitions(conn: Connection, months_ahead: int | None = None, today: date | None = None) -> list[str]:
+    """Make sure every partitioned table has this month and the next few.
+
+    Returns the partitions checked, empty when nothing is partitioned.
+    """
+    if months_ahead is None:
+        months_ahead = get_settings().partition_months_ahead
+    this_month = month_start(today or datetime.now(timezone.utc).date())
+    names = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(conn, table):
+            continue
+        for n in range(months_ahead + 1):
+            names.append(create_month_partition(conn, table, add_months(this_month, n)))
+    if names:
+        logger.info("Partitions in place: %s", ", ".join(names))
+    return names
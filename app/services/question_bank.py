@@ -0,0 +1,211 @@
+"""Precompiled question bank for the generators' static-content modes.
+
+Most logic and English modes only draw from fixed tables. Each generator
+module lists them in STATIC_MODES, so every question those modes can
+produce is known ahead of time. build_question_bank writes them all to
+one file, already formatted and with their prompt_data JSON:
+
+    magic | u32 header length | header JSON (padded to 8 bytes)
+    int64 item_starts[items + 1]    first entry of each table item
+    int64 offsets[entries + 1]      where each entry starts in the blob
+    blob                            UTF-8 entries, fields split by \\x1f
+
+The int64 arrays are in the building machine's byte order and are read
+in place through memoryview casts.
+
+load_question_bank memory-maps the file, so gunicorn workers share its
+pages, and points the registry's static modes at QuestionBank.draw. A
+draw picks a table item, then one of that item's entries, then shuffles
+the options. The distribution is the live generators' own: items are
+equally likely however many entries each has. The header carries a
+fingerprint of the generator sources, and a bank built from older tables
+is rebuilt on load.
+
+    python -m app.services.question_bank [--path PATH]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Callable, Iterator
+
+from app.config import get_settings
+from app.services import english_generator, logic_generator
+from app.services.generator_registry import registry
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SKQBANK1"
+_SEP = "\x1f"
+_GAMES = {"logic": logic_generator, "english": english_generator}
+
+
+def source_fingerprint() -> str:
+    """Changes whenever a generator's tables (or this file format) might have."""
+    digest = hashlib.sha256(MAGIC)
+    for module in _GAMES.values():
+        digest.update(Path(module.__file__).read_bytes())
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def build_question_bank(path: str) -> int:
+    """Enumerate every static-mode question into `path`. Returns the entry count."""
+    modes = {}
+    item_starts = [0]
+    offsets = [0]
+    blob = bytearray()
+    for game, module in _GAMES.items():
+        for mode, enumerate_items in module.STATIC_MODES.items():
+            first_item = len(item_starts) - 1
+            for entries in enumerate_items():
+                for expression, prompt_text, prompt_image, correct, options in entries:
+                    q = module._build(mode, expression, prompt_text, prompt_image, correct, list(options))
+                    fields = [q["prompt_data"], expression, prompt_text, prompt_image or "", correct, *options]
+                    if any(_SEP in f for f in fields):
+                        raise ValueError(f"{mode} content contains the bank's field separator")
+                    blob += _SEP.join(fields).encode()
+                    offsets.append(len(blob))
+                item_starts.append(len(offsets) - 1)
+            modes[mode] = [game, first_item, len(item_starts) - 1 - first_item]
+
+    header = json.dumps({
+        "fingerprint": source_fingerprint(),
+        "byteorder": sys.byteorder,
+        "items": len(item_starts) - 1,
+        "entries": len(offsets) - 1,
+        "modes": modes,
+    }).encode()
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+
+    # Write beside the target and rename, so a worker never maps half a file
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            f.write(array("q", item_starts).tobytes())
+            f.write(array("q", offsets).tobytes())
+            f.write(blob)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return len(offsets) - 1
+
+
+class QuestionBank:
+    """A read-only, memory-mapped bank file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a question bank")
+        (header_len,) = struct.unpack_from("<I", mm, len(MAGIC))
+        pos = len(MAGIC) + 4
+        header = json.loads(mm[pos:pos + header_len])
+        pos += header_len
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was built on a {header['byteorder']}-endian machine")
+        self.fingerprint: str = header["fingerprint"]
+        self.modes: dict[str, tuple[str, int, int]] = {m: tuple(v) for m, v in header["modes"].items()}
+        view = memoryview(mm)
+        end = pos + 8 * (header["items"] + 1)
+        self._item_starts = view[pos:end].cast("q")
+        pos, end = end, end + 8 * (header["entries"] + 1)
+        self._offsets = view[pos:end].cast("q")
+        self._blob = end
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _entry(self, mode: str, entry: int, options_order: Callable[[list], None] | None = None) -> dict:
+        start = self._blob + self._offsets[entry]
+        end = self._blob + self._offsets[entry + 1]
+        prompt_data, expression, prompt_text, prompt_image, correct, *options = self._mm[start:end].decode().split(_SEP)
+        if options_order is not None:
+            options_order(options)
+        return {
+            "mode": mode,
+            "expression": expression,
+            "prompt_text": prompt_text,
+            "prompt_image": prompt_image or None,
+            "correct_answer": correct,
+            "options": options,
+            "prompt_data": prompt_data,
+        }
+
+    def draw(self, mode: str, rng: random.Random = random) -> dict:
+        """One question for `mode`, as the mode's generator would return it."""
+        _, first_item, item_count = self.modes[mode]
+        item = first_item + int(rng.random() * item_count)
+        start, end = self._item_starts[item], self._item_starts[item + 1]
+        return self._entry(mode, start + int(rng.random() * (end - start)), rng.shuffle)
+
+    def questions(self, mode: str) -> Iterator[dict]:
+        """Every question in the bank for `mode`, options in table order."""
+        _, first_item, item_count = self.modes[mode]
+        for entry in range(self._item_starts[first_item], self._item_starts[first_item + item_count]):
+            yield self._entry(mode, entry)
+
+    def generator(self, mode: str) -> Callable[..., dict]:
+        """A stand-in for the mode's generator: fn(rng), or fn(age, rng)."""
+        def draw(*args) -> dict:
+            return self.draw(mode, args[-1])
+        return draw
+
+
+def _open(path: str) -> QuestionBank | None:
+    try:
+        return QuestionBank(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_question_bank(path: str | None = None, build: bool = True) -> QuestionBank | None:
+    """Map the bank and serve the static modes from it, building it first if missing or stale."""
+    path = path or get_settings().question_bank_path
+    bank = _open(path)
+    if bank is None or bank.fingerprint != source_fingerprint():
+        if not build:
+            return None
+        entries = build_question_bank(path)
+        logger.info("Question bank built: %d questions in %s", entries, path)
+        bank = QuestionBank(path)
+    for game in _GAMES:
+        registry.override(game, {
+            mode: bank.generator(mode) for mode, (owner, _, _) in bank.modes.items() if owner == game
+        }, version=f"bank-{bank.fingerprint[:8]}")
+    return bank
+
+
+def unload_question_bank() -> None:
+    """Generate every mode live again."""
+    for game in _GAMES:
+        registry.override(game, None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the precompiled question bank.")
+    parser.add_argument("--path", default=get_settings().question_bank_path)
+    args = parser.parse_args()
+    entries = build_question_bank(args.path)
+    bank = QuestionBank(args.path)
+    for mode, (game, _, items) in bank.modes.items():
+        print(f"{game:<8} {mode:<20} {items:>4} items {sum(1 for _ in bank.questions(mode)):>6} questions")
+    print(f"{entries} questions, {os.path.getsize(args.path)} bytes -> {args.path}")
+
+
+if __name__ == "__main__":
+    main()
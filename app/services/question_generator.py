@@ -1,11 +1,13 @@
 import json
 import random
 from datetime import date, timedelta
+from typing import NamedTuple
 from sqlalchemy.orm import Session
 
 from app.models.character import Character
 from app.models.progress import UserCharacterProgress
 from app.config import get_settings
+from app.services.generator_registry import registry
 
 
 # Question modes:
@@ -67,16 +69,47 @@ def _exclude_confusable(correct_char: Character, candidates: list[Character]) ->
     return [c for c in candidates if c.meaning not in group]
 
 
+class SelectionWeights(NamedTuple):
+    """Review-priority weights for select_characters (see learner_simulator to tune them)."""
+    overdue: int = 10    # next_review_date <= today, or no date yet
+    new: int = 6         # never seen
+    due_soon: int = 3    # due within soon_days
+    not_due: int = 1
+    soon_days: int = 2
+
+
+SELECTION_WEIGHTS = SelectionWeights()
+
+
+def review_weight(
+    progress: UserCharacterProgress | None,
+    today: date,
+    weights: SelectionWeights = SELECTION_WEIGHTS,
+) -> int:
+    """Selection weight of one character given its progress row."""
+    if progress is None:
+        return weights.new
+    if progress.next_review_date is None or progress.next_review_date <= today:
+        return weights.overdue
+    if progress.next_review_date <= today + timedelta(days=weights.soon_days):
+        return weights.due_soon
+    return weights.not_due
+
+
 def select_characters(
     db: Session,
     user_id: int,
     count: int = 5,
     is_prereader: bool = True,
     character_ids: list[int] | None = None,
+    rng: random.Random = random,
 ) -> list[Character]:
-    """Select characters using SM-2 review priority buckets.
+    """Select characters using review priority buckets.
+
+    Buckets come from next_review_date, which the user's scheduler
+    (services/scheduler.py) keeps up to date.
 
-    Priority:
+    Priority (SELECTION_WEIGHTS):
       1. Overdue (next_review_date <= today): weight=10
       2. New (never seen, no progress): weight=6
       3. Due soon (within 2 days): weight=3
@@ -92,7 +125,8 @@ def select_characters(
         query = query.filter(Character.image_url.isnot(None))
     if character_ids:
         query = query.filter(Character.id.in_(character_ids))
-    characters = query.all()
+    # Ordered, so a seeded rng picks the same characters again
+    characters = query.order_by(Character.id).all()
 
     if not characters:
         return []
@@ -108,29 +142,16 @@ def select_characters(
         progress_map[p.character_id] = p
 
     today = date.today()
-    soon = today + timedelta(days=2)
-
-    # Assign weights based on SM-2 review schedule
-    weighted = []
-    for char in characters:
-        prog = progress_map.get(char.id)
-        if prog is None:
-            weight = 6   # New — never seen
-        elif prog.next_review_date is None or prog.next_review_date <= today:
-            weight = 10  # Overdue or no scheduled date
-        elif prog.next_review_date <= soon:
-            weight = 3   # Due soon (within 2 days)
-        else:
-            weight = 1   # Not yet due
-
-        weighted.append((char, max(weight, 1)))
+
+    # Assign weights based on the review schedule
+    weighted = [(char, max(review_weight(progress_map.get(char.id), today), 1)) for char in characters]
 
     # Weighted random selection without replacement
     selected = []
     pool = list(weighted)
     for _ in range(min(count, len(pool))):
         total = sum(w for _, w in pool)
-        r = random.uniform(0, total)
+        r = rng.uniform(0, total)
         cumulative = 0
         for i, (char, w) in enumerate(pool):
             cumulative += w
@@ -142,54 +163,55 @@ def select_characters(
     return selected
 
 
-def pick_question_mode(is_prereader: bool, char: Character) -> str:
-    """Pick a random question mode based on reading ability and character capabilities."""
-    has_image = bool(char.image_url)
-    is_compound = len(char.character) >= 2
+# Chinese modes are picked by reading ability rather than age band, and
+# fill_in_blank needs a compound word
+MODE_WEIGHTS = {
+    # Age <= 5: picture-only, simple matching — no reading or true/false
+    "prereader": {"char_to_image": 100},
+    "reader": {"char_to_meaning": 25, "meaning_to_char": 20, "audio_to_char": 20, "pinyin_to_char": 15},
+    "reader_compound": {
+        "char_to_meaning": 25, "meaning_to_char": 20, "fill_in_blank": 20,
+        "audio_to_char": 20, "pinyin_to_char": 15,
+    },
+}
+registry.register("chinese", MODE_WEIGHTS)
+
 
+def pick_question_mode(is_prereader: bool, char: Character, rng: random.Random = random) -> str:
+    """Pick a random question mode based on reading ability and character capabilities."""
     if is_prereader:
-        # Age <= 5: picture-only, simple matching — no reading or true/false
-        candidates = []
-        if has_image:
-            candidates += ["char_to_image"] * 100  # show character, pick picture
+        if not char.image_url:
+            # Fallback
+            return "char_to_meaning"
+        band = "prereader"
     else:
-        # Readers: weighted mode distribution
-        candidates = []
-        candidates += ["char_to_meaning"] * 25
-        candidates += ["meaning_to_char"] * 20
-        if is_compound:
-            candidates += ["fill_in_blank"] * 20
-        candidates += ["audio_to_char"] * 20
-        candidates += ["pinyin_to_char"] * 15
-
-    if not candidates:
-        # Fallback
-        return "char_to_meaning"
-
-    return random.choice(candidates)
+        band = "reader_compound" if len(char.character) >= 2 else "reader"
+    return registry.mode_sampler("chinese", band).sample(rng)
 
 
-def generate_options(db: Session, correct_char: Character, count: int = 2) -> list[str]:
+def generate_options(db: Session, correct_char: Character, count: int = 2, rng: random.Random = random) -> list[str]:
     """Generate distractor options + correct answer, shuffled. Returns list of meanings."""
     all_chars = (
         db.query(Character)
         .filter(Character.id != correct_char.id)
+        .order_by(Character.id)
         .all()
     )
 
     # Pick distractors from different meanings
-    distractors = random.sample(all_chars, min(count, len(all_chars)))
+    distractors = rng.sample(all_chars, min(count, len(all_chars)))
     options = [correct_char.meaning] + [d.meaning for d in distractors]
-    random.shuffle(options)
+    rng.shuffle(options)
     return options
 
 
-def generate_image_options(db: Session, correct_char: Character, count: int = 2) -> list[str]:
+def generate_image_options(db: Session, correct_char: Character, count: int = 2, rng: random.Random = random) -> list[str]:
     """Generate picture-based distractor options for son's mode. Returns list of image_urls."""
     all_chars = (
         db.query(Character)
         .filter(Character.id != correct_char.id)
         .filter(Character.image_url.isnot(None))
+        .order_by(Character.id)
         .all()
     )
 
@@ -197,32 +219,33 @@ def generate_image_options(db: Session, correct_char: Character, count: int = 2)
     filtered = _exclude_confusable(correct_char, all_chars)
     # Fall back to unfiltered pool if not enough candidates remain
     pool = filtered if len(filtered) >= count else all_chars
-    distractors = random.sample(pool, min(count, len(pool)))
+    distractors = rng.sample(pool, min(count, len(pool)))
 
     # Use image_url if available, fall back to meaning
     correct_option = correct_char.image_url or correct_char.meaning
     distractor_options = [d.image_url or d.meaning for d in distractors]
 
     options = [correct_option] + distractor_options
-    random.shuffle(options)
+    rng.shuffle(options)
     return options
 
 
-def generate_character_options(db: Session, correct_char: Character, count: int = 2) -> list[str]:
+def generate_character_options(db: Session, correct_char: Character, count: int = 2, rng: random.Random = random) -> list[str]:
     """Generate character-based distractor options (for reverse modes). Returns list of characters."""
     all_chars = (
         db.query(Character)
         .filter(Character.id != correct_char.id)
+        .order_by(Character.id)
         .all()
     )
 
-    distractors = random.sample(all_chars, min(count, len(all_chars)))
+    distractors = rng.sample(all_chars, min(count, len(all_chars)))
     options = [correct_char.character] + [d.character for d in distractors]
-    random.shuffle(options)
+    rng.shuffle(options)
     return options
 
 
-def generate_question(db: Session, char: Character, mode: str, count: int = 2) -> dict:
+def generate_question(db: Session, char: Character, mode: str, count: int = 2, rng: random.Random = random) -> dict:
     """Generate a complete question for any mode.
 
     Returns dict with:
@@ -235,7 +258,7 @@ def generate_question(db: Session, char: Character, mode: str, count: int = 2) -
       (plus extra fields for true_or_false and fill_in_blank)
     """
     if mode == "char_to_image":
-        options = generate_image_options(db, char, count)
+        options = generate_image_options(db, char, count, rng)
         return {
             "mode": mode,
             "prompt": char.character,
@@ -246,7 +269,7 @@ def generate_question(db: Session, char: Character, mode: str, count: int = 2) -
             "option_type": "image",
         }
     elif mode == "image_to_char":
-        options = generate_character_options(db, char, count)
+        options = generate_character_options(db, char, count, rng)
         return {
             "mode": mode,
             "prompt": char.image_url or char.meaning,
@@ -257,7 +280,7 @@ def generate_question(db: Session, char: Character, mode: str, count: int = 2) -
             "option_type": "character",
         }
     elif mode == "char_to_meaning":
-        options = generate_options(db, char, count)
+        options = generate_options(db, char, count, rng)
         return {
             "mode": mode,
             "prompt": char.character,
@@ -268,7 +291,7 @@ def generate_question(db: Session, char: Character, mode: str, count: int = 2) -
             "option_type": "text",
         }
     elif mode == "meaning_to_char":
-        options = generate_character_options(db, char, count)
+        options = generate_character_options(db, char, count, rng)
         return {
             "mode": mode,
             "prompt": char.meaning,
@@ -279,7 +302,7 @@ def generate_question(db: Session, char: Character, mode: str, count: int = 2) -
             "option_type": "character",
         }
     elif mode == "audio_to_char":
-        options = generate_character_options(db, char, count)
+        options = generate_character_options(db, char, count, rng)
         return {
             "mode": mode,
             "prompt": char.character,
@@ -290,9 +313,9 @@ def generate_question(db: Session, char: Character, mode: str, count: int = 2) -
             "option_type": "character",
         }
     elif mode == "fill_in_blank":
-        return _generate_fill_in_blank(db, char, count)
+        return _generate_fill_in_blank(db, char, count, rng)
     elif mode == "pinyin_to_char":
-        options = generate_character_options(db, char, count)
+        options = generate_character_options(db, char, count, rng)
         return {
             "mode": mode,
             "prompt": char.pinyin,
@@ -306,15 +329,15 @@ def generate_question(db: Session, char: Character, mode: str, count: int = 2) -
         raise ValueError(f"Unknown question mode: {mode}")
 
 
-def _generate_fill_in_blank(db: Session, char: Character, count: int = 2) -> dict:
+def _generate_fill_in_blank(db: Session, char: Character, count: int = 2, rng: random.Random = random) -> dict:
     """Generate a fill-in-the-blank question for compound words."""
     word = char.character
     if len(word) < 2:
         # Fallback to char_to_meaning for single chars
-        return generate_question(db, char, "char_to_meaning", count)
+        return generate_question(db, char, "char_to_meaning", count, rng)
 
     # Pick a random position to blank out
-    blank_pos = random.randint(0, len(word) - 1)
+    blank_pos = rng.randint(0, len(word) - 1)
     blank_char = word[blank_pos]
     display_word = word[:blank_pos] + "___" + word[blank_pos + 1:]
 
@@ -322,6 +345,7 @@ def _generate_fill_in_blank(db: Session, char: Character, count: int = 2) -> dic
     all_chars = (
         db.query(Character)
         .filter(Character.id != char.id)
+        .order_by(Character.id)
         .all()
     )
 
@@ -332,10 +356,10 @@ def _generate_fill_in_blank(db: Session, char: Character, count: int = 2) -> dic
             if ch != blank_char:
                 distractor_pool.add(ch)
 
-    distractor_list = list(distractor_pool)
-    distractors = random.sample(distractor_list, min(count, len(distractor_list)))
+    distractor_list = sorted(distractor_pool)
+    distractors = rng.sample(distractor_list, min(count, len(distractor_list)))
     options = [blank_char] + distractors
-    random.shuffle(options)
+    rng.shuffle(options)
 
     # Encode display_word and meaning_hint as trailing elements for DB storage
     options_with_meta = options + [display_word, char.meaning]
@@ -0,0 +1,227 @@
+"""Compact storage for generated (math, logic, English) questions.
+
+A generated question is fully determined by its mode, its seed, the
+player's age and the version of the generator serving the mode (see
+generator_registry.make). Every generated session_questions row records
+that key: question_mode, seed and generator_version, with the age on
+game_sessions. With compact_generated_questions on, the row skips the
+options and prompt_data payloads, which are most of its size: options is
+stored as "" and prompt_data as NULL. correct_answer is still stored,
+because answers are checked and archived against it.
+
+question_payloads rebuilds compact rows on read. Rebuilt sessions stay in
+a per-worker LRU (rebuilt_session_cache_size), and creating a session
+primes it, so rendering and resuming normally cost no rebuild at all.
+Only the generator version that made a question can rebuild it. After a
+deploy that bumps a generator module's GENERATOR_VERSION, older
+unfinished sessions are stale: they aren't resumed, and the janitor
+closes them. The same happens on a worker that serves a mode without the
+question bank.
+
+Full rows that carry a key (rows written with compaction off) can be
+compacted later. Each row is checked before it is compacted: the rebuilt
+question must match what is stored.
+
+    python -m app.services.question_store [--batch 1000] [--dry-run]
+"""
+import argparse
+import json
+import random
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.session import GameSession, SessionQuestion
+from app.services.generator_registry import registry
+from app.services.recent_questions import RecentQuestions, question_fingerprint
+
+COMPACT_OPTIONS = ""
+_PROMPT_FIELDS = ("expression", "prompt_text", "prompt_image")
+
+
+class StaleQuestionError(ValueError):
+    """A compact question whose generator version is no longer being served."""
+
+
+class QuestionPayload(NamedTuple):
+    options: list[str]
+    prompt: dict   # expression, prompt_text, prompt_image (None where unset)
+
+
+QuestionKey = tuple[str, str, int]   # (mode, generator version, seed)
+
+_rebuilt: OrderedDict[tuple, tuple[dict, ...]] = OrderedDict()
+
+
+def _remember(key: tuple, questions: tuple[dict, ...]) -> None:
+    _rebuilt[key] = questions
+    _rebuilt.move_to_end(key)
+    while len(_rebuilt) > get_settings().rebuilt_session_cache_size:
+        _rebuilt.popitem(last=False)
+
+
+def _rebuild(game_type: str, age: int, keys: tuple[QuestionKey, ...]) -> tuple[dict, ...]:
+    """The questions for these keys, from the LRU or rebuilt. Callers must not mutate them."""
+    cache_key = (game_type, age, keys)
+    questions = _rebuilt.get(cache_key)
+    if questions is not None:
+        _rebuilt.move_to_end(cache_key)
+        return questions
+    for mode, version, _ in keys:
+        if registry.version(game_type, mode) != version:
+            raise StaleQuestionError(f"{game_type} {mode} generator {version} is no longer served")
+    questions = tuple(registry.make(game_type, mode, age, seed) for mode, _, seed in keys)
+    _remember(cache_key, questions)
+    return questions
+
+
+def is_compact(q: SessionQuestion) -> bool:
+    return q.options == COMPACT_OPTIONS
+
+
+def fresh_questions(
+    game_type: str, age: int, plan: list[tuple[str, int]], recent: RecentQuestions | None = None,
+) -> list[tuple[str, int, dict]]:
+    """(mode, seed, question) for each planned question, redrawing repeats of `recent`.
+
+    A repeat is redrawn from a seed derived from its own, so the stored seed
+    still rebuilds the question that was kept. Kept questions join `recent`
+    once the whole session is drawn, so its own don't push older ones out early.
+    """
+    retries = get_settings().recent_question_retries
+    made = []
+    kept = set()
+    for mode, seed in plan:
+        gq = registry.make(game_type, mode, age, seed)
+        if recent is not None:
+            fp = question_fingerprint(game_type, gq)
+            for _ in range(retries):
+                if fp not in recent and fp not in kept:
+                    break
+                seed = random.Random(seed).getrandbits(63)
+                gq = registry.make(game_type, mode, age, seed)
+                fp = question_fingerprint(game_type, gq)
+            kept.add(fp)
+        made.append((mode, seed, gq))
+    if recent is not None:
+        recent.add_session(kept)
+    return made
+
+
+def add_generated_questions(
+    db: Session, game_session: GameSession, plan: list[tuple[str, int]], recent: RecentQuestions | None = None,
+) -> None:
+    """Add the session's questions for registry.plan() output, compact if configured."""
+    game_type, age = game_session.game_type, game_session.age
+    compact = get_settings().compact_generated_questions
+    made = fresh_questions(game_type, age, plan, recent)
+    keys = tuple((mode, registry.version(game_type, mode), seed) for mode, seed, _ in made)
+    questions = tuple(gq for _, _, gq in made)
+    for i, ((mode, version, seed), gq) in enumerate(zip(keys, questions), 1):
+        db.add(SessionQuestion(
+            session_id=game_session.id,
+            character_id=None,
+            question_number=i,
+            correct_answer=gq["correct_answer"],
+            options=COMPACT_OPTIONS if compact else json.dumps(gq["options"]),
+            question_mode=mode,
+            prompt_data=None if compact else gq["prompt_data"],
+            generator_version=version,
+            seed=seed,
+        ))
+    if compact:
+        _remember((game_type, age, keys), questions)
+
+
+def question_payloads(session: GameSession) -> list[QuestionPayload]:
+    """Each question's options and prompt fields, in order, rebuilding compact rows.
+
+    Raises StaleQuestionError when a compact row can no longer be rebuilt.
+    """
+    compact = [q for q in session.questions if is_compact(q)]
+    rebuilt = {}
+    if compact:
+        keys = tuple((q.question_mode, q.generator_version, q.seed) for q in compact)
+        rebuilt = dict(zip((q.id for q in compact), _rebuild(session.game_type, session.age, keys)))
+    payloads = []
+    for q in session.questions:
+        gq = rebuilt.get(q.id)
+        if gq is not None:
+            options = list(gq["options"])
+        else:
+            options = json.loads(q.options)
+            gq = json.loads(q.prompt_data) if q.prompt_data else {}
+        payloads.append(QuestionPayload(options, {f: gq.get(f) for f in _PROMPT_FIELDS}))
+    return payloads
+
+
+def can_rebuild(session: GameSession) -> bool:
+    try:
+        question_payloads(session)
+    except StaleQuestionError:
+        return False
+    return True
+
+
+def compact_questions(db: Session, batch_size: int = 1000, dry_run: bool = False) -> dict:
+    """Compact full generated rows whose key rebuilds them exactly.
+
+    Returns {"checked", "compacted", "mismatched", "bytes_saved"}. Rows that don't
+    rebuild (an older generator version) are left as they are.
+    """
+    report = {"checked": 0, "compacted": 0, "mismatched": 0, "bytes_saved": 0}
+    last_id = 0
+    while True:
+        rows = (
+            db.query(SessionQuestion, GameSession.game_type, GameSession.age)
+            .join(GameSession, GameSession.id == SessionQuestion.session_id)
+            .filter(SessionQuestion.id > last_id)
+            .filter(SessionQuestion.seed.isnot(None))
+            .filter(SessionQuestion.options != COMPACT_OPTIONS)
+            .filter(GameSession.age.isnot(None))
+            .order_by(SessionQuestion.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return report
+        for q, game_type, age in rows:
+            last_id = q.id
+            report["checked"] += 1
+            if registry.version(game_type, q.question_mode) != q.generator_version:
+                report["mismatched"] += 1
+                continue
+            gq = registry.make(game_type, q.question_mode, age, q.seed)
+            if json.loads(q.options) != gq["options"] or q.prompt_data != gq["prompt_data"]:
+                report["mismatched"] += 1
+                continue
+            report["compacted"] += 1
+            report["bytes_saved"] += len(q.options.encode()) + len((q.prompt_data or "").encode())
+            if not dry_run:
+                q.options = COMPACT_OPTIONS
+                q.prompt_data = None
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+
+
+def main() -> None:
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Compact generated questions that can be rebuilt from their seed.")
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    db = SessionLocal()
+    try:
+        report = compact_questions(db, args.batch, args.dry_run)
+    finally:
+        db.close()
+    print(" ".join(f"{k}={v}" for k, v in report.items()))
+
+
+if __name__ == "__main__":
+    main()
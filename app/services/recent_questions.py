@@ -0,0 +1,109 @@
+"""Per-user filter of recently asked questions.
+
+Logic and English items come from small tables, so without a filter a
+child often gets the same item in back-to-back sessions and answers it
+from memory. For each game, a user keeps a ring of the fingerprints of
+the questions from their last recent_question_sessions sessions. The
+rings are stored in users.recent_questions as JSON
+{game_type: base64 of little-endian uint32s, oldest first}, which is 4
+bytes per question.
+
+Session creation checks each drawn question against the ring in O(1).
+A repeat is redrawn, at most recent_question_retries times. When every
+draw repeats, the last one is kept, because some age bands have fewer
+items than the ring holds.
+For Chinese, spaced repetition decides which characters come back. Only
+the question mode is redrawn, so a character that is due again comes
+back in a different mode.
+"""
+import base64
+import json
+import sys
+import zlib
+from array import array
+from collections import Counter
+
+from app.config import get_settings
+from app.models.user import User
+
+
+def fingerprint(game_type: str, *parts) -> int:
+    """A stable 32-bit fingerprint (hash() on str differs per process)."""
+    return zlib.crc32("\x1f".join(map(str, (game_type, *parts))).encode())
+
+
+def question_fingerprint(game_type: str, q: dict) -> int:
+    """Fingerprint of a generated question: what is asked, whatever the option order."""
+    return fingerprint(game_type, q["mode"], q["expression"], q["prompt_text"], q["correct_answer"])
+
+
+class RecentQuestions:
+    """A fixed-size ring of fingerprints, with O(1) membership."""
+
+    def __init__(self, capacity: int, data: str | None = None):
+        ring = array("I")
+        if data:
+            ring.frombytes(base64.b64decode(data))
+            if sys.byteorder == "big":
+                ring.byteswap()
+        self.capacity = capacity
+        self._ring = ring[max(0, len(ring) - capacity):] if capacity else array("I")
+        self._next = 0   # oldest entry, once the ring is full
+        self._counts = Counter(self._ring)
+
+    def __contains__(self, fp: int) -> bool:
+        return fp in self._counts
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def add(self, fp: int) -> None:
+        if not self.capacity:
+            return
+        if len(self._ring) < self.capacity:
+            self._ring.append(fp)
+        else:
+            old = self._ring[self._next]
+            self._counts[old] -= 1
+            if not self._counts[old]:
+                del self._counts[old]
+            self._ring[self._next] = fp
+            self._next = (self._next + 1) % self.capacity
+        self._counts[fp] += 1
+
+    def add_session(self, fps) -> None:
+        """Add a whole session's fingerprints, after all of them were checked."""
+        for fp in sorted(fps):
+            self.add(fp)
+
+    def dumps(self) -> str:
+        ring = self._ring[self._next:] + self._ring[:self._next]
+        if sys.byteorder == "big":
+            ring.byteswap()
+        return base64.b64encode(ring.tobytes()).decode()
+
+
+def _capacity() -> int:
+    settings = get_settings()
+    return settings.recent_question_sessions * settings.questions_per_session
+
+
+def new_recent(data: str | None = None) -> RecentQuestions:
+    return RecentQuestions(_capacity(), data)
+
+
+def load_recent(user: User, game_type: str) -> RecentQuestions:
+    rings = json.loads(user.recent_questions) if user.recent_questions else {}
+    return RecentQuestions(_capacity(), rings.get(game_type))
+
+
+def ring_digest(user: User, game_type: str) -> int:
+    """A checksum of the game's stored ring; it changes whenever a session of the game is created."""
+    rings = json.loads(user.recent_questions) if user.recent_questions else {}
+    return zlib.crc32(rings.get(game_type, "").encode())
+
+
+def save_recent(user: User, game_type: str, recent: RecentQuestions) -> None:
+    rings = json.loads(user.recent_questions) if user.recent_questions else {}
+    rings[game_type] = recent.dumps()
+    user.recent_questions = json.dumps(rings, separators=(",", ":"))
@@ -1,4 +1,6 @@
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.user import User
 from app.models.rewards import PointsLedger
@@ -46,19 +48,46 @@ def get_conversion_status(user: User) -> dict:
     }
 
 
-def buy_streak_freeze(db: Session, user: User) -> bool:
-    """Spend 1 coin to gain 1 streak freeze. Returns True on success."""
-    if user.coins < 1:
+def spend_coins(db: Session, user: User, amount: int, reason: str) -> bool:
+    """Atomically deduct `amount` coins and log the spend. Returns False if short.
+
+    The balance check and the decrement are one conditional UPDATE, so two
+    concurrent spends can never take the balance below zero.
+    """
+    db.flush()
+    new_balance = db.execute(
+        update(User)
+        .where(User.id == user.id, User.coins >= amount)
+        .values(coins=User.coins - amount)
+        .returning(User.coins)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if new_balance is None:
         return False
-    user.coins -= 1
-    user.streak_freezes += 1
+    set_committed_value(user, "coins", new_balance)
+
     entry = PointsLedger(
         user_id=user.id,
         change=0,
-        coins_change=-1,
-        reason="buy_streak_freeze",
+        coins_change=-amount,
+        reason=reason,
         balance_after=user.points,
     )
     db.add(entry)
     db.flush()
     return True
+
+
+def buy_streak_freeze(db: Session, user: User) -> bool:
+    """Spend 1 coin to gain 1 streak freeze. Returns True on success."""
+    if not spend_coins(db, user, 1, "buy_streak_freeze"):
+        return False
+    freezes = db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(streak_freezes=func.coalesce(User.streak_freezes, 0) + 1)
+        .returning(User.streak_freezes)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    set_committed_value(user, "streak_freezes", freezes)
+    return True
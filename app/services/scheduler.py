@@ -0,0 +1,81 @@
+"""Spaced-repetition schedulers, selectable per child.
+
+A scheduler turns answers into each character's next_review_date, and
+that column is all the rest of the app reads: select_characters' review
+buckets, the dashboard's review counts and the parent drill queue. A
+child can therefore move between engines without any of those changing:
+
+- "sm2": spaced_repetition.update_mastery, the default
+- "fsrs": services/fsrs.py, with weights fitted per child
+
+Both engines keep the SM-2 bookkeeping (counts, repetitions,
+mastery_score) that car evolution and achievements read, so switching
+engines doesn't move mastery. set_scheduler replays the child's history
+through the new engine, so due dates are right from the next session.
+"""
+from typing import Protocol
+
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.services import fsrs, sm2_batch
+from app.services.forecast import invalidate_forecast
+from app.services.spaced_repetition import update_mastery
+
+
+class Scheduler(Protocol):
+    name: str
+    label: str
+
+    def record_answer(
+        self, db: Session, user_id: int, character_id: int, is_correct: bool, is_first_attempt: bool,
+    ) -> None:
+        """Apply one answer and set the character's next_review_date. Doesn't commit."""
+
+    def rebuild(self, db: Session, user_id: int) -> None:
+        """Recompute the user's due dates from their answer history, and commit."""
+
+
+class SM2Scheduler:
+    name = "sm2"
+    label = "SM-2"
+
+    def record_answer(self, db, user_id, character_id, is_correct, is_first_attempt):
+        update_mastery(db, user_id, character_id, is_correct, is_first_attempt)
+
+    def rebuild(self, db, user_id):
+        sm2_batch.rebuild_progress(db, user_id)
+
+
+class FSRSScheduler:
+    name = fsrs.ENGINE
+    label = "FSRS (fitted per child)"
+
+    def record_answer(self, db, user_id, character_id, is_correct, is_first_attempt):
+        fsrs.update_mastery(db, user_id, character_id, is_correct, is_first_attempt)
+
+    def rebuild(self, db, user_id):
+        fsrs.refit_user(db, user_id)
+
+
+DEFAULT_SCHEDULER = SM2Scheduler.name
+SCHEDULERS: dict[str, Scheduler] = {s.name: s for s in (SM2Scheduler(), FSRSScheduler())}
+
+
+def get_scheduler(name: str | None) -> Scheduler:
+    """The scheduler for a users.scheduler value; unknown names fall back to SM-2."""
+    return SCHEDULERS.get(name or DEFAULT_SCHEDULER, SCHEDULERS[DEFAULT_SCHEDULER])
+
+
+def set_scheduler(db: Session, user: User, name: str) -> Scheduler:
+    """Move a user to another scheduler and reschedule their characters under it."""
+    if name not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler {name!r}")
+    scheduler = SCHEDULERS[name]
+    user.scheduler = name
+    user.bump_progress_version()
+    db.flush()
+    scheduler.rebuild(db, user.id)
+    db.commit()
+    invalidate_forecast(user.id)
+    return scheduler
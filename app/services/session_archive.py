@@ -0,0 +1,199 @@
+"""Compact archive of completed sessions' questions.
+
+A completed session's session_questions rows are only read again for
+history and analytics, so once a session is older than archive_after_days
+its questions are rolled into a single session_archives row and the
+originals deleted. The archive keeps what analytics needs (answers,
+timings, mode) and drops the options and prompt_data payloads, which are
+most of a row's size.
+
+Payload format 2 is zlib-compressed columnar JSON:
+
+    {"t0": session start (ISO, naive UTC),
+     "n": question numbers, "c": character ids, "m": modes,
+     "k": correct answers, "a": selected answers, "ok": 1/0/null,
+     "f": first-attempt result 1/0/null,
+     "s": started_at offsets from t0 in ms, "r": answered_at offsets in ms}
+
+Format 1 is the same without "f".
+
+Columns rather than per-question objects keep keys out of the payload and
+put repeated values (modes, image paths) next to each other for zlib.
+"""
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.models.session import GameSession, SessionArchive, SessionQuestion
+
+FORMAT_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+
+
+class ArchivedQuestion(NamedTuple):
+    session_id: int
+    question_number: int
+    character_id: int | None
+    question_mode: str
+    correct_answer: str
+    selected_answer: str | None
+    is_correct: bool | None
+    started_at: datetime | None
+    answered_at: datetime | None
+    first_correct: bool | None = None
+
+
+def _naive(dt: datetime | None) -> datetime | None:
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _offset_ms(dt: datetime | None, base: datetime) -> int | None:
+    dt = _naive(dt)
+    return None if dt is None else round((dt - base).total_seconds() * 1000)
+
+
+def pack_questions(session: GameSession, questions: list[SessionQuestion]) -> bytes:
+    """Encode a session's questions as a current-format payload."""
+    base = _naive(session.started_at) or _naive(questions[0].started_at) or datetime(1970, 1, 1)
+    doc = {
+        "t0": base.isoformat(),
+        "n": [q.question_number for q in questions],
+        "c": [q.character_id for q in questions],
+        "m": [q.question_mode for q in questions],
+        "k": [q.correct_answer for q in questions],
+        "a": [q.selected_answer for q in questions],
+        "ok": [None if q.is_correct is None else int(q.is_correct) for q in questions],
+        "f": [None if q.first_correct is None else int(q.first_correct) for q in questions],
+        "s": [_offset_ms(q.started_at, base) for q in questions],
+        "r": [_offset_ms(q.answered_at, base) for q in questions],
+    }
+    raw = json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return zlib.compress(raw, 9)
+
+
+def unpack_archive(archive: SessionArchive) -> list[ArchivedQuestion]:
+    """Decode an archive row back into its questions, in question order."""
+    if archive.format_version not in READABLE_VERSIONS:
+        raise ValueError(f"Unknown session archive format {archive.format_version}")
+    doc = json.loads(zlib.decompress(archive.payload))
+    base = datetime.fromisoformat(doc["t0"])
+    first = doc.get("f") or [None] * len(doc["n"])
+
+    def at(ms):
+        return None if ms is None else base + timedelta(milliseconds=ms)
+
+    return [
+        ArchivedQuestion(
+            session_id=archive.session_id,
+            question_number=n,
+            character_id=c,
+            question_mode=m,
+            correct_answer=k,
+            selected_answer=a,
+            is_correct=None if ok is None else bool(ok),
+            started_at=at(s),
+            answered_at=at(r),
+            first_correct=None if f is None else bool(f),
+        )
+        for n, c, m, k, a, ok, f, s, r in zip(
+            doc["n"], doc["c"], doc["m"], doc["k"], doc["a"], doc["ok"], first, doc["s"], doc["r"],
+        )
+    ]
+
+
+def _from_row(q: SessionQuestion) -> ArchivedQuestion:
+    return ArchivedQuestion(
+        session_id=q.session_id,
+        question_number=q.question_number,
+        character_id=q.character_id,
+        question_mode=q.question_mode,
+        correct_answer=q.correct_answer,
+        selected_answer=q.selected_answer,
+        is_correct=q.is_correct,
+        started_at=_naive(q.started_at),
+        answered_at=_naive(q.answered_at),
+        first_correct=q.first_correct,
+    )
+
+
+def iter_question_history(db: Session, user_id: int, include_unfinished: bool = False) -> Iterator[ArchivedQuestion]:
+    """Yield every question of a user's completed sessions, oldest session first.
+
+    Reads archived and live sessions alike, so callers don't need to know
+    which sessions have been archived. `include_unfinished` adds sessions
+    still in progress (or abandoned but not yet purged).
+    """
+    query = db.query(GameSession.id).filter(GameSession.user_id == user_id)
+    if not include_unfinished:
+        query = query.filter(GameSession.completed_at.isnot(None))
+    sessions = query.order_by(GameSession.started_at, GameSession.id).all()
+    archives = {
+        a.session_id: a
+        for a in db.query(SessionArchive).filter(SessionArchive.user_id == user_id)
+    }
+    questions = db.query(SessionQuestion).join(GameSession).filter(GameSession.user_id == user_id)
+    if not include_unfinished:
+        questions = questions.filter(GameSession.completed_at.isnot(None))
+    live: dict[int, list[SessionQuestion]] = {}
+    for q in questions.order_by(SessionQuestion.session_id, SessionQuestion.question_number):
+        live.setdefault(q.session_id, []).append(q)
+
+    for (session_id,) in sessions:
+        if session_id in archives:
+            yield from unpack_archive(archives[session_id])
+        else:
+            yield from (_from_row(q) for q in live.get(session_id, []))
+
+
+def archive_completed_sessions(db: Session, older_than: timedelta, batch_size: int, max_batches: int) -> dict:
+    """Archive completed sessions older than `older_than`. Returns row counts moved."""
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - older_than
+    moved = {"sessions": 0, "questions": 0}
+    for _ in range(max_batches):
+        sessions = (
+            db.query(GameSession)
+            .filter(GameSession.completed_at.isnot(None))
+            .filter(GameSession.completed_at < cutoff)
+            .filter(GameSession.questions.any())
+            .filter(~GameSession.archive.has())
+            .order_by(GameSession.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not sessions:
+            break
+        ids = [s.id for s in sessions]
+        by_session: dict[int, list[SessionQuestion]] = {}
+        for q in (
+            db.query(SessionQuestion)
+            .filter(SessionQuestion.session_id.in_(ids))
+            # Questions are created with their session; lets PostgreSQL prune partitions
+            .filter(SessionQuestion.created_at >= min(s.started_at for s in sessions))
+            .order_by(SessionQuestion.session_id, SessionQuestion.question_number)
+        ):
+            by_session.setdefault(q.session_id, []).append(q)
+
+        for s in sessions:
+            questions = by_session[s.id]
+            db.add(SessionArchive(
+                session_id=s.id,
+                user_id=s.user_id,
+                question_count=len(questions),
+                format_version=FORMAT_VERSION,
+                payload=pack_questions(s, questions),
+            ))
+        moved["questions"] += (
+            db.query(SessionQuestion)
+            .filter(SessionQuestion.session_id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        moved["sessions"] += len(sessions)
+        db.commit()
+        if len(sessions) < batch_size:
+            break
+    return moved
@@ -1,17 +1,19 @@
 import json
 import random
-from datetime import date, datetime, timezone
-from sqlalchemy.orm import Session
+from datetime import date, datetime, time, timedelta, timezone
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.user import User
 from app.models.session import GameSession, SessionQuestion
 from app.models.rewards import PointsLedger
 from app.services.question_generator import select_characters, generate_question, pick_question_mode
-from app.services.spaced_repetition import update_mastery
+from app.services.forecast import invalidate_forecast
+from app.services.scheduler import get_scheduler
 from app.services.rewards import award_points
-from app.services.math_generator import generate_math_questions
-from app.services.logic_generator import generate_logic_questions
-from app.services.english_generator import generate_english_questions
+from app.services.generator_registry import registry
+from app.services.question_store import add_generated_questions, can_rebuild, fresh_questions
+from app.services.recent_questions import fingerprint, load_recent, new_recent, save_recent
+from app.services import english_generator, logic_generator, math_generator  # noqa: registers their generators
 from app.config import get_settings
 
 
@@ -19,13 +21,57 @@ class SessionLimitReached(Exception):
     pass
 
 
+# Replayable responses kept per session: 5 answers plus retries and the
+# completion fit comfortably; older entries are dropped first
+MAX_REQUEST_RESULTS = 32
+
+
+def _replayed_result(session: GameSession, request_key: str | None) -> dict | None:
+    """Return the stored response for a retried request, if any."""
+    if not request_key or not session.request_results:
+        return None
+    return json.loads(session.request_results).get(request_key)
+
+
+def _remember_result(session: GameSession, request_key: str | None, result: dict) -> None:
+    """Store a response on the session so a retry with the same key replays it."""
+    if not request_key:
+        return
+    results = json.loads(session.request_results) if session.request_results else {}
+    results[request_key] = result
+    while len(results) > MAX_REQUEST_RESULTS:
+        results.pop(next(iter(results)))
+    session.request_results = json.dumps(results, separators=(",", ":"))
+
+
 def _has_daily_bonus_award(db: Session, user_id: int, target_day: date) -> bool:
-    entries = (
-        db.query(PointsLedger)
+    # Bounded by created_at so a partitioned ledger only reads one month
+    day_start = datetime.combine(target_day, time.min)
+    return (
+        db.query(PointsLedger.id)
         .filter_by(user_id=user_id, reason="daily_bonus")
-        .all()
+        .filter(PointsLedger.created_at >= day_start)
+        .filter(PointsLedger.created_at < day_start + timedelta(days=1))
+        .first()
+    ) is not None
+
+
+def find_open_question(db: Session, question_id: int) -> SessionQuestion | None:
+    """Look up a question that can still be answered.
+
+    Sessions unfinished after abandoned_session_hours are the janitor's to
+    delete, so their questions are out of reach; the created_at bound also
+    lets PostgreSQL prune session_questions to the latest partitions.
+    """
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+        hours=get_settings().abandoned_session_hours
+    )
+    return (
+        db.query(SessionQuestion)
+        .filter(SessionQuestion.id == question_id)
+        .filter(SessionQuestion.created_at >= since)
+        .first()
     )
-    return any(e.created_at and e.created_at.date() == target_day for e in entries)
 
 
 def can_start_session(user: User) -> bool:
@@ -37,26 +83,64 @@ def can_start_session(user: User) -> bool:
     return user.sessions_today < limit
 
 
-def create_session(db: Session, user: User, game_type: str = "chinese", character_ids: list[int] | None = None) -> GameSession:
-    """Create a new game session with 5 questions."""
+def find_resumable_session(db: Session, user: User, game_type: str) -> GameSession | None:
+    """Return the user's most recent unfinished session of this type, if still fresh.
+
+    Resuming doesn't count against max_sessions_per_day; sessions older
+    than session_resume_hours are left for the janitor, as are sessions
+    whose compact questions a newer generator version can't rebuild.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=get_settings().session_resume_hours)
+    session = (
+        db.query(GameSession)
+        .options(selectinload(GameSession.questions))
+        .filter_by(user_id=user.id, game_type=game_type, completed_at=None)
+        .filter(GameSession.started_at >= cutoff.replace(tzinfo=None))
+        .order_by(GameSession.started_at.desc())
+        .first()
+    )
+    if session is None or not session.questions or not can_rebuild(session):
+        return None
+    return session
+
+
+def resume_index(session: GameSession) -> int:
+    """Index of the first question not yet answered correctly (len() if all are)."""
+    for i, q in enumerate(session.questions):
+        if not q.is_correct:
+            return i
+    return len(session.questions)
+
+
+def create_session(
+    db: Session,
+    user: User,
+    game_type: str = "chinese",
+    character_ids: list[int] | None = None,
+    bundle: dict | None = None,
+) -> GameSession:
+    """Create a new game session with 5 questions.
+
+    A `bundle` from session_bundle (see services/session_pool.py) supplies
+    questions drawn earlier, so nothing is selected or generated here.
+    """
     user.reset_daily_if_needed()
     settings = get_settings()
 
     if settings.max_sessions_per_day > 0 and user.sessions_today >= settings.max_sessions_per_day:
         raise SessionLimitReached("Daily session limit reached. Come back tomorrow!")
 
-    game_session = GameSession(user_id=user.id, game_type=game_type)
+    game_session = GameSession(user_id=user.id, game_type=game_type, seed=bundle["seed"] if bundle else new_seed())
     db.add(game_session)
     db.flush()
 
-    if game_type == "chinese":
-        _create_chinese_questions(db, game_session, user, settings, character_ids=character_ids)
-    elif game_type == "math":
-        _create_math_questions(db, game_session, user, settings)
-    elif game_type == "logic":
-        _create_logic_questions(db, game_session, user, settings)
-    elif game_type == "english":
-        _create_english_questions(db, game_session, user, settings)
+    rng = random.Random(game_session.seed)
+    if bundle is not None:
+        _add_bundled_questions(db, game_session, user, bundle)
+    elif game_type == "chinese":
+        _create_chinese_questions(db, game_session, user, settings, rng, character_ids=character_ids)
+    elif game_type in registry:
+        _create_generated_questions(db, game_session, user, settings, rng)
     else:
         raise ValueError(f"Unknown game type: {game_type}")
 
@@ -68,92 +152,120 @@ def create_session(db: Session, user: User, game_type: str = "chinese", characte
     return game_session
 
 
-def _create_chinese_questions(db: Session, game_session: GameSession, user: User, settings, character_ids: list[int] | None = None) -> None:
-    """Create Chinese character questions (original logic)."""
+def new_seed() -> int:
+    """A session seed; fits a signed 64-bit column."""
+    return random.getrandbits(63)
+
+
+def generated_questions(game_type: str, age: int, count: int, seed: int) -> list[dict]:
+    """A new player's math, logic or English session. The same arguments give the same questions."""
+    plan = registry.plan(game_type, age, count, random.Random(seed))
+    return [gq for _, _, gq in fresh_questions(game_type, age, plan, new_recent())]
+
+
+def _chinese_rows(db: Session, user: User, settings, rng: random.Random, recent, character_ids: list[int] | None = None) -> list[list]:
+    """[character_id, mode, correct_answer, options JSON] per question; they join `recent`."""
     is_prereader = (user.age or 5) <= 5
-    characters = select_characters(db, user.id, count=settings.questions_per_session, is_prereader=is_prereader, character_ids=character_ids)
+    characters = select_characters(db, user.id, count=settings.questions_per_session, is_prereader=is_prereader, character_ids=character_ids, rng=rng)
 
     if not characters:
         raise ValueError("No characters available for this user.")
 
-    for i, char in enumerate(characters, 1):
-        mode = pick_question_mode(is_prereader, char)
-        q_data = generate_question(db, char, mode, count=settings.distractors_per_question)
-
-        question = SessionQuestion(
+    # Spaced repetition picks the characters; a recent one comes back in another mode
+    rows = []
+    kept = set()
+    for char in characters:
+        for _ in range(settings.recent_question_retries + 1):
+            mode = pick_question_mode(is_prereader, char, rng)
+            if fingerprint("chinese", char.id, mode) not in recent:
+                break
+        kept.add(fingerprint("chinese", char.id, mode))
+        q_data = generate_question(db, char, mode, count=settings.distractors_per_question, rng=rng)
+        rows.append([char.id, mode, q_data["correct_answer"], json.dumps(q_data["options"])])
+    recent.add_session(kept)
+    return rows
+
+
+def _add_chinese_questions(db: Session, game_session: GameSession, rows: list[list]) -> None:
+    for i, (character_id, mode, correct_answer, options) in enumerate(rows, 1):
+        db.add(SessionQuestion(
             session_id=game_session.id,
-            character_id=char.id,
+            character_id=character_id,
             question_number=i,
-            correct_answer=q_data["correct_answer"],
-            options=json.dumps(q_data["options"]),
+            correct_answer=correct_answer,
+            options=options,
             question_mode=mode,
-        )
-        db.add(question)
+        ))
 
 
-def _create_math_questions(db: Session, game_session: GameSession, user: User, settings) -> None:
-    """Create math questions based on user age."""
-    age = user.age or 5
-    math_qs = generate_math_questions(age, count=settings.questions_per_session)
+def _create_chinese_questions(db: Session, game_session: GameSession, user: User, settings, rng: random.Random, character_ids: list[int] | None = None) -> None:
+    """Create Chinese character questions (original logic)."""
+    recent = load_recent(user, "chinese")
+    _add_chinese_questions(db, game_session, _chinese_rows(db, user, settings, rng, recent, character_ids))
+    save_recent(user, "chinese", recent)
 
-    for i, mq in enumerate(math_qs, 1):
-        question = SessionQuestion(
-            session_id=game_session.id,
-            character_id=None,
-            question_number=i,
-            correct_answer=mq["correct_answer"],
-            options=json.dumps(mq["options"]),
-            question_mode=mq["mode"],
-            prompt_data=mq["prompt_data"],
-        )
-        db.add(question)
 
+def _create_generated_questions(db: Session, game_session: GameSession, user: User, settings, rng: random.Random) -> None:
+    """Create math, logic or English questions from the game's registered generators."""
+    game_session.age = user.age or 5
+    plan = registry.plan(game_session.game_type, game_session.age, settings.questions_per_session, rng)
+    recent = load_recent(user, game_session.game_type)
+    add_generated_questions(db, game_session, plan, recent)
+    save_recent(user, game_session.game_type, recent)
 
-def _create_logic_questions(db: Session, game_session: GameSession, user: User, settings) -> None:
-    """Create logic questions based on user age."""
-    age = user.age or 5
-    logic_qs = generate_logic_questions(age, count=settings.questions_per_session)
 
-    for i, lq in enumerate(logic_qs, 1):
-        question = SessionQuestion(
-            session_id=game_session.id,
-            character_id=None,
-            question_number=i,
-            correct_answer=lq["correct_answer"],
-            options=json.dumps(lq["options"]),
-            question_mode=lq["mode"],
-            prompt_data=lq["prompt_data"],
-        )
-        db.add(question)
+def session_bundle(db: Session, user: User, game_type: str, seed: int | None = None) -> dict:
+    """The questions create_session would draw now, as JSON, without writing anything.
 
+    Chinese bundles hold the finished rows; generated games hold the
+    (mode, seed) plan left after repeat suppression. "recent" is the
+    game's ring once the session is drawn.
+    """
+    settings = get_settings()
+    seed = new_seed() if seed is None else seed
+    rng = random.Random(seed)
+    recent = load_recent(user, game_type)
+    bundle = {"seed": seed}
+    if game_type == "chinese":
+        bundle["rows"] = _chinese_rows(db, user, settings, rng, recent)
+    elif game_type in registry:
+        age = user.age or 5
+        plan = registry.plan(game_type, age, settings.questions_per_session, rng)
+        bundle["plan"] = [[mode, s] for mode, s, _ in fresh_questions(game_type, age, plan, recent)]
+    else:
+        raise ValueError(f"Unknown game type: {game_type}")
+    bundle["recent"] = recent.dumps()
+    return bundle
 
-def _create_english_questions(db: Session, game_session: GameSession, user: User, settings) -> None:
-    """Create English language questions based on user age."""
-    age = user.age or 5
-    eng_qs = generate_english_questions(age, count=settings.questions_per_session)
 
-    for i, eq in enumerate(eng_qs, 1):
-        question = SessionQuestion(
-            session_id=game_session.id,
-            character_id=None,
-            question_number=i,
-            correct_answer=eq["correct_answer"],
-            options=json.dumps(eq["options"]),
-            question_mode=eq["mode"],
-            prompt_data=eq["prompt_data"],
-        )
-        db.add(question)
+def _add_bundled_questions(db: Session, game_session: GameSession, user: User, bundle: dict) -> None:
+    game_type = game_session.game_type
+    if game_type == "chinese":
+        _add_chinese_questions(db, game_session, bundle["rows"])
+    else:
+        game_session.age = user.age or 5
+        add_generated_questions(db, game_session, [tuple(key) for key in bundle["plan"]])
+    save_recent(user, game_type, new_recent(bundle["recent"]))
+
 
+def submit_answer(db: Session, user: User, question_id: int, selected_answer: str, request_key: str | None = None) -> dict:
+    """Submit an answer for a question. Returns result dict.
 
-def submit_answer(db: Session, user: User, question_id: int, selected_answer: str) -> dict:
-    """Submit an answer for a question. Returns result dict."""
-    question = db.query(SessionQuestion).filter_by(id=question_id).first()
+    A retry carrying the same `request_key` gets the original result back
+    without touching scores or mastery.
+    """
+    question = find_open_question(db, question_id)
     if not question:
         raise ValueError("Question not found")
 
-    session = db.query(GameSession).filter_by(id=question.session_id).first()
+    # Row lock (no-op on SQLite) serializes concurrent answers to one session
+    session = db.query(GameSession).filter_by(id=question.session_id).with_for_update().first()
     if session.user_id != user.id:
         raise ValueError("This question doesn't belong to you")
+    replayed = _replayed_result(session, request_key)
+    if replayed is not None:
+        db.commit()  # release the lock
+        return replayed
     if session.completed_at:
         raise ValueError("Session already completed")
 
@@ -172,10 +284,13 @@ def submit_answer(db: Session, user: User, question_id: int, selected_answer: st
 
     if not was_answered:
         question.is_correct = is_correct
+        question.first_correct = is_correct
 
-        # Update mastery on first answer attempt (SM-2 with quality)
+        # Update mastery on first answer attempt, with the child's scheduler
         if question.character_id is not None:
-            update_mastery(db, user.id, question.character_id, is_correct, is_first_attempt=True)
+            get_scheduler(user.scheduler).record_answer(
+                db, user.id, question.character_id, is_correct, is_first_attempt=True,
+            )
 
         if is_correct:
             points = settings.points_correct
@@ -209,14 +324,14 @@ def submit_answer(db: Session, user: User, question_id: int, selected_answer: st
             points = settings.points_correct
             session.total_correct += 1
             if question.character_id is not None:
-                update_mastery(db, user.id, question.character_id, True, is_first_attempt=False)
+                get_scheduler(user.scheduler).record_answer(
+                    db, user.id, question.character_id, True, is_first_attempt=False,
+                )
             session.points_earned += points
             award_points(db, user, points, "correct_answer")
         else:
             question.is_correct = False
 
-    db.commit()
-
     result = {
         "is_correct": is_correct,
         "correct_answer": question.correct_answer,
@@ -225,6 +340,12 @@ def submit_answer(db: Session, user: User, question_id: int, selected_answer: st
     }
     if bonus_text:
         result["bonus"] = bonus_text
+    _remember_result(session, request_key, result)
+    if question.character_id is not None:
+        user.bump_progress_version()
+    db.commit()
+    if question.character_id is not None:
+        invalidate_forecast(user.id)
     return result
 
 
@@ -283,12 +404,34 @@ def _advance_quest(db: Session, user: User, settings) -> dict | None:
     return quest_info
 
 
-def complete_session(db: Session, user: User, session_id: int) -> dict:
-    """Complete a session and award bonuses."""
-    session = db.query(GameSession).filter_by(id=session_id, user_id=user.id).first()
+def _bump_game_stats(db: Session, user: User, game_type: str) -> int:
+    """Increment the user's completion counter for a game type. Returns the new count."""
+    from app.models.stats import UserGameStats
+
+    stats = db.query(UserGameStats).filter_by(user_id=user.id, game_type=game_type).first()
+    if not stats:
+        stats = UserGameStats(user_id=user.id, game_type=game_type, sessions_completed=0)
+        db.add(stats)
+    stats.sessions_completed = (stats.sessions_completed or 0) + 1
+    db.flush()
+    return stats.sessions_completed
+
+
+def complete_session(db: Session, user: User, session_id: int, request_key: str | None = None) -> dict:
+    """Complete a session and award bonuses.
+
+    A retry carrying the same `request_key` gets the original summary back;
+    bonuses, quest progress and badges are never applied twice.
+    """
+    session = db.query(GameSession).filter_by(id=session_id, user_id=user.id).with_for_update().first()
     if not session:
         raise ValueError("Session not found")
 
+    replayed = _replayed_result(session, request_key)
+    if replayed is not None:
+        db.commit()  # release the lock
+        return replayed
+
     if session.completed_at:
         raise ValueError("Session already completed")
 
@@ -328,6 +471,7 @@ def complete_session(db: Session, user: User, session_id: int) -> dict:
 
     # Update user stats
     user.total_sessions_completed += 1
+    completed_of_type = _bump_game_stats(db, user, session.game_type)
     if user.streak > user.best_streak:
         user.best_streak = user.streak
 
@@ -338,14 +482,16 @@ def complete_session(db: Session, user: User, session_id: int) -> dict:
     quest_info = _advance_quest(db, user, settings)
 
     # Achievement check
-    from app.services.achievements import check_badges
+    from app.services.achievements import check_badges, completion_events
     session_result = {
         "total_correct": session.total_correct,
         "total_wrong": session.total_wrong,
     }
-    new_badges = check_badges(db, user, session_result, session)
-
-    db.commit()
+    new_badges = check_badges(
+        db, user, session_result, session,
+        events=completion_events(session, is_perfect),
+        completed_of_type=completed_of_type,
+    )
 
     # Build XP breakdown
     xp_breakdown = []
@@ -357,7 +503,7 @@ def complete_session(db: Session, user: User, session_id: int) -> dict:
     if streak_bonus > 0:
         xp_breakdown.append({"label": f"Streak x{user.streak}", "value": streak_bonus})
 
-    return {
+    summary = {
         "session_id": session.id,
         "total_correct": session.total_correct,
         "total_wrong": session.total_wrong,
@@ -378,3 +524,6 @@ def complete_session(db: Session, user: User, session_id: int) -> dict:
         "new_badges": new_badges,
         "quest": quest_info,
     }
+    _remember_result(session, request_key, summary)
+    db.commit()
+    return summary
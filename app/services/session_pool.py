@@ -0,0 +1,104 @@
+"""Pre-generated next sessions, one per game.
+
+Creating a Chinese session loads the catalog and the child's progress,
+runs weighted selection and builds options for each question, all while
+the child waits on the start screen. After each completed session, and
+at login, a background task draws each game's next session ahead of
+time with session_engine.session_bundle. The bundles are stored in
+users.pending_sessions as JSON {game_type: bundle}.
+
+A bundle is claimed when its game starts, and only while it is still
+what create_session would draw right now. That means the same day and
+the same age, and an unchanged recent-question ring for that game. Every
+session of the game changes its ring, whether it was claimed or
+generated on demand. A Chinese bundle also needs an unchanged
+users.progress_version. Chinese answers, scheduler changes, refits and
+rebuilds bump that version. Staleness is therefore per game: playing
+math leaves the other games' bundles current, and the refill after it
+redraws math only. Sessions that aren't claimed are generated on demand,
+as are drills queued by a parent. A claimed or stale bundle is dropped
+either way, and the next refill replaces it.
+"""
+import json
+import logging
+from datetime import date
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.services.recent_questions import ring_digest
+from app.services.session_engine import can_start_session, session_bundle
+
+logger = logging.getLogger(__name__)
+
+POOL_GAMES = ("chinese", "math", "logic", "english")
+
+
+def _bundles(user: User) -> dict:
+    return json.loads(user.pending_sessions) if user.pending_sessions else {}
+
+
+def _store(user: User, bundles: dict) -> None:
+    user.pending_sessions = json.dumps(bundles, separators=(",", ":")) if bundles else None
+
+
+def _stamp(user: User, game_type: str) -> dict:
+    """What a bundle was drawn from; it stays current while this is unchanged."""
+    stamp = {"built_on": date.today().isoformat(), "age": user.age or 5, "ring": ring_digest(user, game_type)}
+    if game_type == "chinese":
+        stamp["version"] = user.progress_version or 0
+    return stamp
+
+
+def _is_current(user: User, game_type: str, bundle: dict) -> bool:
+    return all(bundle.get(key) == value for key, value in _stamp(user, game_type).items())
+
+
+def pool_games(user: User) -> tuple[str, ...]:
+    """Games the user can start; pre-readers only play Chinese."""
+    return POOL_GAMES if (user.age or 5) > 5 else ("chinese",)
+
+
+def take_pending(user: User, game_type: str) -> dict | None:
+    """Remove the game's bundle from the pool; return it if still current."""
+    bundles = _bundles(user)
+    bundle = bundles.pop(game_type, None)
+    if bundle is None:
+        return None
+    _store(user, bundles)
+    return bundle if _is_current(user, game_type, bundle) else None
+
+
+def refill_pool(db: Session, user: User) -> list[str]:
+    """Draw a bundle for each game that lacks a current one. Returns the games drawn."""
+    if not get_settings().session_pool or not can_start_session(user):
+        return []
+    bundles = {game: b for game, b in _bundles(user).items() if _is_current(user, game, b)}
+    drawn = []
+    for game_type in pool_games(user):
+        if game_type in bundles:
+            continue
+        try:
+            bundle = session_bundle(db, user, game_type)
+        except ValueError:
+            continue  # e.g. no characters for this user yet
+        bundle.update(_stamp(user, game_type))
+        bundles[game_type] = bundle
+        drawn.append(game_type)
+    _store(user, bundles)
+    db.commit()
+    return drawn
+
+
+def refill_pool_task(bind: Engine, user_id: int) -> None:
+    """BackgroundTasks entry point. Uses its own session; the request's is closed by then."""
+    with Session(bind=bind) as db:
+        user = db.get(User, user_id)
+        if user is None:
+            return
+        try:
+            refill_pool(db, user)
+        except Exception:
+            logger.exception("Session pool refill failed for user %s", user_id)
@@ -0,0 +1,253 @@
+"""Vectorized SM-2 for replays and what-if scheduling.
+
+update_mastery applies SM-2 one answer at a time. This module applies it
+to whole arrays of (easiness factor, interval, repetitions, quality) with
+NumPy, and can replay a user's full answer history (live and archived
+sessions) to rebuild user_character_progress from scratch. A change to the
+scheduling constants in spaced_repetition, such as the 1 and 3 day seeds
+or the EF floor, becomes a replay under the new defaults instead of a
+per-row migration. The command line can also try other parameters as a
+what-if, but only with --dry-run: live answers keep using the constants,
+so a schedule written under different ones would drift on the next answer.
+
+    python -m app.services.sm2_batch --second-interval 4 --dry-run
+
+The command only rewrites children on the sm2 scheduler; FSRS children
+are skipped, since their due dates come from services/fsrs.py.
+
+SM-2 is sequential per character, so the replay vectorizes across
+characters: step r applies every character's r-th review at once. The
+arithmetic matches spaced_repetition.sm2_step exactly (np.rint rounds
+ties to even like round(), and EF is updated in the same order).
+"""
+import argparse
+from datetime import date, datetime
+from typing import Iterable, NamedTuple
+
+import numpy as np
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.progress import UserCharacterProgress
+from app.models.user import User
+from app.services import spaced_repetition as sr
+from app.services.mastery_summary import check_mastery_summaries
+from app.services.session_archive import ArchivedQuestion, iter_question_history
+
+
+class SM2Params(NamedTuple):
+    first_interval: int = sr.FIRST_INTERVAL
+    second_interval: int = sr.SECOND_INTERVAL
+    min_ef: float = sr.MIN_EF
+    max_interval: int = sr.MAX_INTERVAL
+    initial_ef: float = sr.INITIAL_EF
+
+
+DEFAULT_PARAMS = SM2Params()
+
+# Lookup tables built from the scalar functions so results match them
+_PENALTY = np.array([sr._ef_penalty(q) for q in range(6)])
+_MASTERY = np.array([sr._mastery_from_repetitions(r) for r in range(8)])
+
+
+def sm2_step_batch(ef, interval, repetitions, quality, params: SM2Params = DEFAULT_PARAMS):
+    """Apply one SM-2 review to every element. Returns new (ef, interval, repetitions) arrays."""
+    ef = np.asarray(ef, dtype=np.float64)
+    interval = np.asarray(interval, dtype=np.int64)
+    repetitions = np.asarray(repetitions, dtype=np.int64)
+    quality = np.asarray(quality, dtype=np.int64)
+
+    recalled = quality >= 3
+    grown = np.rint(interval * ef).astype(np.int64)
+    next_interval = np.where(
+        repetitions == 0, params.first_interval,
+        np.where(repetitions == 1, params.second_interval, grown),
+    )
+    new_interval = np.where(recalled, np.clip(next_interval, 1, params.max_interval), 0)
+    new_repetitions = np.where(recalled, repetitions + 1, 0)
+    new_ef = np.maximum(params.min_ef, ef + 0.1 - _PENALTY[quality])
+    return new_ef, new_interval, new_repetitions
+
+
+def mastery_from_repetitions(repetitions) -> np.ndarray:
+    return _MASTERY[np.minimum(np.asarray(repetitions), len(_MASTERY) - 1)]
+
+
+class ReviewEvents(NamedTuple):
+    """SM-2 reviews in the order they happened."""
+    character_id: np.ndarray   # int64
+    quality: np.ndarray        # int64, 0-5
+    day: np.ndarray            # int64 date ordinals
+    seen_at: np.ndarray        # datetime64[us]
+
+
+def review_events(questions: Iterable[ArchivedQuestion]) -> ReviewEvents:
+    """The reviews submit_answer applied for these questions.
+
+    A first attempt is quality 5 when correct and 1 when wrong; a wrong
+    first attempt answered correctly on retry adds a quality-3 review.
+    Questions answered before first_correct was recorded can't tell a
+    good retry from a good first attempt and are read as the latter.
+    """
+    chars, qualities, days, seen = [], [], [], []
+
+    def add(character_id, quality, at):
+        chars.append(character_id)
+        qualities.append(quality)
+        days.append(at.toordinal())
+        seen.append(at)
+
+    for q in questions:
+        if q.character_id is None or q.is_correct is None or q.answered_at is None:
+            continue
+        first = q.is_correct if q.first_correct is None else q.first_correct
+        add(q.character_id, sr._quality_from_attempt(first, True), q.answered_at)
+        if not first and q.is_correct:
+            add(q.character_id, sr._quality_from_attempt(True, False), q.answered_at)
+
+    return ReviewEvents(
+        character_id=np.array(chars, dtype=np.int64),
+        quality=np.array(qualities, dtype=np.int64),
+        day=np.array(days, dtype=np.int64),
+        seen_at=np.array(seen, dtype="datetime64[us]"),
+    )
+
+
+class ReplayResult(NamedTuple):
+    """Final SM-2 state per character, aligned arrays."""
+    character_id: np.ndarray
+    easiness_factor: np.ndarray
+    interval: np.ndarray
+    repetitions: np.ndarray
+    correct_count: np.ndarray
+    wrong_count: np.ndarray
+    mastery_score: np.ndarray
+    next_review_day: np.ndarray   # date ordinals
+    last_seen: np.ndarray         # datetime64[us]
+
+
+def replay(events: ReviewEvents, params: SM2Params = DEFAULT_PARAMS) -> ReplayResult:
+    """Run every character's reviews through SM-2 from the starting state."""
+    chars, pair = np.unique(events.character_id, return_inverse=True)
+    counts = np.bincount(pair, minlength=len(chars))
+    # Events grouped by character, still in time order within each group
+    order = np.argsort(pair, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+    ef = np.full(len(chars), params.initial_ef)
+    interval = np.zeros(len(chars), dtype=np.int64)
+    repetitions = np.zeros(len(chars), dtype=np.int64)
+    for r in range(int(counts.max(initial=0))):
+        live = np.flatnonzero(counts > r)
+        quality = events.quality[order[starts[live] + r]]
+        ef[live], interval[live], repetitions[live] = sm2_step_batch(
+            ef[live], interval[live], repetitions[live], quality, params,
+        )
+
+    last = order[starts + counts - 1] if len(chars) else np.array([], dtype=np.int64)
+    correct = np.bincount(pair, weights=events.quality >= 3, minlength=len(chars)).astype(np.int64)
+    return ReplayResult(
+        character_id=chars,
+        easiness_factor=ef,
+        interval=interval,
+        repetitions=repetitions,
+        correct_count=correct,
+        wrong_count=counts - correct,
+        mastery_score=mastery_from_repetitions(repetitions),
+        next_review_day=events.day[last] + interval,
+        last_seen=events.seen_at[last],
+    )
+
+
+# The columns SM-2 owns; a rebuild leaves the rest (FSRS state, previous_mastery_score) as they are
+_SM2_COLUMNS = (
+    "easiness_factor", "sm2_interval", "sm2_repetitions", "correct_count",
+    "wrong_count", "mastery_score", "next_review_date", "last_seen",
+)
+_REPLAY_UPDATE = (
+    update(UserCharacterProgress)
+    .where(UserCharacterProgress.user_id == bindparam("uid"))
+    .where(UserCharacterProgress.character_id == bindparam("cid"))
+    .values({column: bindparam(f"new_{column}") for column in _SM2_COLUMNS})
+)
+
+
+def rebuild_progress(db: Session, user_id: int, params: SM2Params = DEFAULT_PARAMS, dry_run: bool = False) -> ReplayResult:
+    """Rewrite a user's SM-2 columns with a replay of their answer history.
+
+    Rows are updated in place, so FSRS state survives. Only characters
+    that appear in the history are rewritten; rows for
+    characters whose answers are gone (purged abandoned sessions) are
+    left alone. With dry_run nothing is written.
+    """
+    result = replay(review_events(iter_question_history(db, user_id, include_unfinished=True)), params)
+    if dry_run or not len(result.character_id):
+        return result
+
+    rows = [
+        {
+            "character_id": int(result.character_id[i]),
+            "easiness_factor": float(result.easiness_factor[i]),
+            "sm2_interval": int(result.interval[i]),
+            "sm2_repetitions": int(result.repetitions[i]),
+            "correct_count": int(result.correct_count[i]),
+            "wrong_count": int(result.wrong_count[i]),
+            "mastery_score": int(result.mastery_score[i]),
+            "next_review_date": date.fromordinal(int(result.next_review_day[i])),
+            "last_seen": result.last_seen[i].astype(datetime),
+        }
+        for i in range(len(result.character_id))
+    ]
+    existing = {
+        row[0]
+        for row in db.query(UserCharacterProgress.character_id)
+        .filter(UserCharacterProgress.user_id == user_id)
+        .filter(UserCharacterProgress.character_id.in_(result.character_id.tolist()))
+    }
+    updates = [
+        {"uid": user_id, "cid": row["character_id"], **{f"new_{c}": row[c] for c in _SM2_COLUMNS}}
+        for row in rows if row["character_id"] in existing
+    ]
+    inserts = [{"user_id": user_id, **row} for row in rows if row["character_id"] not in existing]
+    if updates:
+        db.connection().execute(_REPLAY_UPDATE, updates)
+    if inserts:
+        db.execute(insert(UserCharacterProgress), inserts)
+    db.get(User, user_id).bump_progress_version()
+    db.commit()
+    check_mastery_summaries(db, [user_id])
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild user_character_progress by replaying answer history.")
+    parser.add_argument("--first-interval", type=int, default=DEFAULT_PARAMS.first_interval)
+    parser.add_argument("--second-interval", type=int, default=DEFAULT_PARAMS.second_interval)
+    parser.add_argument("--min-ef", type=float, default=DEFAULT_PARAMS.min_ef)
+    parser.add_argument("--dry-run", action="store_true", help="report what would change, write nothing")
+    args = parser.parse_args()
+    params = DEFAULT_PARAMS._replace(
+        first_interval=args.first_interval, second_interval=args.second_interval, min_ef=args.min_ef,
+    )
+    if params != DEFAULT_PARAMS and not args.dry_run:
+        parser.error("update_mastery uses the defaults; try other parameters with --dry-run only")
+
+    from app.database import SessionLocal
+    from app.services.scheduler import SM2Scheduler, get_scheduler
+
+    db = SessionLocal()
+    try:
+        today = date.today().toordinal()
+        for user in db.query(User).filter_by(role="child").order_by(User.id).all():
+            if not isinstance(get_scheduler(user.scheduler), SM2Scheduler):
+                print(f"{user.name}: skipped, on the {user.scheduler} scheduler")
+                continue
+            result = rebuild_progress(db, user.id, params, dry_run=args.dry_run)
+            due = int((result.next_review_day <= today).sum())
+            print(f"{user.name}: {len(result.character_id)} characters, {due} due today")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
+from functools import lru_cache
+
+from sqlalchemy import Date, Float, Integer, String, bindparam, case, cast, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
 from datetime import date, datetime, timedelta, timezone
 
 from app.models.progress import UserCharacterProgress
+from app.services.mastery_summary import apply_mastery_change
 
 
 def _quality_from_attempt(is_correct: bool, is_first_attempt: bool) -> int:
@@ -35,76 +43,182 @@ def _mastery_from_repetitions(repetitions: int) -> int:
         return 5
 
 
-def update_mastery(
-    db: Session,
-    user_id: int,
-    character_id: int,
-    is_correct: bool,
-    is_first_attempt: bool = True,
-) -> UserCharacterProgress:
-    """Update SM-2 spaced repetition data for a user-character pair.
+# SM-2 parameters
+INITIAL_EF = 2.5
+MIN_EF = 1.3
+FIRST_INTERVAL = 1    # days after the first correct answer
+SECOND_INTERVAL = 3   # days after the second
+MAX_INTERVAL = 36500  # keeps next_review_date within date range on long streaks
+
+
+def _ef_penalty(quality: int) -> float:
+    return (5 - quality) * (0.08 + (5 - quality) * 0.02)
+
+
+def sm2_step(easiness_factor: float, interval: int, repetitions: int, quality: int) -> tuple[float, int, int]:
+    """One SM-2 review: returns the new (easiness factor, interval, repetitions).
 
-    Implements the SM-2 algorithm:
     - Correct answers increase interval and repetitions
     - Wrong answers reset repetitions and schedule immediate review
     - Easiness factor adjusts based on response quality
+
+    update_mastery applies the same step in SQL; this is the reference.
     """
-    progress = (
-        db.query(UserCharacterProgress)
-        .filter_by(user_id=user_id, character_id=character_id)
-        .first()
+    if quality >= 3:  # correct
+        if repetitions == 0:
+            new_interval = FIRST_INTERVAL
+        elif repetitions == 1:
+            new_interval = SECOND_INTERVAL
+        else:
+            new_interval = round(interval * easiness_factor)
+        repetitions += 1
+        interval = min(max(new_interval, 1), MAX_INTERVAL)
+    else:  # wrong
+        repetitions = 0
+        interval = 0  # review again today
+    ef = easiness_factor + 0.1 - _ef_penalty(quality)
+    return max(MIN_EF, ef), interval, repetitions
+
+
+def _mastery_case(repetitions):
+    """SQL mirror of _mastery_from_repetitions."""
+    return case(
+        (repetitions <= 0, 0),
+        (repetitions == 1, 1),
+        (repetitions == 2, 2),
+        (repetitions <= 4, 3),
+        (repetitions <= 6, 4),
+        else_=5,
     )
 
-    if not progress:
-        progress = UserCharacterProgress(
-            user_id=user_id,
-            character_id=character_id,
-            mastery_score=0,
-            correct_count=0,
-            wrong_count=0,
-            easiness_factor=2.5,
-            sm2_interval=0,
-            sm2_repetitions=0,
-            next_review_date=None,
-        )
-        db.add(progress)
 
-    quality = _quality_from_attempt(is_correct, is_first_attempt)
-    today = date.today()
+def _round_half_even(value, dialect: str):
+    """SQL mirror of Python's round() for positive values.
 
-    # Track counts
-    if is_correct:
-        progress.correct_count += 1
-    else:
-        progress.wrong_count += 1
+    PostgreSQL's round(double precision) already rounds ties to even;
+    SQLite's round() rounds them away from zero.
+    """
+    if dialect == "postgresql":
+        return cast(func.round(value), Integer)
+    whole = cast(value, Integer)  # truncates, which is floor for positive values
+    return case(
+        (value - whole == 0.5, whole + whole % 2),
+        else_=cast(func.round(value), Integer),
+    )
+
+
+def _add_days(day, days, dialect: str):
+    if dialect == "postgresql":
+        return cast(day, Date) + days
+    return func.date(day, "+" + cast(days, String) + " days")
 
-    # SM-2 core algorithm
-    if quality >= 3:  # correct
-        if progress.sm2_repetitions == 0:
-            interval = 1
-        elif progress.sm2_repetitions == 1:
-            interval = 3
-        else:
-            interval = round(progress.sm2_interval * progress.easiness_factor)
-        progress.sm2_repetitions += 1
-        progress.sm2_interval = max(interval, 1)
-    else:  # wrong
-        progress.sm2_repetitions = 0
-        progress.sm2_interval = 0  # review again today
 
-    # Update easiness factor (EF)
-    ef = progress.easiness_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
-    progress.easiness_factor = max(1.3, ef)
+@lru_cache(maxsize=None)
+def _upsert_statement(dialect: str, recalled: bool):
+    """INSERT ... ON CONFLICT DO UPDATE applying one sm2_step in SQL.
 
-    # Schedule next review
-    progress.next_review_date = today + timedelta(days=progress.sm2_interval)
+    Built once per dialect and outcome; the per-answer values are bind
+    parameters, so each call skips expression building and hits the
+    compiled-statement cache. Executed as Core, which costs a quarter of
+    the ORM-enabled INSERT ... RETURNING path.
+    """
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    p = UserCharacterProgress
+    if recalled:
+        new_repetitions = p.sm2_repetitions + 1
+        scaled = _round_half_even(p.sm2_interval * p.easiness_factor, dialect)
+        new_interval = case(
+            (p.sm2_repetitions == 0, FIRST_INTERVAL),
+            (p.sm2_repetitions == 1, SECOND_INTERVAL),
+            (scaled < 1, 1),
+            (scaled > MAX_INTERVAL, MAX_INTERVAL),
+            else_=scaled,
+        )
+    else:
+        new_repetitions = literal(0)
+        new_interval = literal(0)
+    # Same evaluation order as sm2_step so the floats match bit for bit
+    new_ef = p.easiness_factor + literal(0.1, Float) - bindparam("penalty", type_=Float)
+    today = bindparam("today", type_=String)
+
+    return (
+        insert(p)
+        .values(
+            user_id=bindparam("user_id"),
+            character_id=bindparam("character_id"),
+            correct_count=bindparam("correct"),
+            wrong_count=bindparam("wrong"),
+            easiness_factor=bindparam("ef"),
+            sm2_interval=bindparam("interval"),
+            sm2_repetitions=bindparam("repetitions"),
+            next_review_date=bindparam("next_review_date"),
+            mastery_score=bindparam("mastery"),
+            previous_mastery_score=None,
+            last_seen=bindparam("now"),
+        )
+        .on_conflict_do_update(
+            index_elements=["user_id", "character_id"],
+            set_={
+                "correct_count": p.correct_count + bindparam("correct"),
+                "wrong_count": p.wrong_count + bindparam("wrong"),
+                "easiness_factor": case((new_ef < MIN_EF, MIN_EF), else_=new_ef),
+                "sm2_interval": new_interval,
+                "sm2_repetitions": new_repetitions,
+                "next_review_date": _add_days(today, new_interval, dialect),
+                "mastery_score": _mastery_case(new_repetitions),
+                "previous_mastery_score": func.coalesce(p.mastery_score, 0),
+                "last_seen": bindparam("now"),
+            },
+        )
+        .returning(*p.__table__.columns)
+    )
 
-    # Update display mastery for backward compatibility
-    progress.mastery_score = _mastery_from_repetitions(progress.sm2_repetitions)
 
-    progress.last_seen = datetime.now(timezone.utc)
-    db.flush()
-    return progress
+def update_mastery(
+    db: Session,
+    user_id: int,
+    character_id: int,
+    is_correct: bool,
+    is_first_attempt: bool = True,
+) -> Row:
+    """Update SM-2 spaced repetition data for a user-character pair.
+
+    One INSERT ... ON CONFLICT (user_id, character_id) DO UPDATE statement
+    creates the row or applies sm2_step to it in the database, so there is
+    no read first and two answers for the same character can't race.
+    Works on PostgreSQL and SQLite (3.35+ for RETURNING). Returns the
+    updated row's columns.
+
+    The upsert also records the mastery it replaced, so a change of level
+    is passed on to the user's mastery summary without reading the row.
+    """
+    quality = _quality_from_attempt(is_correct, is_first_attempt)
+    today = date.today()
+    # A new row is one step from the SM-2 starting state
+    ef, interval, repetitions = sm2_step(INITIAL_EF, 0, 0, quality)
+    params = {
+        "user_id": user_id,
+        "character_id": character_id,
+        "correct": int(is_correct),
+        "wrong": int(not is_correct),
+        "ef": ef,
+        "interval": interval,
+        "repetitions": repetitions,
+        "next_review_date": today + timedelta(days=interval),
+        "mastery": _mastery_from_repetitions(repetitions),
+        "now": datetime.now(timezone.utc),
+        "penalty": _ef_penalty(quality),
+        "today": today.isoformat(),
+    }
+    conn = db.connection()
+    row = conn.execute(_upsert_statement(conn.dialect.name, quality >= 3), params).one()
+    if row.previous_mastery_score != row.mastery_score:
+        apply_mastery_change(conn, user_id, row.previous_mastery_score, row.mastery_score)
+    # A copy already loaded in this session is now stale
+    cached = db.identity_map.get(identity_key(UserCharacterProgress, row.id))
+    if cached is not None:
+        db.expire(cached)
+    return row
 
 
 def get_mastery(db: Session, user_id: int, character_id: int) -> int:
@@ -0,0 +1,117 @@
+"""Store catalog: seed reconciliation and an immutable per-worker cache.
+
+STORE_SEED is reconciled into store_items once, from the lifespan hook.
+Reads go through get_catalog(), which serves a frozen snapshot until the
+catalog version is bumped by a write (reconcile_store_seed).
+"""
+from types import MappingProxyType
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.models.store import StoreItem
+
+
+STORE_SEED = [
+    # Car skins
+    {"key": "car_fire_truck", "name": "Fire Truck", "category": "car_skin", "price_coins": 2, "emoji": "\U0001F692"},
+    {"key": "car_ambulance", "name": "Ambulance", "category": "car_skin", "price_coins": 2, "emoji": "\U0001F691"},
+    {"key": "car_tractor", "name": "Tractor", "category": "car_skin", "price_coins": 3, "emoji": "\U0001F69C"},
+    {"key": "car_motorcycle", "name": "Motorcycle", "category": "car_skin", "price_coins": 3, "emoji": "\U0001F3CD\uFE0F"},
+    {"key": "car_pickup", "name": "Pickup Truck", "category": "car_skin", "price_coins": 4, "emoji": "\U0001F6FB"},
+    # Backgrounds
+    {"key": "bg_sunset", "name": "Sunset Road", "category": "background", "price_coins": 2, "emoji": "\U0001F305"},
+    {"key": "bg_rainbow", "name": "Rainbow Road", "category": "background", "price_coins": 3, "emoji": "\U0001F308"},
+    {"key": "bg_moon", "name": "Moon Highway", "category": "background", "price_coins": 3, "emoji": "\U0001F319"},
+    {"key": "bg_volcano", "name": "Volcano Track", "category": "background", "price_coins": 4, "emoji": "\U0001F30B"},
+    {"key": "bg_underwater", "name": "Underwater", "category": "background", "price_coins": 5, "emoji": "\U0001F30A"},
+    # Trail effects
+    {"key": "trail_fire", "name": "Fire Trail", "category": "trail_effect", "price_coins": 2, "emoji": "\U0001F525"},
+    {"key": "trail_stars", "name": "Star Trail", "category": "trail_effect", "price_coins": 2, "emoji": "\u2B50"},
+    {"key": "trail_rainbow", "name": "Rainbow Trail", "category": "trail_effect", "price_coins": 3, "emoji": "\U0001F308"},
+    {"key": "trail_lightning", "name": "Lightning Trail", "category": "trail_effect", "price_coins": 4, "emoji": "\u26A1"},
+    {"key": "trail_sparkle", "name": "Sparkle Trail", "category": "trail_effect", "price_coins": 3, "emoji": "\u2728"},
+]
+
+_SEED_FIELDS = ("name", "category", "price_coins", "emoji")
+
+
+class CatalogItem(NamedTuple):
+    key: str
+    name: str
+    category: str
+    price_coins: int
+    emoji: str | None
+
+
+class Catalog(NamedTuple):
+    version: int
+    items: MappingProxyType                                # key -> CatalogItem
+    by_category: tuple[tuple[str, tuple[CatalogItem, ...]], ...]
+
+
+_catalog_version = 0
+_catalog: Catalog | None = None
+
+
+def bump_catalog_version() -> int:
+    """Invalidate the cached catalog in this worker."""
+    global _catalog_version
+    _catalog_version += 1
+    return _catalog_version
+
+
+def reconcile_store_seed(db: Session) -> int:
+    """Insert missing STORE_SEED items and fix drifted fields. Returns rows changed."""
+    existing = {item.key: item for item in db.query(StoreItem).all()}
+    changed = 0
+    for seed in STORE_SEED:
+        item = existing.get(seed["key"])
+        if item is None:
+            db.add(StoreItem(**seed))
+            changed += 1
+        elif any(getattr(item, f) != seed[f] for f in _SEED_FIELDS):
+            for f in _SEED_FIELDS:
+                setattr(item, f, seed[f])
+            changed += 1
+    if changed:
+        db.commit()
+    # Always invalidate: a reconcile means the worker is (re)starting
+    bump_catalog_version()
+    return changed
+
+
+def _load_catalog(db: Session, version: int) -> Catalog:
+    rows = db.query(StoreItem).order_by(StoreItem.category, StoreItem.price_coins).all()
+    items = {}
+    grouped: dict[str, list[CatalogItem]] = {}
+    for row in rows:
+        item = CatalogItem(row.key, row.name, row.category, row.price_coins, row.emoji)
+        items[item.key] = item
+        grouped.setdefault(item.category, []).append(item)
+    return Catalog(
+        version=version,
+        items=MappingProxyType(items),
+        by_category=tuple((cat, tuple(cat_items)) for cat, cat_items in grouped.items()),
+    )
+
+
+def get_catalog(db: Session) -> Catalog:
+    """Return the cached catalog, reloading only after a version bump."""
+    global _catalog
+    catalog = _catalog
+    if catalog is not None and catalog.version == _catalog_version:
+        return catalog
+
+    catalog = _load_catalog(db, _catalog_version)
+    if not catalog.items:
+        # Lifespan seeding didn't run against this database (e.g. a fresh
+        # DB behind a dependency override); reconcile once and reload
+        reconcile_store_seed(db)
+        catalog = _load_catalog(db, _catalog_version)
+    _catalog = catalog
+    return catalog
+
+
+def get_catalog_item(db: Session, key: str) -> CatalogItem | None:
+    return get_catalog(db).items.get(key)
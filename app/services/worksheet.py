@@ -0,0 +1,148 @@
+"""Printable practice worksheets.
+
+A worksheet has one section per game, each with `count` questions for
+the child. Math comes from math_batch. Logic and English come from the
+registry, which serves the static modes from the question bank. Chinese
+comes from the child's review queue: the same characters a session could
+pick, most urgent first (overdue, new, due soon, later). They use the
+modes that work on paper: picture matching for pre-readers, and
+otherwise character, meaning and pinyin matching.
+
+Sections generate their questions lazily, in order, so the dashboard can
+stream the page through Template.stream without holding the document.
+The Chinese characters are the only database read. They are loaded in
+build_worksheet, because the request's session is closed by the time the
+response streams.
+"""
+import random
+from datetime import date
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.character import Character
+from app.models.progress import UserCharacterProgress
+from app.models.user import User
+from app.services import math_batch
+from app.services.generator_registry import registry
+from app.services.question_generator import _exclude_confusable, review_weight
+from app.services import english_generator, logic_generator  # noqa: registers their generators
+
+WORKSHEET_GAMES = ("chinese", "math", "logic", "english")
+_TITLES = {"chinese": "Chinese 中文", "math": "Math", "logic": "Logic", "english": "English"}
+_PAPER_MODES = {
+    "char_to_meaning": "What does it mean?",
+    "meaning_to_char": "Which character?",
+    "pinyin_to_char": "Which character?",
+}
+_CHUNK = 50   # logic and English questions generated per registry call
+
+
+class WorksheetItem(NamedTuple):
+    prompt: str
+    hint: str
+    options: list[str]
+    answer: str            # option letter
+    images: bool = False   # options are image URLs
+
+
+class Section:
+    """One game's questions; iterating it records the answer key as it goes."""
+
+    def __init__(self, game_type: str, items: Iterable[WorksheetItem]):
+        self.game_type = game_type
+        self.title = _TITLES[game_type]
+        self.answers: list[str] = []
+        self._items = items
+
+    def __iter__(self) -> Iterator[WorksheetItem]:
+        for item in self._items:
+            self.answers.append(item.answer)
+            yield item
+
+
+class Worksheet(NamedTuple):
+    child: User
+    seed: int
+    count: int
+    sections: list[Section]
+
+
+def _item(prompt: str, prompt_text: str, correct: str, options: list[str], images: bool = False) -> WorksheetItem:
+    # "12 + 5 = ?" needs no "What is 12 + 5?" under it
+    restated = prompt_text in (prompt, f"What is {prompt.removesuffix(' = ?')}?")
+    return WorksheetItem(prompt, "" if restated else prompt_text, options, chr(65 + options.index(correct)), images)
+
+
+def _math_items(age: int, count: int, seed: int) -> Iterator[WorksheetItem]:
+    for batch in math_batch.age_batches(age, count, np.random.default_rng(seed)):
+        for expression, prompt_text, _, correct, options in math_batch.rows(batch):
+            yield _item(expression, prompt_text, correct, options)
+
+
+def _generated_items(game_type: str, age: int, count: int, seed: int) -> Iterator[WorksheetItem]:
+    rng = random.Random(seed)
+    for start in range(0, count, _CHUNK):
+        for q in registry.generate(game_type, age, min(_CHUNK, count - start), rng):
+            yield _item(q["expression"], q["prompt_text"], q["correct_answer"], q["options"])
+
+
+def _chinese_items(db: Session, child: User, count: int, seed: int) -> list[WorksheetItem]:
+    is_prereader = (child.age or 5) <= 5
+    query = db.query(Character).filter(
+        Character.target_users.in_(["son", "all"] if is_prereader else ["daughter", "all"])
+    )
+    if is_prereader:
+        query = query.filter(Character.image_url.isnot(None))
+    pool = query.order_by(Character.id).all()
+    if len(pool) < 3:
+        return []
+    progress = {p.character_id: p for p in db.query(UserCharacterProgress).filter_by(user_id=child.id)}
+
+    today = date.today()
+
+    def urgency(char: Character):
+        p = progress.get(char.id)
+        due = p.next_review_date if p and p.next_review_date else today
+        return -review_weight(p, today), due, char.difficulty or 0, char.id
+
+    rng = random.Random(seed)
+    items = []
+    for char in sorted(pool, key=urgency)[:count]:
+        others = [c for c in pool if c.id != char.id]
+        if is_prereader:
+            filtered = _exclude_confusable(char, others)
+            picks = rng.sample(filtered if len(filtered) >= 2 else others, 2)
+            options = [char.image_url] + [c.image_url for c in picks]
+            rng.shuffle(options)
+            items.append(_item(char.character, "Circle the picture", char.image_url, options, images=True))
+            continue
+        mode = rng.choice(list(_PAPER_MODES))
+        picks = rng.sample(others, 2)
+        if mode == "char_to_meaning":
+            prompt, correct, options = char.character, char.meaning, [char.meaning] + [c.meaning for c in picks]
+        else:
+            prompt = char.meaning if mode == "meaning_to_char" else char.pinyin
+            correct, options = char.character, [char.character] + [c.character for c in picks]
+        rng.shuffle(options)
+        items.append(_item(prompt, _PAPER_MODES[mode], correct, options))
+    return items
+
+
+def build_worksheet(db: Session, child: User, count: int, game_types: Iterable[str], seed: int | None = None) -> Worksheet:
+    """A worksheet of `count` questions per game. The same seed prints the same sheet."""
+    seed = random.getrandbits(63) if seed is None else seed
+    age = child.age or 5
+    sections = []
+    for game_type in game_types:
+        if game_type == "chinese":
+            items = _chinese_items(db, child, count, seed)
+        elif game_type == "math":
+            items = _math_items(age, count, seed)
+        elif game_type in registry:
+            items = _generated_items(game_type, age, count, seed)
+        else:
+            raise ValueError(f"Unknown game type: {game_type}")
+        sections.append(Section(game_type, items))
+    return Worksheet(child, seed, count, sections)
@@ -0,0 +1,93 @@
+"""Answer throughput: update_mastery and submit_answer per second.
+
+Runs against a scratch file-backed SQLite database by default, or against
+--url (its tables are created if missing, and the benchmark rows are left
+behind). "sqlite://" takes fsync out of the picture and shows the cost of
+the statements themselves.
+
+    python benchmarks/answer_throughput.py [--answers 1000] [--url URL]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+def _setup(url: str):
+    from app.database import Base
+    from app.models import Character, User
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    chars = [
+        Character(
+            character=chr(0x4E00 + i), pinyin="pin", meaning=f"word{i}", difficulty=1,
+            tags="bench", image_url=f"/static/images/chars/word{i}.svg", target_users="all",
+        )
+        for i in range(200)
+    ]
+    db.add_all(chars)
+    user = User(name=f"bench-{time.time_ns()}", pin="0000", age=8, role="child")
+    db.add(user)
+    db.commit()
+    return engine, db, user, [c.id for c in chars]
+
+
+def bench_update_mastery(db, user, char_ids, answers: int) -> float:
+    from app.services.spaced_repetition import update_mastery
+
+    rng = random.Random(1)
+    user_id = user.id
+    start = time.perf_counter()
+    for _ in range(answers):
+        update_mastery(db, user_id, rng.choice(char_ids), rng.random() < 0.8)
+        db.commit()
+    return answers / (time.perf_counter() - start)
+
+
+def bench_submit_answer(db, user, answers: int) -> float:
+    from app.services.session_engine import complete_session, create_session, submit_answer
+
+    rng = random.Random(2)
+    done = 0
+    start = time.perf_counter()
+    while done < answers:
+        session = create_session(db, user)
+        for q in session.questions:
+            answer = q.correct_answer if rng.random() < 0.8 else "wrong"
+            submit_answer(db, user, q.id, answer)
+            done += 1
+        complete_session(db, user, session.id)
+    return done / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--url", help="database URL (default: scratch SQLite file)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MAX_SESSIONS_PER_DAY", "0")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{tmp}/bench.db"
+        engine, db, user, char_ids = _setup(url)
+        try:
+            mastery = bench_update_mastery(db, user, char_ids, args.answers)
+            answers = bench_submit_answer(db, user, args.answers)
+        finally:
+            db.close()
+            engine.dispose()
+    print(f"update_mastery: {mastery:8.0f} answers/s")
+    print(f"submit_answer:  {answers:8.0f} answers/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Question generation: mode draws and whole questions per second.
+
+For each game and age band, this times --questions mode draws two ways:
+random.choices over the band's mode and weight lists, which is how the
+generators picked modes before the registry, and the registry's alias
+sampler. It then times registry.generate producing --questions complete
+questions. For each static-content mode, it compares the live generator
+with a draw from the precompiled question bank. Finally, for each math
+mode, it compares the scalar generator with math_batch: arrays per
+second, and formatted worksheet rows per second. Last, it builds and
+renders a 500-question worksheet (125 per game) from a scratch database
+seeded with the character catalog.
+
+    python benchmarks/question_generation.py [--questions 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _rate(fn, n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.questions
+
+    from app.services import english_generator, logic_generator, math_generator
+    from app.services.generator_registry import registry
+
+    ages = {"early": 5, "grade2": 7, "grade3": 9}
+    print(f"{'game':<8} {'band':<7} {'choices/s':>12} {'alias/s':>12} {'questions/s':>12}")
+    for module in (math_generator, logic_generator, english_generator):
+        game = module.__name__.rsplit(".", 1)[1].removesuffix("_generator")
+        for band, weights in module.MODE_WEIGHTS.items():
+            random.seed(0)
+            modes, w = list(weights), list(weights.values())
+            choices = _rate(lambda: [random.choices(modes, weights=w, k=1)[0] for _ in range(n)], n)
+            sampler = registry.mode_sampler(game, band)
+            alias = _rate(lambda: sampler.sample_n(n), n)
+            questions = _rate(lambda: registry.generate(game, ages[band], n), n)
+            print(f"{game:<8} {band:<7} {choices:12.0f} {alias:12.0f} {questions:12.0f}")
+
+    from app.services.question_bank import QuestionBank, build_question_bank
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/bank.bin"
+        start = time.perf_counter()
+        entries = build_question_bank(path)
+        print(f"\nbank: {entries} questions built in {time.perf_counter() - start:.2f}s")
+        bank = QuestionBank(path)
+        print(f"{'mode':<20} {'live/s':>12} {'bank/s':>12}")
+        for module in (logic_generator, english_generator):
+            args = (9, random) if module is english_generator else (random,)
+            for mode in module.STATIC_MODES:
+                fn = module._GENERATORS[mode]
+                live = _rate(lambda: [fn(*args) for _ in range(n)], n)
+                banked = _rate(lambda: [bank.draw(mode) for _ in range(n)], n)
+                print(f"{mode:<20} {live:12.0f} {banked:12.0f}")
+
+    from app.services import math_batch
+
+    print(f"\n{'math mode':<22} {'scalar/s':>12} {'arrays/s':>12} {'rows/s':>12}")
+    for mode, fn in math_generator._GENERATORS.items():
+        scalar = _rate(lambda: [fn(random) for _ in range(n)], n)
+        arrays = _rate(lambda: math_batch.generate_batch(mode, n * 10, 0), n * 10)
+        rows = _rate(lambda: list(math_batch.rows(math_batch.generate_batch(mode, n, 0))), n)
+        print(f"{mode:<22} {scalar:12.0f} {arrays:12.0f} {rows:12.0f}")
+
+    _worksheet()
+
+
+def _worksheet() -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import Base
+    from app.models import Character, User
+    from app.routes.dashboard import templates
+    from app.seed.seed_db import _load_chars_data
+    from app.services.worksheet import WORKSHEET_GAMES, build_worksheet
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(Character(**item) for item in _load_chars_data())
+    child = User(name="bench", pin="0000", age=9, role="child")
+    db.add(child)
+    db.commit()
+    template = templates.env.get_template("worksheet.html")
+    print(f"\n{'worksheet':<22} {'ms':>12} {'KB':>12}")
+    for seed in range(3):
+        start = time.perf_counter()
+        html = "".join(template.stream(sheet=build_worksheet(db, child, 125, WORKSHEET_GAMES, seed)))
+        print(f"{'500 questions':<22} {(time.perf_counter() - start) * 1000:12.1f} {len(html) / 1000:12.1f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Question storage: full vs compact generated rows on a synthetic history.
+
+Writes --sessions math, logic and English sessions with full rows
+(options and prompt_data stored) into a scratch SQLite file, then compacts
+them with question_store.compact_questions, which is the path an existing
+database takes. Reports the file size after VACUUM and the bytes per
+session_questions row held in its text columns and seed, before and
+after. It also times
+question_payloads for a cold rebuild and for an LRU hit.
+
+    python benchmarks/question_storage.py [--sessions 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import selectinload, sessionmaker
+
+
+def _history(db, sessions: int) -> None:
+    from app.models import GameSession, User
+    from app.services import english_generator, logic_generator, math_generator  # noqa: registers their generators
+    from app.services.generator_registry import registry
+    from app.services.question_store import add_generated_questions
+
+    rng = random.Random(1)
+    users = [User(name=f"bench-{age}", pin="0000", age=age, role="child") for age in (6, 7, 8, 9)]
+    db.add_all(users)
+    db.flush()
+    for i in range(sessions):
+        user = rng.choice(users)
+        game_type = rng.choice(("math", "logic", "english"))
+        session = GameSession(user_id=user.id, game_type=game_type, seed=rng.getrandbits(63), age=user.age)
+        db.add(session)
+        db.flush()
+        add_generated_questions(db, session, registry.plan(game_type, user.age, 5, random.Random(session.seed)))
+        if i % 1000 == 999:
+            db.commit()
+    db.commit()
+
+
+def _sizes(engine, path: str) -> tuple[int, float]:
+    from app.models import SessionQuestion
+
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+        rows = conn.execute(func.count(SessionQuestion.id).select()).scalar()
+        payload = conn.execute(text(
+            "SELECT sum(length(CAST(options AS BLOB)) + coalesce(length(CAST(prompt_data AS BLOB)), 0)"
+            " + length(correct_answer) + length(question_mode) + coalesce(length(generator_version), 0) + 8)"
+            " FROM session_questions"
+        )).scalar()
+    return os.path.getsize(path), payload / rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20_000)
+    args = parser.parse_args()
+
+    from app.config import get_settings
+    from app.database import Base
+    from app.models import GameSession
+    from app.services import question_store
+
+    settings = get_settings()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/bench.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+
+        settings.compact_generated_questions = False
+        start = time.perf_counter()
+        _history(db, args.sessions)
+        print(f"history: {args.sessions} sessions written in {time.perf_counter() - start:.1f}s")
+        full_file, full_row = _sizes(engine, path)
+
+        start = time.perf_counter()
+        report = question_store.compact_questions(db)
+        elapsed = time.perf_counter() - start
+        compact_file, compact_row = _sizes(engine, path)
+        print(f"compacted: {report['compacted']} rows ({report['mismatched']} mismatched) in {elapsed:.1f}s")
+        print(f"{'':<10} {'file MB':>10} {'row bytes':>10}")
+        print(f"{'full':<10} {full_file / 1e6:10.2f} {full_row:10.1f}")
+        print(f"{'compact':<10} {compact_file / 1e6:10.2f} {compact_row:10.1f}")
+        print(f"saved:     {1 - compact_file / full_file:10.1%} {1 - compact_row / full_row:10.1%}")
+
+        sample = (
+            db.query(GameSession).options(selectinload(GameSession.questions))
+            .order_by(GameSession.id).limit(1000).all()
+        )
+        question_store._rebuilt.clear()
+        settings.rebuilt_session_cache_size = len(sample)
+        for label in ("cold", "LRU hit"):
+            start = time.perf_counter()
+            for session in sample:
+                question_store.question_payloads(session)
+            per = (time.perf_counter() - start) / len(sample) * 1e6
+            print(f"question_payloads {label:<8} {per:8.1f} us/session")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Session lifecycle: latency, SQL statements and memory per request, end to end.
+
+Drives the real app through TestClient the way a child plays Chinese.
+Each iteration logs in, opens the game selector, starts /game/chinese,
+answers its 5 questions (about 1 in 5 wrong), completes the session and
+opens the session-complete page. Then the parent opens the dashboard.
+The child's history grows from one iteration to the next, as it does in
+real use. For each step it reports p50/p95 latency, the median number of
+SQL statements per request, and the median peak of traced Python
+allocations per request. The memory figures come from a separate, shorter
+pass under tracemalloc, so the tracing overhead doesn't skew the timings.
+
+TestClient runs background tasks before it returns, so "login" and
+"complete" include the session pool refill. Use --no-pool to measure
+without it.
+
+By default the app runs against a scratch SQLite file seeded with the
+character catalog. --url points it at another database, such as a local
+PostgreSQL. Its tables are created if missing, the catalog is seeded if
+empty, and the benchmark's users and sessions are left behind.
+
+--save writes the results to the baseline for the database's dialect.
+--compare checks the results against that baseline and exits 1 when a
+step runs more SQL statements than before, or when its p50 latency or
+peak memory grows by more than --tolerance. Statement counts carry over
+between machines, but latencies don't: save a local baseline before
+comparing timings. Counts also depend on how much history the run builds
+up, so --compare refuses a run whose --iterations, --age or --no-pool
+differ from the baseline's.
+
+    python benchmarks/session_lifecycle.py [--iterations 30] [--url URL] [--save | --compare]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from statistics import median, median_low
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.orm import sessionmaker
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+STEPS = ("login", "selector", "start", "answer", "complete", "session_complete", "dashboard")
+PARENT_PIN = "bench"
+
+
+class _Recorder:
+    """Times requests and counts the SQL statements each one runs."""
+
+    def __init__(self, engine):
+        self.samples: dict[str, list[tuple[float, int, int | None]]] = defaultdict(list)
+        self._statements = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args) -> None:
+        self._statements += 1
+
+    def __call__(self, step: str, send):
+        statements = self._statements
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        resp = send()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - base if tracing else None
+        if resp.status_code >= 400:
+            raise RuntimeError(f"{step}: HTTP {resp.status_code} {resp.text[:200]}")
+        self.samples[step].append((elapsed, self._statements - statements, peak))
+        return resp
+
+
+def _setup(url: str, age: int):
+    from app.database import Base
+    from app.models import Character, User
+    from app.seed.seed_db import _load_chars_data
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    if not db.query(Character.id).first():
+        db.add_all(Character(**item) for item in _load_chars_data())
+    child = User(name=f"bench-{time.time_ns()}", pin="0000", age=age, theme="racing", role="child")
+    db.add(child)
+    if not db.query(User.id).filter_by(role="parent", pin=PARENT_PIN).first():
+        db.add(User(name="bench-parent", pin=PARENT_PIN, theme="racing", role="parent"))
+    db.commit()
+    child_id = child.id
+    db.close()
+    return engine, child_id
+
+
+def _client(engine):
+    from starlette.testclient import TestClient
+
+    from app.database import get_db
+    from app.main import create_app
+
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def override_get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app, follow_redirects=False)
+
+
+def _play(client, record: _Recorder, child_id: int, rng: random.Random) -> None:
+    record("login", lambda: client.post("/login", data={"user_id": child_id}))
+    record("selector", lambda: client.get("/game/"))
+    html = record("start", lambda: client.get("/game/chinese")).text
+    questions = json.loads(re.search(r"window\.questionsData\s*=\s*(\[.*?\]);", html, re.DOTALL).group(1))
+    session_id = int(re.search(r"window\.sessionId\s*=\s*(\d+);", html).group(1))
+    for q in questions:
+        answer = q["correct_answer"] if rng.random() < 0.8 else next(o for o in q["options"] if o != q["correct_answer"])
+        record("answer", lambda: client.post("/game/answer", json={"question_id": q["id"], "selected_answer": answer}))
+    record("complete", lambda: client.post(f"/game/complete/{session_id}"))
+    record("session_complete", lambda: client.get(f"/game/session-complete/{session_id}"))
+    client.get("/logout")
+    client.post("/login/parent", data={"pin": PARENT_PIN})
+    record("dashboard", lambda: client.get("/dashboard/"))
+    client.get("/logout")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _run(engine, child_id: int, iterations: int, alloc_iterations: int) -> dict:
+    client = _client(engine)
+    random.seed(0)   # session seeds and lucky stars, so statement counts repeat between runs
+    rng = random.Random(0)
+    _play(client, _Recorder(engine), child_id, rng)   # warm-up: template compiles, first-use imports
+
+    timed = _Recorder(engine)
+    for _ in range(iterations):
+        _play(client, timed, child_id, rng)
+    traced = _Recorder(engine)
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            _play(client, traced, child_id, rng)
+    finally:
+        tracemalloc.stop()
+
+    steps = {}
+    for step in STEPS:
+        seconds = [s for s, _, _ in timed.samples[step]]
+        peaks = [p for _, _, p in traced.samples[step]]
+        steps[step] = {
+            "p50_ms": round(_percentile(seconds, 0.5) * 1000, 2),
+            "p95_ms": round(_percentile(seconds, 0.95) * 1000, 2),
+            "statements": median_low(n for _, n, _ in timed.samples[step]),
+            "peak_kib": round(median(peaks) / 1024, 1) if peaks else None,
+        }
+    return {"dialect": engine.dialect.name, "iterations": iterations, "steps": steps}
+
+
+def _regressions(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+    for step, now in result["steps"].items():
+        was = baseline["steps"].get(step)
+        if was is None:
+            continue
+        if now["statements"] > was["statements"]:
+            found.append(f"{step}: {was['statements']} -> {now['statements']} SQL statements")
+        for key, label in (("p50_ms", "p50 ms"), ("peak_kib", "peak KiB")):
+            if now[key] is not None and was[key] and now[key] > was[key] * (1 + tolerance):
+                found.append(f"{step}: {label} {was[key]} -> {now[key]}")
+    return found
+
+
+def _report(result: dict, baseline: dict | None) -> None:
+    def cell(step: str, key: str) -> str:
+        now = result["steps"][step][key]
+        was = baseline["steps"].get(step, {}).get(key) if baseline else None
+        if was in (None, 0) or now is None:
+            return f"{now}"
+        return f"{now} ({(now - was) / was:+.0%})"
+
+    print(f"{result['dialect']}, {result['iterations']} iterations"
+          + (" (change vs baseline in brackets)" if baseline else ""))
+    print(f"{'step':<18} {'p50 ms':>16} {'p95 ms':>16} {'statements':>14} {'peak KiB':>16}")
+    for step in STEPS:
+        print(f"{step:<18} {cell(step, 'p50_ms'):>16} {cell(step, 'p95_ms'):>16} "
+              f"{cell(step, 'statements'):>14} {cell(step, 'peak_kib'):>16}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--alloc-iterations", type=int, default=3)
+    parser.add_argument("--age", type=int, default=9, help="the child's age; 5 or under plays picture modes")
+    parser.add_argument("--url", help="database to run against (default: a scratch SQLite file)")
+    parser.add_argument("--no-pool", action="store_true", help="generate every session on demand")
+    parser.add_argument("--baseline", help="baseline file (default: baselines/session_lifecycle_<dialect>.json)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="write the results as the baseline")
+    mode.add_argument("--compare", action="store_true", help="exit 1 on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50/peak growth in --compare")
+    args = parser.parse_args()
+
+    from app.config import get_settings
+
+    settings = get_settings()
+    settings.max_sessions_per_day = 0
+    settings.session_pool = not args.no_pool
+
+    dialect = make_url(args.url).get_backend_name() if args.url else "sqlite"
+    path = args.baseline or os.path.join(BASELINE_DIR, f"session_lifecycle_{dialect}.json")
+    run = {"iterations": args.iterations, "age": args.age, "pool": not args.no_pool}
+    baseline = None
+    if args.compare:
+        with open(path) as f:
+            baseline = json.load(f)
+        differs = [f"{key}={baseline.get(key)}" for key, value in run.items() if baseline.get(key) != value]
+        if differs:
+            parser.error(f"{path} was saved with {', '.join(differs)}; rerun with the same settings to compare")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, child_id = _setup(args.url or f"sqlite:///{tmp}/bench.db", args.age)
+        result = _run(engine, child_id, args.iterations, args.alloc_iterations)
+        engine.dispose()
+    result.update(run)
+    _report(result, baseline)
+
+    if args.save:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {path}")
+    if baseline is not None:
+        regressions = _regressions(result, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
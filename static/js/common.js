@@ -106,13 +106,14 @@
         });
     }
 
-    function _queueForSync(url, method, body) {
+    function _queueForSync(url, method, body, idempotencyKey) {
         _openSyncDB().then(function (db) {
             var tx = db.transaction('sync_queue', 'readwrite');
             tx.objectStore('sync_queue').add({
                 url: url,
                 method: method,
                 body: body,
+                idempotencyKey: idempotencyKey || null,
                 timestamp: Date.now()
             });
             tx.oncomplete = function () { db.close(); };
@@ -141,6 +142,8 @@
      * @param {string}  url
      * @param {Object}  options          Standard fetch options
      * @param {Object}  [options.body]   Will be JSON.stringified automatically
+     * @param {string}  [options.idempotencyKey]  Sent as Idempotency-Key so
+     *                                   retries replay instead of re-running
      * @returns {Promise<Object>}        Parsed JSON body
      */
     function apiFetch(url, options) {
@@ -157,6 +160,10 @@
             headers['X-CSRF-Token'] = csrf;
         }
 
+        if (options.idempotencyKey) {
+            headers['Idempotency-Key'] = options.idempotencyKey;
+        }
+
         /* Merge caller headers */
         if (options.headers) {
             var custom = options.headers;
@@ -200,7 +207,7 @@
                     var method = (options.method || 'GET').toUpperCase();
                     if (method === 'POST' && options.body) {
                         var bodyStr = typeof options.body === 'string' ? options.body : JSON.stringify(options.body);
-                        _queueForSync(url, method, bodyStr);
+                        _queueForSync(url, method, bodyStr, options.idempotencyKey);
                         showError('Saved offline. Will sync when connected.');
                     } else {
                         showError('Network error. Check your connection.');
@@ -215,6 +222,16 @@
        Public API Helpers
        ────────────────────────────────────────────── */
 
+    /**
+     * A fresh key per user action; retries of that action reuse it.
+     */
+    function newRequestKey() {
+        if (root.crypto && root.crypto.randomUUID) {
+            return root.crypto.randomUUID();
+        }
+        return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2, 12);
+    }
+
     /**
      * Submit an answer for a question.
      *
@@ -231,7 +248,8 @@
             body: {
                 question_id: questionId,
                 selected_answer: selectedAnswer
-            }
+            },
+            idempotencyKey: newRequestKey()
         });
     }
 
@@ -244,8 +262,10 @@
      * @returns {Promise<Object>}  SessionSummary
      */
     function completeSession(sessionId) {
+        /* One completion per session, so the key is stable across reloads */
         return apiFetch('/game/complete/' + sessionId, {
-            method: 'POST'
+            method: 'POST',
+            idempotencyKey: 'complete-' + sessionId
         });
     }
 
@@ -259,7 +279,10 @@
      * POST /game/buy-streak-freeze
      */
     function buyStreakFreeze() {
-        return apiFetch('/game/buy-streak-freeze', { method: 'POST' });
+        return apiFetch('/game/buy-streak-freeze', {
+            method: 'POST',
+            idempotencyKey: newRequestKey()
+        });
     }
 
     /**
@@ -269,7 +292,8 @@
     function buyStoreItem(itemKey) {
         return apiFetch('/game/store/buy', {
             method: 'POST',
-            body: { item_key: itemKey }
+            body: { item_key: itemKey },
+            idempotencyKey: newRequestKey()
         });
     }
 
@@ -287,6 +311,7 @@
     root.SkoolAPI = {
         getCSRFToken: getCSRFToken,
         apiFetch: apiFetch,
+        newRequestKey: newRequestKey,
         postAnswer: postAnswer,
         completeSession: completeSession,
         buyStreakFreeze: buyStreakFreeze,
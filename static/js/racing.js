@@ -990,11 +990,23 @@
             root.SkoolMusic.pickRandomMood();
         }
 
+        /* Resumed sessions pick up at the first question not yet answered correctly */
+        currentIndex = Math.min(root.startIndex || 0, totalQuestions);
+
         /* Set initial car position */
-        moveCarToStop(0);
+        moveCarToStop(currentIndex);
+        if (progressBarFill && currentIndex > 0) {
+            progressBarFill.style.width = (currentIndex / totalQuestions * 100) + '%';
+        }
+
+        if (currentIndex >= totalQuestions) {
+            /* Every answer is in; only the completion call was lost */
+            finishRace();
+            return;
+        }
 
-        /* Render first question (renderQuestion handles auto-speak) */
-        renderQuestion(0);
+        /* Render current question (renderQuestion handles auto-speak) */
+        renderQuestion(currentIndex);
     }
 
     /* Wait for DOM */
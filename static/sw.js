@@ -1,4 +1,4 @@
-const CACHE_NAME = 'skool-v5';
+const CACHE_NAME = 'skool-v8';
 
 // Only precache essential assets — SVG images are cached on first use
 // via the /static/ cache-first strategy (much faster install)
@@ -123,9 +123,13 @@ async function replayQueue() {
 
   for (const item of items) {
     try {
+      const headers = { 'Content-Type': 'application/json', 'Accept': 'application/json' };
+      if (item.idempotencyKey) {
+        headers['Idempotency-Key'] = item.idempotencyKey;
+      }
       const response = await fetch(item.url, {
         method: item.method,
-        headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+        headers,
         credentials: 'same-origin',
         body: item.body,
       });
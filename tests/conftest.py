@@ -1,3 +1,4 @@
+import os
 import random
 
 import pytest
@@ -30,6 +31,29 @@ def _unlimited_sessions():
 from app.main import create_app
 
 
+@pytest.fixture
+def no_lucky_star(monkeypatch):
+    """For tests that count exact points; the seeded stream alone doesn't rule lucky stars out."""
+    from app.config import get_settings
+    monkeypatch.setattr(get_settings(), "lucky_star_chance", 0.0)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_forecasts():
+    """Forecasts are cached per user id, which every test database reuses."""
+    from app.services import forecast
+    forecast._forecasts.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rebuilt_sessions():
+    """Rebuilt questions are cached by seed, and the seeded random repeats seeds across tests."""
+    from app.services import question_store
+    question_store._rebuilt.clear()
+    yield
+
+
 @pytest.fixture
 def db_engine():
     engine = create_engine("sqlite:///:memory:")
@@ -38,6 +62,24 @@ def db_engine():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def pg_engine():
+    """A scratch PostgreSQL schema, for tests that need the real planner.
+
+    Skipped unless TEST_POSTGRES_URL points at a database the tests may
+    create and drop tables in.
+    """
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
 @pytest.fixture
 def db(db_engine):
     Session = sessionmaker(bind=db_engine)
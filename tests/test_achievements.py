@@ -59,3 +59,27 @@ def test_badges_not_awarded_twice(db, sample_user, sample_characters):
     assert "first_session" in {b["key"] for b in first["new_badges"]}
     _, second = _complete_perfect_session(db, sample_user)
     assert "first_session" not in {b["key"] for b in second["new_badges"]}
+
+
+def test_game_type_counter_drives_count_badges(db, sample_user, sample_characters):
+    from app.models.stats import UserGameStats
+
+    for _ in range(9):
+        _, summary = _complete_perfect_session(db, sample_user)
+        assert "bookworm" not in {b["key"] for b in summary["new_badges"]}
+    _, summary = _complete_perfect_session(db, sample_user)
+    assert "bookworm" in {b["key"] for b in summary["new_badges"]}
+
+    stats = db.query(UserGameStats).filter_by(user_id=sample_user.id, game_type="chinese").one()
+    assert stats.sessions_completed == 10
+
+
+def test_completion_only_evaluates_rules_for_its_events(db, sample_user, sample_characters):
+    from app.services.achievements import _RULES_BY_EVENT, completion_events
+
+    session = create_session(db, sample_user)
+    events = completion_events(session, is_perfect=False)
+    keys = {key for e in events for key, _ in _RULES_BY_EVENT[e]}
+    assert "bookworm" in keys
+    assert "math_whiz" not in keys and "polyglot" not in keys
+    assert "perfect_5" not in keys
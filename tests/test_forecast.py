@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.models.progress import UserCharacterProgress
+from app.services.forecast import MAX_FORECAST_DAYS, review_forecast
+from app.services.session_engine import create_session, submit_answer
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_forecast_histogram_from_one_query(db, db_engine, sample_user, sample_characters):
+    today = date.today()
+    offsets = [-5, -1, 0, 0, 1, 7, 8, 30, MAX_FORECAST_DAYS, MAX_FORECAST_DAYS + 1, None]
+    for char, offset in zip(sample_characters, offsets):
+        due = None if offset is None else today + timedelta(days=offset)
+        db.add(UserCharacterProgress(user_id=sample_user.id, character_id=char.id, next_review_date=due))
+    db.commit()
+    user_id = sample_user.id
+    statements = _count_statements(db_engine)
+
+    forecast = review_forecast(db, user_id)
+
+    assert len(statements) == 1
+    assert forecast.overdue == 2
+    assert len(forecast.counts) == MAX_FORECAST_DAYS + 1
+    assert {i: n for i, n in enumerate(forecast.counts) if n} == {0: 2, 1: 1, 7: 1, 8: 1, 30: 1, MAX_FORECAST_DAYS: 1}
+    # The dashboard's review cards
+    assert forecast.due_by(0) == 4
+    assert forecast.counts[1] == 1
+    assert forecast.due_by(7) == 6
+    assert forecast.horizon(30)[-1] == 1
+
+
+def test_forecast_is_cached_until_the_next_answer(db, db_engine, sample_user, sample_characters):
+    session = create_session(db, sample_user)
+    assert review_forecast(db, sample_user.id).due_by(MAX_FORECAST_DAYS) == 0
+    statements = _count_statements(db_engine)
+    assert review_forecast(db, sample_user.id).due_by(MAX_FORECAST_DAYS) == 0
+    assert statements == []
+
+    q = session.questions[0]
+    submit_answer(db, sample_user, q.id, "wrong")
+
+    assert review_forecast(db, sample_user.id).due_by(0) == 1
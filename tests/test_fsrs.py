@@ -0,0 +1,123 @@
+import json
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.models.progress import UserCharacterProgress
+from app.models.scheduler import SchedulerParams
+from app.services import fsrs
+from app.services.scheduler import set_scheduler
+from app.services.session_engine import complete_session, create_session, submit_answer
+from app.services.sm2_batch import ReviewEvents
+
+
+def _events(rng, true_weights, characters=60, days=60, per_day=25):
+    """Reviews of a learner whose memory follows true_weights exactly."""
+    state = {}
+    chars, quality, day_ordinals = [], [], []
+    for day in range(days):
+        for cid in rng.choice(characters, size=per_day, replace=False):
+            if cid not in state:
+                recalled = rng.random() < 0.5
+                s, d = fsrs._initial_state(true_weights, recalled)
+            else:
+                s, d, last = state[cid]
+                recalled = rng.random() < fsrs.retrievability(day - last, s)
+                s, d, _ = fsrs._next_state(true_weights, s, d, day - last, recalled)
+            state[cid] = (float(s), float(d), day)
+            chars.append(cid)
+            quality.append(5 if recalled else 1)
+            day_ordinals.append(date(2026, 1, 1).toordinal() + day)
+    days_arr = np.array(day_ordinals)
+    return ReviewEvents(np.array(chars), np.array(quality), days_arr, np.zeros(len(days_arr), dtype="datetime64[us]")), state
+
+
+def test_batch_run_matches_scalar_steps():
+    events, state = _events(np.random.default_rng(1), fsrs.DEFAULT_WEIGHTS)
+    h = fsrs._history(events)
+    _, _, s, d, _ = fsrs._run(np.array([fsrs.DEFAULT_WEIGHTS]), h)
+    for i, cid in enumerate(h.character_id):
+        assert np.isclose(s[0, i], state[cid][0], rtol=1e-12)
+        assert np.isclose(d[0, i], state[cid][1], rtol=1e-12)
+
+
+def test_fit_beats_default_weights_on_a_different_learner():
+    true = fsrs.DEFAULT_WEIGHTS._replace(s0_recalled=1.0, recall_scale=0.8, forget_scale=0.8)
+    events, _ = _events(np.random.default_rng(2), true)
+
+    result = fsrs.fit_weights(events, iterations=80)
+
+    true_loss, scored, *_ = fsrs._run(np.array([true]), fsrs._history(events))
+    assert scored == result.review_count > 1000
+    assert result.log_loss < result.default_log_loss - 0.02
+    assert result.log_loss < true_loss[0] / scored + 0.02
+
+    few = fsrs.fit_weights(events, min_reviews=10 ** 6)
+    assert few.weights == fsrs.DEFAULT_WEIGHTS
+
+
+def _play(db, user, wrong_first=()):
+    session = create_session(db, user)
+    for q in session.questions:
+        if q.character_id in wrong_first:
+            submit_answer(db, user, q.id, "wrong")
+        submit_answer(db, user, q.id, q.correct_answer)
+    complete_session(db, user, session.id)
+    return session
+
+
+def _due_dates(db, user_id):
+    return {
+        p.character_id: p.next_review_date
+        for p in db.query(UserCharacterProgress).filter_by(user_id=user_id).populate_existing()
+    }
+
+
+def test_fsrs_answers_schedule_by_stability_and_retries_keep_state(db, sample_user, sample_characters):
+    set_scheduler(db, sample_user, "fsrs")
+    session = create_session(db, sample_user)
+    first, second = session.questions[0], session.questions[1]
+    submit_answer(db, sample_user, first.id, first.correct_answer)
+    submit_answer(db, sample_user, second.id, "wrong")
+    before = db.query(UserCharacterProgress).filter_by(user_id=sample_user.id, character_id=second.character_id).one()
+    state = (before.fsrs_stability, before.fsrs_difficulty, before.next_review_date)
+    submit_answer(db, sample_user, second.id, second.correct_answer)
+
+    rows = {
+        p.character_id: p
+        for p in db.query(UserCharacterProgress).filter_by(user_id=sample_user.id).populate_existing()
+    }
+    w = fsrs.DEFAULT_WEIGHTS
+    recalled = rows[first.character_id]
+    assert recalled.fsrs_stability == w.s0_recalled
+    assert recalled.next_review_date == date.today() + timedelta(days=fsrs.next_interval(w.s0_recalled, 0.9))
+    # The retry moved the SM-2 bookkeeping but not the FSRS schedule
+    retried = rows[second.character_id]
+    assert (retried.fsrs_stability, retried.fsrs_difficulty, retried.next_review_date) == state
+    assert retried.correct_count == 1 and retried.wrong_count == 1
+
+
+def test_switching_schedulers_reschedules_and_switching_back_restores_sm2(db, sample_user, sample_characters):
+    for i in range(6):
+        _play(db, sample_user, wrong_first={sample_characters[i].id})
+    sm2_due = _due_dates(db, sample_user.id)
+
+    set_scheduler(db, sample_user, "fsrs")
+    rows = db.query(UserCharacterProgress).filter_by(user_id=sample_user.id).populate_existing().all()
+    assert all(p.fsrs_stability is not None for p in rows)
+    params = db.get(SchedulerParams, (sample_user.id, "fsrs"))
+    assert json.loads(params.weights) == list(fsrs.DEFAULT_WEIGHTS)  # too few reviews to fit
+
+    set_scheduler(db, sample_user, "sm2")
+    assert _due_dates(db, sample_user.id) == sm2_due
+
+
+def test_fit_due_users_refits_only_stale_fsrs_users(db, sample_user, sample_characters):
+    _play(db, sample_user)
+    assert fsrs.fit_due_users(db, timedelta(hours=24), limit=10) == 0
+
+    sample_user.scheduler = "fsrs"
+    db.commit()
+    assert fsrs.fit_due_users(db, timedelta(hours=24), limit=10) == 1
+    assert fsrs.fit_due_users(db, timedelta(hours=24), limit=10) == 0
+    assert fsrs.fit_due_users(db, timedelta(0), limit=10) == 1
@@ -0,0 +1,81 @@
+import random
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import english_generator, logic_generator, math_generator
+from app.services.generator_registry import AGE_BANDS, AliasSampler, age_band, registry
+from app.services.question_generator import pick_question_mode
+
+
+def test_alias_table_reproduces_weights():
+    sampler = AliasSampler(["a", "b", "c", "d"], [40, 35, 25, 0])
+    assert sampler.probabilities() == pytest.approx({"a": 0.40, "b": 0.35, "c": 0.25, "d": 0.0})
+
+    counts = Counter(sampler.sample_n(20_000, random.Random(3)))
+    assert counts["d"] == 0
+    assert counts["a"] / 20_000 == pytest.approx(0.40, abs=0.02)
+
+
+@pytest.mark.parametrize("module", [math_generator, logic_generator, english_generator])
+def test_each_band_generates_only_its_modes(module):
+    game = module.__name__.rsplit(".", 1)[1].removesuffix("_generator")
+    assert set(module.MODE_WEIGHTS) == set(AGE_BANDS)
+    for age in (4, 5, 6, 7, 8, 10):
+        questions = registry.generate(game, age, 60)
+        assert len(questions) == 60
+        assert {q["mode"] for q in questions} <= set(module.MODE_WEIGHTS[age_band(age)])
+        assert all(q["correct_answer"] in q["options"] for q in questions)
+
+
+def test_chinese_modes_follow_reading_ability():
+    single = SimpleNamespace(character="水", image_url="/static/images/chars/water.svg")
+    compound = SimpleNamespace(character="月亮", image_url=None)
+    assert {pick_question_mode(True, single) for _ in range(20)} == {"char_to_image"}
+    assert pick_question_mode(True, compound) == "char_to_meaning"
+    assert "fill_in_blank" not in {pick_question_mode(False, single) for _ in range(200)}
+    assert "fill_in_blank" in {pick_question_mode(False, compound) for _ in range(200)}
+
+
+def test_seeded_generation_is_the_same_in_every_process():
+    # String sets iterate in a per-process hash order, so they must not decide a question
+    script = (
+        "from app.services.session_engine import generated_questions; "
+        "print([q['prompt_data'] + repr(q['options']) for g in ('math', 'logic', 'english') "
+        "for age in (5, 7, 9) for q in generated_questions(g, age, 40, 1234)])"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parents[1], env={"PYTHONHASHSEED": str(hash_seed)},
+        ).stdout
+        for hash_seed in (1, 2)
+    }
+    assert len(outputs) == 1
+
+
+def test_misspelling_bank_covers_spelling_words_with_plausible_variants():
+    words = english_generator._SIGHT_WORDS_EASY + english_generator._SIGHT_WORDS_MEDIUM + [
+        w for table in (english_generator._VOCABULARY, english_generator._VOCABULARY_HARD) for w, _ in table
+    ]
+    for word in words:
+        variants = english_generator._MISSPELLINGS[word]
+        assert len(variants) >= 2 and len(set(variants)) == len(variants)
+        assert not set(variants) & english_generator._KNOWN_WORDS
+        assert all(english_generator._edit_distance(word, v) <= 2 for v in variants)
+
+
+def test_new_words_get_misspellings_on_first_use():
+    assert "wonderful" not in english_generator._MISSPELLINGS
+    picked = english_generator._make_misspellings("wonderful", 2, random.Random(0))
+    assert set(picked) <= set(english_generator._MISSPELLINGS.pop("wonderful"))
+    assert "wonderful" not in picked
+    # A short word has few one-edit misspellings, but still enough to pick from
+    assert "I" not in english_generator._MISSPELLINGS
+    picked = english_generator._make_misspellings("I", 2, random.Random(0))
+    assert len(set(picked)) == 2 and "I" not in picked
+    assert len(english_generator._MISSPELLINGS.pop("I")) == english_generator._MISSPELLINGS_PER_WORD
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from app.config import get_settings
+from app.models.idempotency import IdempotencyKey
+from app.models.session import GameSession, SessionQuestion
+from app.services.janitor import acquire_lease, purge_abandoned_sessions, run_janitor
+from app.services.session_engine import create_session, submit_answer, complete_session
+
+
+def _age(session, hours):
+    session.started_at = datetime.utcnow() - timedelta(hours=hours)
+
+
+def test_purges_only_old_unfinished_sessions(db, sample_user, sample_characters):
+    settings = get_settings()
+    old_open = create_session(db, sample_user)
+    fresh_open = create_session(db, sample_user)
+    old_done = create_session(db, sample_user)
+    for q in old_done.questions:
+        submit_answer(db, sample_user, q.id, q.correct_answer)
+    complete_session(db, sample_user, old_done.id)
+    _age(old_open, settings.abandoned_session_hours + 1)
+    _age(old_done, settings.abandoned_session_hours + 1)
+    db.commit()
+    old_open_id = old_open.id
+
+    report = run_janitor(db, holder="test")
+
+    assert report["abandoned_sessions"] == 1
+    assert report["session_questions"] == 5
+    remaining = {s.id for s in db.query(GameSession).all()}
+    assert remaining == {fresh_open.id, old_done.id}
+    assert db.query(SessionQuestion).filter_by(session_id=old_open_id).count() == 0
+
+
+def test_purge_runs_in_bounded_batches(db, sample_user, sample_characters):
+    for _ in range(5):
+        _age(create_session(db, sample_user), 48)
+    db.commit()
+
+    first = purge_abandoned_sessions(db, timedelta(hours=24), batch_size=2, max_batches=2)
+    assert first["sessions"] == 4
+    second = purge_abandoned_sessions(db, timedelta(hours=24), batch_size=2, max_batches=2)
+    assert second["sessions"] == 1
+
+
+def test_lease_keeps_a_second_worker_out(db, sample_user):
+    assert acquire_lease(db, "janitor", "worker-a", timedelta(minutes=5)) is True
+    assert run_janitor(db, holder="worker-b") is None
+    assert acquire_lease(db, "janitor", "worker-a", timedelta(minutes=5)) is True  # renewal
+
+
+def test_stale_idempotency_keys_are_removed(db, sample_user):
+    settings = get_settings()
+    db.add(IdempotencyKey(
+        user_id=sample_user.id, key="old", endpoint="store_buy", status_code=200, response="{}",
+        created_at=datetime.utcnow() - timedelta(days=settings.idempotency_key_days + 1),
+    ))
+    db.add(IdempotencyKey(user_id=sample_user.id, key="new", endpoint="store_buy", status_code=200, response="{}"))
+    db.commit()
+
+    report = run_janitor(db, holder="test")
+
+    assert report["idempotency_keys"] == 1
+    assert [k.key for k in db.query(IdempotencyKey).all()] == ["new"]
@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.learner_simulator import SimConfig, run_config, selection_weights
+from app.services.question_generator import review_weight
+
+SMALL = SimConfig(days=20, catalog_size=40)
+
+
+def test_selection_weights_match_review_weight():
+    today = date(2026, 1, 10)
+    offsets = [-3, 0, 1, 2, 3, 30]
+    seen = np.array([False] + [True] * len(offsets))
+    next_day = np.array([0] + offsets)
+
+    expected = [review_weight(None, today)] + [
+        review_weight(SimpleNamespace(next_review_date=today + timedelta(days=d)), today) for d in offsets
+    ]
+    assert selection_weights(seen, next_day, 0).tolist() == expected
+
+
+def test_runs_are_reproducible_across_workers():
+    inline = run_config(SMALL, learners=4, seed=7, workers=1)
+    assert run_config(SMALL, learners=4, seed=7, workers=1) == inline
+    assert run_config(SMALL, learners=4, seed=7, workers=2) == inline
+
+
+def test_longer_sessions_reach_more_of_the_catalog():
+    short = run_config(SMALL._replace(questions_per_session=3), learners=8, workers=1)
+    long = run_config(SMALL._replace(questions_per_session=8), learners=8, workers=1)
+    assert long["coverage"][0] > short["coverage"][0]
+    assert long["questions_per_day"][0] > short["questions_per_day"][0]
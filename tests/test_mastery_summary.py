@@ -0,0 +1,74 @@
+import random
+
+from sqlalchemy import func
+
+from app.main import _run_migrations
+from app.models.progress import UserCharacterProgress, UserMasterySummary
+from app.services.mastery_summary import check_mastery_summaries, get_mastery_summary
+from app.services.session_engine import complete_session, create_session, submit_answer
+from app.services.sm2_batch import rebuild_progress
+
+
+def _levels_from_rows(db, user_id):
+    levels = [0] * 6
+    for mastery, n in (
+        db.query(UserCharacterProgress.mastery_score, func.count())
+        .filter_by(user_id=user_id)
+        .group_by(UserCharacterProgress.mastery_score)
+    ):
+        levels[mastery] = n
+    return levels
+
+
+def test_summary_follows_every_answer(db, sample_user, sample_characters):
+    rng = random.Random(9)
+    for _ in range(15):
+        session = create_session(db, sample_user)
+        for q in session.questions:
+            if rng.random() < 0.3:
+                submit_answer(db, sample_user, q.id, "wrong")
+                if rng.random() < 0.5:
+                    submit_answer(db, sample_user, q.id, q.correct_answer)
+            else:
+                submit_answer(db, sample_user, q.id, q.correct_answer)
+        complete_session(db, sample_user, session.id)
+
+    summary = db.get(UserMasterySummary, sample_user.id)
+    db.refresh(summary)
+    assert summary.levels == _levels_from_rows(db, sample_user.id)
+    assert summary.character_count == len(sample_characters)
+    avg = db.query(func.avg(UserCharacterProgress.mastery_score)).filter_by(user_id=sample_user.id).scalar()
+    assert summary.average == avg
+    assert check_mastery_summaries(db, repair=False) == []
+
+    rebuild_progress(db, sample_user.id)
+    assert check_mastery_summaries(db, repair=False) == []
+
+
+def test_checker_repairs_drifted_and_missing_summaries(db, sample_user, sample_characters):
+    session = create_session(db, sample_user)
+    for q in session.questions:
+        submit_answer(db, sample_user, q.id, q.correct_answer)
+    # Written behind update_mastery's back
+    db.add(UserCharacterProgress(user_id=sample_user.id + 1, character_id=sample_characters[0].id, mastery_score=4))
+    db.commit()
+
+    assert check_mastery_summaries(db) == [sample_user.id + 1]
+    assert get_mastery_summary(db, sample_user.id + 1).levels == [0, 0, 0, 0, 1, 0]
+
+    db.get(UserMasterySummary, sample_user.id).level_1 += 3
+    db.commit()
+    assert check_mastery_summaries(db) == [sample_user.id]
+    assert get_mastery_summary(db, sample_user.id).levels == _levels_from_rows(db, sample_user.id)
+    assert check_mastery_summaries(db) == []
+
+
+def test_startup_backfills_summaries(db, db_engine, sample_user, sample_characters):
+    for i, char in enumerate(sample_characters[:4]):
+        db.add(UserCharacterProgress(user_id=sample_user.id, character_id=char.id, mastery_score=i))
+    db.commit()
+
+    _run_migrations(db_engine)
+
+    assert get_mastery_summary(db, sample_user.id).levels == [1, 1, 1, 1, 0, 0]
+    assert check_mastery_summaries(db, repair=False) == []
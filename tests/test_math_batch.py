@@ -0,0 +1,62 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from app.services import math_batch, math_generator
+from app.services.generator_registry import age_band
+
+MODES = list(math_generator._GENERATORS)
+
+
+def _key(expression, correct, options):
+    return expression, correct, frozenset(options)
+
+
+@pytest.mark.parametrize("mode", ["counting", "addition_simple", "subtraction_simple", "multiplication_easy",
+                                  "division_basic", "fractions_compare"])
+def test_batch_covers_exactly_what_the_scalar_generator_makes(mode):
+    rng = random.Random(0)
+    scalar = set()
+    for _ in range(20_000):
+        q = math_generator._GENERATORS[mode](rng)
+        scalar.add(_key(q["expression"], q["correct_answer"], q["options"]))
+    batch = {_key(e, c, o) for e, _, _, c, o in math_batch.rows(math_batch.generate_batch(mode, 20_000, 0))}
+    assert batch == scalar
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_batch_rows_are_valid_questions(mode):
+    batch = math_batch.generate_batch(mode, 5000, 1)
+    assert len(batch) == 5000
+    options = batch.options
+    assert (options == batch.answer[:, None]).sum(axis=1).tolist() == [1] * 5000
+    assert (options[:, 0] != options[:, 1]).all() and (options[:, 1] != options[:, 2]).all()
+    assert (options[:, 0] != options[:, 2]).all() and (options >= 0).all()
+    for expression, _, _, correct, opts in math_batch.rows(batch):
+        if mode != "fractions_compare" and mode != "counting":
+            sum_ = expression.replace("x", "*").replace("÷", "//").replace("= ?", "")
+            if "___" in sum_:
+                left, result = sum_.split("=")
+                sum_ = f"{left.replace('___', correct)} - {result}"
+                assert eval(sum_) == 0
+            else:
+                assert str(eval(sum_)) == correct
+        assert correct in opts
+
+
+def test_questions_match_the_scalar_shape():
+    scalar = math_generator._GENERATORS["addition_easy"](random.Random(0))
+    q = next(math_batch.questions(math_batch.generate_batch("addition_easy", 1, 0)))
+    assert set(q) == set(scalar)
+    assert json.loads(q["prompt_data"])["correct_answer"] == q["correct_answer"]
+
+
+def test_age_batches_follow_the_band_weights():
+    batches = math_batch.age_batches(9, 20_000, np.random.default_rng(2))
+    weights = math_generator.MODE_WEIGHTS[age_band(9)]
+    assert sum(len(b) for b in batches) == 20_000
+    assert {b.mode for b in batches} == set(weights)
+    for b in batches:
+        assert len(b) / 20_000 == pytest.approx(weights[b.mode] / sum(weights.values()), abs=0.02)
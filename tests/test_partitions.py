@@ -0,0 +1,63 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.models.rewards import PointsLedger
+from app.services.partitions import add_months, ensure_partitions, partition_name
+from app.services.session_engine import (
+    _has_daily_bonus_award, create_session, find_open_question,
+)
+
+
+def test_month_arithmetic_and_names():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("points_ledger", date(2027, 1, 1)) == "points_ledger_p202701"
+
+
+def test_ensure_partitions_is_a_no_op_on_sqlite(db_engine):
+    with db_engine.begin() as conn:
+        assert ensure_partitions(conn) == []
+
+
+def test_open_question_lookup_is_time_bounded(db, sample_user, sample_characters):
+    session = create_session(db, sample_user)
+    fresh, stale = session.questions[0], session.questions[1]
+    stale.created_at = datetime.utcnow() - timedelta(hours=get_settings().abandoned_session_hours + 1)
+    db.commit()
+
+    assert find_open_question(db, fresh.id) is fresh
+    assert find_open_question(db, stale.id) is None
+
+
+def test_daily_bonus_lookup_uses_the_day_window(db, sample_user):
+    today = date.today()
+    db.add(PointsLedger(
+        user_id=sample_user.id, change=5, reason="daily_bonus", balance_after=5,
+        created_at=datetime.combine(today, datetime.min.time()) - timedelta(seconds=1),
+    ))
+    db.commit()
+    assert not _has_daily_bonus_award(db, sample_user.id, today)
+    assert _has_daily_bonus_award(db, sample_user.id, today - timedelta(days=1))
+
+
+def test_future_partitions_are_created_on_postgres(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(text("DROP TABLE points_ledger"))
+        conn.execute(text(
+            "CREATE TABLE points_ledger (id SERIAL, user_id INTEGER NOT NULL, change INTEGER NOT NULL, "
+            "coins_change INTEGER, reason VARCHAR NOT NULL, balance_after INTEGER NOT NULL, "
+            "created_at TIMESTAMP NOT NULL, PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+        ))
+        names = ensure_partitions(conn, months_ahead=1, today=date(2026, 12, 15))
+        assert names == ["points_ledger_p202612", "points_ledger_p202701"]
+        conn.execute(text(
+            "INSERT INTO points_ledger (user_id, change, reason, balance_after, created_at) "
+            "VALUES (1, 2, 'x', 2, '2027-01-05')"
+        ))
+        plan = "\n".join(r[0] for r in conn.execute(text(
+            "EXPLAIN SELECT * FROM points_ledger WHERE created_at >= '2027-01-01'"
+        )))
+        assert "points_ledger_p202701" in plan
+        assert "points_ledger_p202612" not in plan
@@ -0,0 +1,65 @@
+"""Hot lookups must be index-driven.
+
+Each query mirrors one the app runs per request. SQLite plans are checked
+on every run; PostgreSQL plans run when TEST_POSTGRES_URL is set, with
+sequential scans disabled so the planner picks an index whenever one
+can serve the query, even on empty tables.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+HOT_QUERIES = {
+    "update_mastery progress row": (
+        "SELECT * FROM user_character_progress WHERE user_id = :u AND character_id = :c",
+        {"u": 1, "c": 1},
+    ),
+    "review forecast": (
+        "SELECT next_review_date, COUNT(id) FROM user_character_progress "
+        "WHERE user_id = :u AND next_review_date <= :d GROUP BY next_review_date",
+        {"u": 1, "d": datetime(2026, 10, 19).date()},
+    ),
+    "recent completed sessions": (
+        "SELECT * FROM game_sessions WHERE user_id = :u AND completed_at IS NOT NULL "
+        "ORDER BY completed_at DESC LIMIT 10",
+        {"u": 1},
+    ),
+    "session questions": (
+        "SELECT * FROM session_questions WHERE session_id = :s",
+        {"s": 1},
+    ),
+    "badge already earned": (
+        "SELECT id FROM user_achievements WHERE user_id = :u AND badge_key = :b",
+        {"u": 1, "b": "first_win"},
+    ),
+    "item already owned": (
+        "SELECT id FROM user_inventory WHERE user_id = :u AND item_key = :k",
+        {"u": 1, "k": "car_red"},
+    ),
+    "quest row": (
+        "SELECT * FROM quest_progress WHERE user_id = :u",
+        {"u": 1},
+    ),
+    "today's points": (
+        "SELECT SUM(change) FROM points_ledger WHERE user_id = :u AND created_at >= :a AND created_at < :b",
+        {"u": 1, "a": datetime(2026, 10, 19), "b": datetime(2026, 10, 19) + timedelta(days=1)},
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index_on_sqlite(db_engine, name):
+    sql, params = HOT_QUERIES[name]
+    with db_engine.connect() as conn:
+        details = [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params)]
+    assert not any(d.startswith("SCAN") for d in details), f"{name}: {details}"
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index_on_postgres(pg_engine, name):
+    sql, params = HOT_QUERIES[name]
+    with pg_engine.begin() as conn:
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(row[0] for row in conn.execute(text("EXPLAIN " + sql), params))
+    assert "Seq Scan" not in plan, f"{name}:\n{plan}"
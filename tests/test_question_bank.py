@@ -0,0 +1,67 @@
+import json
+import random
+
+import pytest
+
+from app.services import english_generator, logic_generator, question_bank
+from app.services.generator_registry import registry
+from app.services.question_bank import QuestionBank, build_question_bank, load_question_bank, unload_question_bank
+
+STATIC = [(logic_generator, m) for m in logic_generator.STATIC_MODES] + [
+    (english_generator, m) for m in english_generator.STATIC_MODES
+]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    path = str(tmp_path / "bank.bin")
+    build_question_bank(path)
+    yield QuestionBank(path)
+
+
+@pytest.fixture
+def loaded(tmp_path):
+    bank = load_question_bank(str(tmp_path / "bank.bin"))
+    yield bank
+    unload_question_bank()
+
+
+def _key(q):
+    return q["prompt_data"], tuple(sorted(q["options"]))
+
+
+@pytest.mark.parametrize("module,mode", STATIC, ids=[m for _, m in STATIC])
+def test_bank_holds_every_question_the_generator_makes(bank, module, mode):
+    banked = {_key(q) for q in bank.questions(mode)}
+    args = (9,) if module is english_generator else ()
+    rng = random.Random(0)
+    for _ in range(150):
+        assert _key(module._GENERATORS[mode](*args, rng)) in banked
+
+
+def test_draws_look_like_generated_questions(bank):
+    for mode in bank.modes:
+        q = bank.draw(mode)
+        assert q["correct_answer"] in q["options"]
+        assert json.loads(q["prompt_data"]) == {
+            k: q[k] for k in ("mode", "expression", "prompt_text", "prompt_image", "correct_answer")
+        }
+
+
+def test_registry_serves_static_modes_from_the_loaded_bank(loaded, monkeypatch):
+    drawn = []
+    monkeypatch.setattr(loaded, "draw", lambda mode, *a: drawn.append(mode) or {"mode": mode})
+    questions = registry.generate("logic", 9, 200)
+    assert set(drawn) == {q["mode"] for q in questions} & set(logic_generator.STATIC_MODES)
+    assert drawn
+
+
+def test_stale_bank_is_rebuilt(tmp_path, monkeypatch):
+    path = str(tmp_path / "bank.bin")
+    build_question_bank(path)
+    monkeypatch.setattr(question_bank, "source_fingerprint", lambda: "tables-changed")
+    assert load_question_bank(path, build=False) is None
+    try:
+        assert load_question_bank(path).fingerprint == "tables-changed"
+    finally:
+        unload_question_bank()
@@ -0,0 +1,114 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from app.config import get_settings
+from app.models.session import SessionQuestion
+from app.services import math_generator, question_store
+from app.services.generator_registry import registry
+from app.services.question_store import (
+    StaleQuestionError, compact_questions, question_payloads,
+)
+from app.services.session_engine import (
+    create_session, find_resumable_session, generated_questions, submit_answer,
+)
+
+
+@pytest.fixture
+def full_rows(monkeypatch):
+    monkeypatch.setattr(get_settings(), "compact_generated_questions", False)
+
+
+def _payloads(session):
+    return [(p.options, p.prompt) for p in question_payloads(session)]
+
+
+@pytest.mark.parametrize("game_type", ["math", "logic", "english"])
+def test_compact_rows_rebuild_from_their_seed(db, sample_user, game_type):
+    sample_user.age = 8
+    session = create_session(db, sample_user, game_type=game_type)
+    assert all(q.options == "" and q.prompt_data is None for q in session.questions)
+    assert all(q.seed is not None and q.generator_version for q in session.questions)
+
+    question_store._rebuilt.clear()
+    expected = generated_questions(game_type, 8, len(session.questions), session.seed)
+    assert _payloads(session) == [
+        (g["options"], {k: g[k] for k in ("expression", "prompt_text", "prompt_image")}) for g in expected
+    ]
+    assert [q.correct_answer for q in session.questions] == [g["correct_answer"] for g in expected]
+
+
+def test_rebuilt_sessions_are_cached(db, sample_user, monkeypatch):
+    session = create_session(db, sample_user, game_type="math")
+    made = []
+    make = registry.make
+    monkeypatch.setattr(registry, "make", lambda *a: made.append(a) or make(*a))
+
+    first = _payloads(session)        # primed when the session was created
+    assert made == []
+    question_store._rebuilt.clear()
+    assert _payloads(session) == first
+    assert len(made) == len(session.questions)
+    assert _payloads(session) == first
+    assert len(made) == len(session.questions)
+
+
+def test_stale_generator_version_is_not_resumed(db, sample_user, monkeypatch):
+    session = create_session(db, sample_user, game_type="math")
+    assert find_resumable_session(db, sample_user, "math").id == session.id
+
+    question_store._rebuilt.clear()
+    monkeypatch.setattr(registry, "version", lambda game, mode: "newer")
+    with pytest.raises(StaleQuestionError):
+        question_payloads(session)
+    assert find_resumable_session(db, sample_user, "math") is None
+
+    # Answers are still checked against the stored correct_answer
+    q = session.questions[0]
+    assert submit_answer(db, sample_user, q.id, q.correct_answer)["is_correct"] is True
+
+
+
+def test_comment_only_generator_edit_keeps_sessions_rebuildable(db, sample_user, tmp_path, monkeypatch):
+    session = create_session(db, sample_user, game_type="math")
+    before = _payloads(session)
+
+    # Re-register math from a copy of its module with one more comment, as a deploy would
+    edited = tmp_path / "math_generator.py"
+    edited.write_text("# Reworded comment\n" + Path(math_generator.__file__).read_text(encoding="utf-8"), encoding="utf-8")
+    monkeypatch.setattr(registry, "_games", dict(registry._games))
+    spec = importlib.util.spec_from_file_location("edited_math_generator", edited)
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+
+    question_store._rebuilt.clear()
+    assert _payloads(session) == before
+    assert find_resumable_session(db, sample_user, "math").id == session.id
+
+def test_compaction_keeps_questions_and_saves_their_payloads(db, sample_user, full_rows, monkeypatch):
+    sessions = [create_session(db, sample_user, game_type=g) for g in ("math", "logic", "math")]
+    before = [_payloads(s) for s in sessions]
+    full_bytes = sum(len(q.options) + len(q.prompt_data) for q in db.query(SessionQuestion).all())
+
+    dry = compact_questions(db, batch_size=4, dry_run=True)
+    assert dry["compacted"] == 15 and dry["bytes_saved"] == full_bytes
+    assert db.query(SessionQuestion).filter(SessionQuestion.options == "").count() == 0
+
+    report = compact_questions(db, batch_size=4)
+    assert report == {"checked": 15, "compacted": 15, "mismatched": 0, "bytes_saved": full_bytes}
+    assert db.query(SessionQuestion).filter(SessionQuestion.options != "").count() == 0
+    question_store._rebuilt.clear()
+    assert [_payloads(s) for s in sessions] == before
+    assert compact_questions(db)["checked"] == 0
+
+
+def test_compaction_skips_rows_an_older_generator_made(db, sample_user, full_rows):
+    session = create_session(db, sample_user, game_type="math")
+    session.questions[0].generator_version = "older"
+    session.questions[1].options = json.dumps(["1", "2", "3"])
+    db.commit()
+
+    report = compact_questions(db)
+    assert (report["compacted"], report["mismatched"]) == (3, 2)
+    assert [q.options == "" for q in session.questions] == [False, False, True, True, True]
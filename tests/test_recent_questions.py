@@ -0,0 +1,60 @@
+from app.config import get_settings
+from app.services.generator_registry import registry
+from app.services.question_store import question_payloads
+from app.services.recent_questions import RecentQuestions, fingerprint, load_recent
+from app.services.session_engine import create_session
+
+
+def test_ring_keeps_the_newest_fingerprints():
+    ring = RecentQuestions(4)
+    for fp in [1, 2, 3, 2, 5, 6]:
+        ring.add(fp)
+    assert [fp in ring for fp in range(1, 7)] == [False, True, True, False, True, True]
+
+    reloaded = RecentQuestions(4, ring.dumps())
+    reloaded.add(7)
+    assert [fp in reloaded for fp in (3, 2, 5, 6, 7)] == [False, True, True, True, True]
+    assert len(RecentQuestions(8, ring.dumps())) == 4
+    assert len(RecentQuestions(2, ring.dumps())) == 2
+
+
+def _asked(session):
+    return [
+        fingerprint(session.game_type, q.question_mode, p.prompt["expression"], p.prompt["prompt_text"], q.correct_answer)
+        for q, p in zip(session.questions, question_payloads(session))
+    ]
+
+
+def test_no_repeats_within_the_recent_sessions(db, sample_user):
+    sample_user.age = 8
+    window = get_settings().recent_question_sessions
+    history = []
+    for _ in range(30):
+        asked = _asked(create_session(db, sample_user, game_type="logic"))
+        assert len(set(asked)) == len(asked)
+        assert not set(asked) & {fp for session in history[-window:] for fp in session}
+        history.append(asked)
+    assert len(load_recent(sample_user, "logic")) == window * get_settings().questions_per_session
+
+
+def test_redraws_are_bounded(db, sample_user, monkeypatch):
+    sample_user.age = 8
+    create_session(db, sample_user, game_type="math")
+    same = registry.make("math", "addition_simple", 8, 1)
+    made = []
+    monkeypatch.setattr(registry, "make", lambda *a: made.append(a) or same)
+
+    session = create_session(db, sample_user, game_type="math")
+    per_session = get_settings().questions_per_session
+    # The first question is new; each later one repeats it on every draw
+    assert len(made) == 1 + (per_session - 1) * (1 + get_settings().recent_question_retries)
+    assert len(session.questions) == per_session
+
+
+def test_chinese_redraws_the_mode_not_the_character(db, sample_user, sample_characters):
+    sample_user.age = 8
+    first = create_session(db, sample_user)
+    asked = {(q.character_id, q.question_mode) for q in first.questions}
+    second = create_session(db, sample_user, character_ids=[q.character_id for q in first.questions])
+    assert {q.character_id for q in second.questions} == {c for c, _ in asked}
+    assert not {(q.character_id, q.question_mode) for q in second.questions} & asked
@@ -196,6 +196,60 @@ def test_wrong_answer_then_retry():
     assert correct_resp.json()["is_correct"] is True
 
 
+def test_network_retries_with_same_key_replay_answer_and_completion():
+    client, _, user_id = _build_client(with_characters=False, age=8)
+    client.post("/login", data={"user_id": user_id}, follow_redirects=False)
+
+    html = client.get("/game/math").text
+    questions = json.loads(re.search(r"window\.questionsData\s*=\s*(\[.*?\]);", html, re.DOTALL).group(1))
+    session_id = int(re.search(r"window\.sessionId\s*=\s*(\d+);", html).group(1))
+
+    for q in questions:
+        payload = {"question_id": q["id"], "selected_answer": q["correct_answer"]}
+        headers = {"Idempotency-Key": f"answer-{q['id']}"}
+        first = client.post("/game/answer", json=payload, headers=headers)
+        retry = client.post("/game/answer", json=payload, headers=headers)
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+
+    headers = {"Idempotency-Key": f"complete-{session_id}"}
+    first = client.post(f"/game/complete/{session_id}", headers=headers)
+    retry = client.post(f"/game/complete/{session_id}", headers=headers)
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+
+
+def test_reload_resumes_unfinished_session(_unlimited_sessions):
+    _unlimited_sessions.max_sessions_per_day = 1
+    client, SessionLocal, user_id = _build_client(with_characters=False, age=8)
+    client.post("/login", data={"user_id": user_id}, follow_redirects=False)
+
+    html = client.get("/game/math").text
+    questions = json.loads(re.search(r"window\.questionsData\s*=\s*(\[.*?\]);", html, re.DOTALL).group(1))
+    session_id = int(re.search(r"window\.sessionId\s*=\s*(\d+);", html).group(1))
+    for q in questions[:2]:
+        client.post("/game/answer", json={"question_id": q["id"], "selected_answer": q["correct_answer"]})
+
+    # Reload: same session and questions, picks up at question 3, and the
+    # daily cap of 1 doesn't block it
+    html = client.get("/game/math").text
+    assert int(re.search(r"window\.sessionId\s*=\s*(\d+);", html).group(1)) == session_id
+    assert re.search(r"window\.startIndex\s*=\s*(\d+);", html).group(1) == "2"
+    resumed = json.loads(re.search(r"window\.questionsData\s*=\s*(\[.*?\]);", html, re.DOTALL).group(1))
+    assert [q["id"] for q in resumed] == [q["id"] for q in questions]
+
+    db = SessionLocal()
+    assert db.query(GameSession).filter_by(user_id=user_id).count() == 1
+    assert db.query(User).filter_by(id=user_id).one().sessions_today == 1
+    db.close()
+
+    # Once completed, the next visit needs a new session, which the cap blocks
+    for q in resumed[2:]:
+        client.post("/game/answer", json={"question_id": q["id"], "selected_answer": q["correct_answer"]})
+    assert client.post(f"/game/complete/{session_id}").status_code == 200
+    assert "window.sessionId" not in client.get("/game/math").text
+
+
 def test_answer_without_login_returns_401():
     client, _, _ = _build_client(with_characters=False)
 
@@ -332,6 +386,49 @@ def test_parent_drill_cancel():
     db.close()
 
 
+def test_parent_switches_child_scheduler():
+    client, SessionLocal, user_id = _build_client(with_characters=True)
+    _play_full_game(client, user_id, "chinese")
+    client.get("/logout", follow_redirects=False)
+
+    db = SessionLocal()
+    db.add(User(name="Parent", pin="8888", age=40, theme="dashboard", role="parent"))
+    db.commit()
+    db.close()
+
+    client.post("/login/parent", data={"pin": "8888"}, follow_redirects=False)
+    assert client.post(f"/dashboard/scheduler/{user_id}", json={"scheduler": "nope"}).status_code == 400
+    resp = client.post(f"/dashboard/scheduler/{user_id}", json={"scheduler": "fsrs"})
+    assert resp.status_code == 200
+    assert resp.json()["scheduler"] == "fsrs"
+
+    db = SessionLocal()
+    assert db.query(User).filter_by(id=user_id).one().scheduler == "fsrs"
+    db.close()
+    page = client.get("/dashboard/")
+    assert page.status_code == 200
+    assert '<option value="fsrs" selected>' in page.text
+
+
+def test_review_forecast_endpoint():
+    client, SessionLocal, user_id = _build_client(with_characters=True)
+    _play_full_game(client, user_id, "chinese")
+    client.get("/logout", follow_redirects=False)
+
+    db = SessionLocal()
+    db.add(User(name="Parent", pin="8888", age=40, theme="dashboard", role="parent"))
+    db.commit()
+    db.close()
+
+    assert client.get(f"/dashboard/api/forecast/{user_id}").status_code == 403
+    client.post("/login/parent", data={"pin": "8888"}, follow_redirects=False)
+    data = client.get(f"/dashboard/api/forecast/{user_id}?days=90").json()
+    assert len(data["counts"]) == 91
+    assert data["overdue"] + sum(data["counts"]) == 5  # every answered character is due within 90 days
+    assert len(client.get(f"/dashboard/api/forecast/{user_id}").json()["counts"]) == 31
+    assert client.get(f"/dashboard/api/forecast/{user_id}?days=365").status_code == 422
+
+
 def test_service_worker_precache_urls_resolve():
     """Every URL the SW precaches must exist — a 404 there used to brick installation."""
     client, _, _ = _build_client(with_characters=False)
@@ -411,3 +508,49 @@ def test_reader_selector_shows_all_games():
     html = resp.text
     for game in ("chinese", "math", "logic", "english"):
         assert f"pickGame('{game}')" in html
+
+
+def test_parent_prints_worksheet():
+    client, SessionLocal, user_id = _build_client(with_characters=True, age=7)
+    db = SessionLocal()
+    db.add(User(name="Parent", pin="8888", age=40, theme="dashboard", role="parent"))
+    db.commit()
+    db.close()
+
+    assert client.get(f"/dashboard/worksheet/{user_id}").status_code == 403
+    client.post("/login/parent", data={"pin": "8888"}, follow_redirects=False)
+    assert client.get("/dashboard/worksheet/9999").status_code == 404
+    assert client.get(f"/dashboard/worksheet/{user_id}?games=math,chess").status_code == 400
+    assert client.get(f"/dashboard/worksheet/{user_id}?count=500").status_code == 422
+
+    resp = client.get(f"/dashboard/worksheet/{user_id}?count=8&seed=3")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/html")
+    assert resp.text.count("<section>") == 4
+    # 5 characters in the catalog, 8 of each other game
+    assert resp.text.count('<div class="num">') == 5 + 3 * 8
+    assert "Answer key" in resp.text
+    assert client.get(f"/dashboard/worksheet/{user_id}?count=8&seed=3").text == resp.text
+
+
+def test_next_session_is_drawn_in_the_background():
+    client, SessionLocal, user_id = _build_client(with_characters=False, age=8)
+
+    def pool():
+        db = SessionLocal()
+        pending = db.query(User).filter_by(id=user_id).one().pending_sessions
+        db.close()
+        return json.loads(pending)
+
+    client.post("/login", data={"user_id": user_id}, follow_redirects=False)
+    at_login = pool()
+    assert set(at_login) == {"math", "logic", "english"}  # no characters, so no Chinese
+
+    _play_full_game(client, user_id, "math")
+    db = SessionLocal()
+    # The login's bundle was played; completing it drew each game's next session
+    assert db.query(GameSession).filter_by(user_id=user_id).one().seed == at_login["math"]["seed"]
+    db.close()
+    after = pool()
+    assert set(after) == {"math", "logic", "english"}
+    assert after["math"]["seed"] != at_login["math"]["seed"]
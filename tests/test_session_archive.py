@@ -0,0 +1,91 @@
+import json
+import zlib
+from datetime import datetime, timedelta
+
+from app.config import get_settings
+from app.models.session import GameSession, SessionArchive, SessionQuestion
+from app.services.session_archive import (
+    archive_completed_sessions, iter_question_history, unpack_archive,
+)
+from app.services.session_engine import create_session, submit_answer, complete_session
+
+
+def _play(db, user, game_type="chinese", days_ago=0):
+    session = create_session(db, user, game_type=game_type)
+    for i, q in enumerate(session.questions):
+        answer = q.correct_answer if i else "wrong"
+        submit_answer(db, user, q.id, answer)
+    complete_session(db, user, session.id)
+    if days_ago:
+        session.completed_at = datetime.utcnow() - timedelta(days=days_ago)
+        db.commit()
+    return session
+
+
+def _raw_row_bytes(rows):
+    return sum(
+        len((q.correct_answer or "").encode()) + len((q.options or "").encode())
+        + len((q.prompt_data or "").encode()) + len((q.selected_answer or "").encode())
+        + len((q.question_mode or "").encode()) + 8 * 6
+        for q in rows
+    )
+
+
+def test_archive_round_trips_answers_timings_and_mode(db, sample_user, sample_characters):
+    old = _play(db, sample_user, days_ago=40)
+    recent = _play(db, sample_user)
+    before = [
+        (q.question_number, q.character_id, q.question_mode, q.correct_answer,
+         q.selected_answer, q.is_correct)
+        for q in old.questions
+    ]
+    answered = [q.answered_at for q in old.questions]
+    old_id = old.id
+
+    moved = archive_completed_sessions(db, timedelta(days=30), batch_size=10, max_batches=5)
+
+    assert moved == {"sessions": 1, "questions": 5}
+    assert db.query(SessionQuestion).filter_by(session_id=old_id).count() == 0
+    assert db.query(SessionQuestion).filter_by(session_id=recent.id).count() == 5
+    archive = db.query(SessionArchive).filter_by(session_id=old_id).one()
+    after = [
+        (q.question_number, q.character_id, q.question_mode, q.correct_answer,
+         q.selected_answer, q.is_correct)
+        for q in unpack_archive(archive)
+    ]
+    assert after == before
+    # Timings are kept to the millisecond
+    for original, restored in zip(answered, (q.answered_at for q in unpack_archive(archive))):
+        assert abs(restored - original) <= timedelta(milliseconds=1)
+    assert db.get(GameSession, old_id).question_count == 5
+
+    # Idempotent: nothing left to archive
+    assert archive_completed_sessions(db, timedelta(days=30), 10, 5)["sessions"] == 0
+
+
+def test_history_reader_merges_archived_and_live(db, sample_user, sample_characters):
+    _play(db, sample_user, days_ago=40)
+    _play(db, sample_user, game_type="math")
+    archive_completed_sessions(db, timedelta(days=30), 10, 5)
+
+    history = list(iter_question_history(db, sample_user.id))
+
+    assert len(history) == 10
+    assert history[0].question_mode in {"char_to_image", "image_to_char", "char_to_meaning", "meaning_to_char"}
+    assert history[-1].character_id is None  # math questions have no character
+    assert [q.is_correct for q in history[:5]] == [False, True, True, True, True]
+
+
+def test_archive_is_much_smaller_than_the_rows(db, sample_user, sample_characters, monkeypatch):
+    # Against full rows; compact generated rows are already small (see test_question_store)
+    monkeypatch.setattr(get_settings(), "compact_generated_questions", False)
+    for _ in range(3):
+        _play(db, sample_user, game_type="math", days_ago=40)
+    raw = _raw_row_bytes(db.query(SessionQuestion).all())
+
+    archive_completed_sessions(db, timedelta(days=30), 10, 5)
+
+    packed = sum(len(a.payload) for a in db.query(SessionArchive).all())
+    assert packed * 3 < raw
+    doc = json.loads(zlib.decompress(db.query(SessionArchive).first().payload))
+    assert set(doc) == {"t0", "n", "c", "m", "k", "a", "ok", "f", "s", "r"}
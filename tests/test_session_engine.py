@@ -5,11 +5,13 @@ import pytest
 
 from app.models.user import User
 from app.config import get_settings
+from app.services.question_store import question_payloads
 from app.services.session_engine import (
     can_start_session,
     create_session,
     submit_answer,
     complete_session,
+    generated_questions,
     SessionLimitReached,
 )
 
@@ -23,6 +25,17 @@ def test_create_session_generates_5_questions(db, sample_user, sample_characters
     assert len(session.questions) == 5
 
 
+@pytest.mark.parametrize("game_type", ["math", "logic", "english"])
+def test_session_seed_regenerates_its_questions(db, sample_user, game_type):
+    session = create_session(db, sample_user, game_type=game_type)
+    assert session.seed is not None
+    again = generated_questions(game_type, sample_user.age, len(session.questions), session.seed)
+    payloads = question_payloads(session)
+    assert [(q.question_mode, p.prompt["expression"], p.options) for q, p in zip(session.questions, payloads)] == [
+        (g["mode"], g["expression"], g["options"]) for g in again
+    ]
+
+
 def test_create_session_increments_sessions_today(db, sample_user, sample_characters):
     create_session(db, sample_user)
     assert sample_user.sessions_today == 1
@@ -48,7 +61,7 @@ def test_third_session_blocked_at_default_cap(db, sample_user, sample_characters
         create_session(db, sample_user)
 
 
-def test_submit_correct_answer(db, sample_user, sample_characters):
+def test_submit_correct_answer(db, sample_user, sample_characters, no_lucky_star):
     session = create_session(db, sample_user)
     q = session.questions[0]
     result = submit_answer(db, sample_user, q.id, q.correct_answer)
@@ -87,7 +100,7 @@ def test_complete_session_requires_all_questions_answered(db, sample_user, sampl
         complete_session(db, sample_user, session.id)
 
 
-def test_daily_bonus_applies_to_first_completed_session_even_if_multiple_started(db, sample_user, sample_characters):
+def test_daily_bonus_applies_to_first_completed_session_even_if_multiple_started(db, sample_user, sample_characters, no_lucky_star):
     settings = get_settings()
     first = create_session(db, sample_user)
     create_session(db, sample_user)
@@ -258,3 +271,59 @@ def test_summary_points_include_lucky_star_bonus(db, sample_user, sample_charact
     assert summary["points_earned"] == expected
     # Breakdown must account for every point in the summary
     assert sum(x["value"] for x in summary["xp_breakdown"]) == summary["points_earned"]
+
+
+def test_replayed_answer_returns_original_result_without_rescoring(db, sample_user, sample_characters):
+    session = create_session(db, sample_user)
+    q = session.questions[0]
+
+    first = submit_answer(db, sample_user, q.id, q.correct_answer, request_key="a1")
+    points_after_first = sample_user.points
+    replay = submit_answer(db, sample_user, q.id, q.correct_answer, request_key="a1")
+
+    assert replay == first
+    assert sample_user.points == points_after_first
+    assert session.total_correct == 1
+
+    # A different key is a genuine second attempt and is still rejected
+    with pytest.raises(ValueError, match="already answered"):
+        submit_answer(db, sample_user, q.id, q.correct_answer, request_key="a2")
+
+
+def test_replayed_completion_does_not_repeat_bonuses(db, sample_user, sample_characters):
+    from app.models.quest import QuestProgress
+    from app.models.rewards import PointsLedger
+
+    session = create_session(db, sample_user)
+    for q in session.questions:
+        submit_answer(db, sample_user, q.id, q.correct_answer)
+
+    first = complete_session(db, sample_user, session.id, request_key="complete-1")
+    ledger_rows = db.query(PointsLedger).filter_by(user_id=sample_user.id).count()
+    replay = complete_session(db, sample_user, session.id, request_key="complete-1")
+
+    assert replay == first
+    assert db.query(PointsLedger).filter_by(user_id=sample_user.id).count() == ledger_rows
+    assert sample_user.total_sessions_completed == 1
+    assert db.query(QuestProgress).filter_by(user_id=sample_user.id).one().sessions_in_stage == 1
+
+    with pytest.raises(ValueError, match="already completed"):
+        complete_session(db, sample_user, session.id)
+
+
+def test_resumable_session_ignores_stale_and_other_types(db, sample_user, sample_characters):
+    from datetime import datetime
+    from app.services.session_engine import find_resumable_session, resume_index
+
+    session = create_session(db, sample_user)
+    assert find_resumable_session(db, sample_user, "chinese").id == session.id
+    assert find_resumable_session(db, sample_user, "math") is None
+    assert resume_index(session) == 0
+
+    q = session.questions[0]
+    submit_answer(db, sample_user, q.id, q.correct_answer)
+    assert resume_index(session) == 1
+
+    session.started_at = datetime.utcnow() - timedelta(hours=get_settings().session_resume_hours + 1)
+    db.commit()
+    assert find_resumable_session(db, sample_user, "chinese") is None
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from app.services import session_engine
+from app.services.question_store import question_payloads
+from app.services.session_engine import create_session, session_bundle, submit_answer
+from app.services.session_pool import refill_pool, take_pending
+
+
+def _contents(session):
+    if session.game_type == "chinese":
+        return [(q.character_id, q.question_mode, q.correct_answer, q.options) for q in session.questions]
+    return [(q.question_mode, q.correct_answer, p) for q, p in zip(session.questions, question_payloads(session))]
+
+
+@pytest.mark.parametrize("game_type", ["chinese", "math", "english"])
+def test_claimed_bundle_is_the_session_create_would_draw(db, sample_user, sample_characters, monkeypatch, game_type):
+    sample_user.age = 8
+    bundle = session_bundle(db, sample_user, game_type, seed=7)
+    recent = sample_user.recent_questions
+    claimed = _contents(create_session(db, sample_user, game_type, bundle=json.loads(json.dumps(bundle))))
+    assert json.loads(sample_user.recent_questions)[game_type] == bundle["recent"]
+
+    # Rewind the rings and draw the same seed on demand
+    sample_user.recent_questions = recent
+    monkeypatch.setattr(session_engine, "new_seed", lambda: 7)
+    assert claimed == _contents(create_session(db, sample_user, game_type))
+    assert json.loads(sample_user.recent_questions)[game_type] == bundle["recent"]
+
+
+def test_pool_is_claimed_without_selection(db, sample_user, sample_characters, monkeypatch):
+    assert refill_pool(db, sample_user) == ["chinese"]   # pre-readers only play Chinese
+    assert refill_pool(db, sample_user) == []
+    bundle = take_pending(sample_user, "chinese")
+    assert bundle is not None and sample_user.pending_sessions is None
+
+    def no_selection(*args, **kwargs):
+        raise AssertionError("a claimed bundle selects nothing")
+
+    monkeypatch.setattr(session_engine, "select_characters", no_selection)
+    session = create_session(db, sample_user, "chinese", bundle=bundle)
+    assert [q.character_id for q in session.questions] == [row[0] for row in bundle["rows"]]
+
+
+def test_bundles_go_stale_per_game(db, sample_user, sample_characters):
+    sample_user.age = 8
+    assert refill_pool(db, sample_user) == ["chinese", "math", "logic", "english"]
+    # A logic session drawn on demand changes only the logic ring
+    create_session(db, sample_user, "logic")
+    assert take_pending(sample_user, "logic") is None
+    assert take_pending(sample_user, "math") is not None
+    assert refill_pool(db, sample_user) == ["math", "logic"]
+
+    # Chinese answers make only the Chinese bundle stale
+    session = create_session(db, sample_user, "chinese")
+    assert refill_pool(db, sample_user) == ["chinese"]
+    q = session.questions[0]
+    submit_answer(db, sample_user, q.id, q.correct_answer)
+    assert take_pending(sample_user, "chinese") is None
+    assert take_pending(sample_user, "english") is not None
@@ -0,0 +1,133 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.models.progress import UserCharacterProgress
+from app.services.session_engine import create_session, submit_answer, complete_session
+from app.services import sm2_batch
+from app.services.scheduler import set_scheduler
+from app.services.sm2_batch import SM2Params, rebuild_progress, sm2_step_batch
+from app.services.spaced_repetition import sm2_step
+
+
+def _progress(db, user_id):
+    return {
+        p.character_id: (
+            p.easiness_factor, p.sm2_interval, p.sm2_repetitions, p.correct_count,
+            p.wrong_count, p.mastery_score, p.next_review_date,
+        )
+        for p in db.query(UserCharacterProgress).filter_by(user_id=user_id).populate_existing()
+    }
+
+
+def test_batch_step_matches_scalar_step():
+    rng = random.Random(3)
+    states = [(rng.choice([1.3, 2.5, 2.6, 3.0 + rng.random()]), rng.randint(0, 400), rng.randint(0, 9)) for _ in range(2000)]
+    states.append((2.5, 5, 3))  # 12.5 days: a rounding tie
+    qualities = [rng.choice([1, 3, 5]) for _ in states]
+
+    ef, interval, reps = sm2_step_batch(*zip(*states), qualities)
+
+    expected = [sm2_step(*s, q) for s, q in zip(states, qualities)]
+    assert list(zip(ef.tolist(), interval.tolist(), reps.tolist())) == expected
+
+
+def test_replay_rebuilds_what_play_produced(db, sample_user, sample_characters):
+    rng = random.Random(5)
+    for _ in range(12):
+        session = create_session(db, sample_user)
+        for q in session.questions:
+            if rng.random() < 0.3:
+                submit_answer(db, sample_user, q.id, "wrong")
+                if rng.random() < 0.7:
+                    submit_answer(db, sample_user, q.id, q.correct_answer)
+            else:
+                submit_answer(db, sample_user, q.id, q.correct_answer)
+        complete_session(db, sample_user, session.id)
+    played = _progress(db, sample_user.id)
+
+    db.query(UserCharacterProgress).update({"sm2_interval": 99, "easiness_factor": 9.9, "correct_count": 0})
+    db.commit()
+    version = sample_user.progress_version
+    result = rebuild_progress(db, sample_user.id)
+
+    assert len(result.character_id) == len(played)
+    assert _progress(db, sample_user.id) == played
+    assert sample_user.progress_version > version   # a pooled Chinese session is stale now
+
+
+def test_replay_under_new_parameters(db, sample_user, sample_characters):
+    session = create_session(db, sample_user)
+    char_id = session.questions[0].character_id
+    for _ in range(2):
+        for q in session.questions:
+            submit_answer(db, sample_user, q.id, q.correct_answer)
+        complete_session(db, sample_user, session.id)
+        session = create_session(db, sample_user)
+    reps = _progress(db, sample_user.id)[char_id][2]
+
+    result = rebuild_progress(db, sample_user.id, SM2Params(second_interval=4), dry_run=True)
+
+    i = int(np.flatnonzero(result.character_id == char_id)[0])
+    assert result.interval[i] == (4 if reps == 2 else 1)
+    assert _progress(db, sample_user.id)[char_id][1] == (3 if reps == 2 else 1)  # dry run wrote nothing
+
+
+@pytest.fixture
+def run_cli(db, monkeypatch):
+    """Run sm2_batch's command line against the test database."""
+    def run(*argv):
+        monkeypatch.setattr("sys.argv", ["sm2_batch", *argv])
+        monkeypatch.setattr("app.database.SessionLocal", lambda: db)
+        sm2_batch.main()
+    return run
+
+
+def test_cli_leaves_fsrs_children_alone(db, sample_user, sample_characters, run_cli):
+    for _ in range(3):
+        session = create_session(db, sample_user)
+        for q in session.questions:
+            submit_answer(db, sample_user, q.id, q.correct_answer)
+        complete_session(db, sample_user, session.id)
+    set_scheduler(db, sample_user, "fsrs")
+
+    def state():
+        return {
+            p.character_id: (p.next_review_date, p.fsrs_stability, p.fsrs_difficulty)
+            for p in db.query(UserCharacterProgress).filter_by(user_id=sample_user.id).populate_existing()
+        }
+    before = state()
+    assert all(s is not None for _, s, _ in before.values())
+
+    run_cli()
+
+    assert state() == before
+
+
+def test_cli_writes_only_under_the_live_parameters(db, sample_user, sample_characters, run_cli):
+    session = create_session(db, sample_user)
+    for q in session.questions:
+        submit_answer(db, sample_user, q.id, q.correct_answer)
+    complete_session(db, sample_user, session.id)
+    before = _progress(db, sample_user.id)
+
+    with pytest.raises(SystemExit):
+        run_cli("--second-interval", "4")
+    run_cli("--second-interval", "4", "--dry-run")
+
+    assert _progress(db, sample_user.id) == before
+
+
+def test_rebuild_keeps_fsrs_state(db, sample_user, sample_characters):
+    session = create_session(db, sample_user)
+    for q in session.questions:
+        submit_answer(db, sample_user, q.id, q.correct_answer)
+    complete_session(db, sample_user, session.id)
+    db.query(UserCharacterProgress).update({"fsrs_stability": 7.5, "fsrs_difficulty": 4.0})
+    db.commit()
+
+    rebuild_progress(db, sample_user.id)
+
+    rows = db.query(UserCharacterProgress).filter_by(user_id=sample_user.id).populate_existing().all()
+    assert rows and all((p.fsrs_stability, p.fsrs_difficulty) == (7.5, 4.0) for p in rows)
@@ -125,3 +125,49 @@ def test_sm2_retry_correct_gives_lower_quality(db, sample_user, sample_character
     assert p2.sm2_interval == 1
     # But quality 5 gives higher EF than quality 3
     assert p1.easiness_factor > p2.easiness_factor
+
+
+def test_upsert_matches_reference_step(db, sample_user, sample_characters):
+    """The SQL upsert applies exactly what sm2_step computes."""
+    import random
+    from app.services.spaced_repetition import INITIAL_EF, _quality_from_attempt, sm2_step
+
+    rng = random.Random(7)
+    state = {c.id: (INITIAL_EF, 0, 0) for c in sample_characters}
+    for _ in range(200):
+        char_id = rng.choice(list(state))
+        is_correct = rng.random() < 0.8
+        first = rng.random() < 0.7
+        progress = update_mastery(db, sample_user.id, char_id, is_correct, is_first_attempt=first)
+        state[char_id] = sm2_step(*state[char_id], _quality_from_attempt(is_correct, first))
+        ef, interval, reps = state[char_id]
+        assert (progress.easiness_factor, progress.sm2_interval, progress.sm2_repetitions) == (ef, interval, reps)
+        assert progress.next_review_date == date.today() + timedelta(days=interval)
+
+
+def test_upsert_rounds_ties_like_python(db, sample_user, sample_characters):
+    char = sample_characters[0]
+    update_mastery(db, sample_user.id, char.id, is_correct=True)
+    db.query(UserCharacterProgress).update({"sm2_interval": 5, "sm2_repetitions": 2, "easiness_factor": 2.5})
+    progress = update_mastery(db, sample_user.id, char.id, is_correct=True)
+    assert progress.sm2_interval == round(5 * 2.5) == 12
+
+
+def test_interval_is_capped_on_long_streaks(db, sample_user, sample_characters):
+    from app.services.spaced_repetition import MAX_INTERVAL
+
+    char = sample_characters[0]
+    update_mastery(db, sample_user.id, char.id, is_correct=True)
+    db.query(UserCharacterProgress).update({"sm2_interval": MAX_INTERVAL - 10, "sm2_repetitions": 20})
+    progress = update_mastery(db, sample_user.id, char.id, is_correct=True)
+    assert progress.sm2_interval == MAX_INTERVAL
+    assert progress.next_review_date == date.today() + timedelta(days=MAX_INTERVAL)
+
+
+def test_loaded_progress_is_refreshed_after_upsert(db, sample_user, sample_characters):
+    char = sample_characters[0]
+    update_mastery(db, sample_user.id, char.id, is_correct=True)
+    loaded = db.query(UserCharacterProgress).filter_by(user_id=sample_user.id, character_id=char.id).one()
+    assert loaded.correct_count == 1
+    update_mastery(db, sample_user.id, char.id, is_correct=True)
+    assert loaded.correct_count == 2
@@ -0,0 +1,181 @@
+from sqlalchemy import event
+
+from app.models.store import StoreItem, UserInventory
+from app.services import store_catalog
+from app.services.store_catalog import STORE_SEED, get_catalog, reconcile_store_seed
+from tests.test_route_flow_regressions import _build_client
+
+
+def test_reconcile_inserts_missing_and_fixes_drift(db):
+    db.add(StoreItem(key="car_fire_truck", name="Old Name", category="car_skin", price_coins=99))
+    db.commit()
+
+    changed = reconcile_store_seed(db)
+    assert changed == len(STORE_SEED)
+    truck = db.query(StoreItem).filter_by(key="car_fire_truck").one()
+    assert truck.name == "Fire Truck" and truck.price_coins == 2
+
+    assert reconcile_store_seed(db) == 0
+    assert db.query(StoreItem).count() == len(STORE_SEED)
+
+
+def test_catalog_is_cached_until_version_bump(db):
+    reconcile_store_seed(db)
+    first = get_catalog(db)
+    assert get_catalog(db) is first
+    assert [cat for cat, _ in first.by_category] == ["background", "car_skin", "trail_effect"]
+
+    store_catalog.bump_catalog_version()
+    assert get_catalog(db) is not first
+
+
+def test_store_page_only_queries_inventory_once_cached():
+    client, SessionLocal, user_id = _build_client(with_characters=False)
+    client.post("/login", data={"user_id": user_id}, follow_redirects=False)
+    assert client.get("/game/store/").status_code == 200  # warms the cache
+
+    engine = SessionLocal.kw["bind"]
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        resp = client.get("/game/store/")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert resp.status_code == 200
+    assert not any("store_items" in s for s in statements)
+    assert not any(s.lstrip().upper().startswith(("INSERT", "UPDATE")) for s in statements)
+
+
+def test_buy_and_equip_use_catalog():
+    client, SessionLocal, user_id = _build_client(with_characters=False)
+    db = SessionLocal()
+    from app.models.user import User
+    db.query(User).filter_by(id=user_id).one().coins = 5
+    db.commit()
+    db.close()
+
+    client.post("/login", data={"user_id": user_id}, follow_redirects=False)
+    resp = client.post("/game/store/buy", json={"item_key": "trail_fire"})
+    assert resp.status_code == 200
+    assert resp.json()["coins"] == 3
+
+    resp = client.post("/game/store/equip", json={"item_key": "trail_fire"})
+    assert resp.json()["category"] == "trail_effect"
+
+    assert client.post("/game/store/buy", json={"item_key": "nope"}).status_code == 404
+
+    db = SessionLocal()
+    assert db.query(UserInventory).filter_by(user_id=user_id).count() == 1
+    db.close()
+
+
+def _build_file_client(tmp_path, coins: int):
+    """App + file-backed SQLite so parallel requests get real connections."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from starlette.testclient import TestClient
+
+    from app.database import Base, get_db
+    from app.main import create_app
+    from app.models.user import User
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'store.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(name="Tap Kid", pin="0000", age=8, theme="racing", role="child", coins=coins)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    reconcile_store_seed(db)
+    db.close()
+
+    app = create_app()
+
+    def override_get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app, raise_server_exceptions=False)
+    client.post("/login", data={"user_id": user_id}, follow_redirects=False)
+    return client, SessionLocal, user_id
+
+
+def _parallel(n, fn):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return list(pool.map(fn, range(n)))
+
+
+def _assert_ledger_matches_balance(SessionLocal, user_id, starting_coins):
+    from app.models.rewards import PointsLedger
+    from app.models.user import User
+
+    db = SessionLocal()
+    user = db.query(User).filter_by(id=user_id).one()
+    spent = sum(-e.coins_change for e in db.query(PointsLedger).filter_by(user_id=user_id).all())
+    assert user.coins >= 0
+    assert user.coins == starting_coins - spent
+    db.close()
+    return user
+
+
+def test_concurrent_purchases_of_same_item_spend_once(tmp_path):
+    client, SessionLocal, user_id = _build_file_client(tmp_path, coins=10)
+
+    responses = _parallel(12, lambda _: client.post("/game/store/buy", json={"item_key": "bg_underwater"}))
+
+    assert sum(r.status_code == 200 for r in responses) == 1
+    user = _assert_ledger_matches_balance(SessionLocal, user_id, 10)
+    assert user.coins == 5
+    db = SessionLocal()
+    assert db.query(UserInventory).filter_by(user_id=user_id, item_key="bg_underwater").count() == 1
+    db.close()
+
+
+def test_concurrent_streak_freezes_never_overdraw(tmp_path):
+    client, SessionLocal, user_id = _build_file_client(tmp_path, coins=3)
+
+    responses = _parallel(10, lambda _: client.post("/game/buy-streak-freeze"))
+
+    successes = sum(r.status_code == 200 for r in responses)
+    user = _assert_ledger_matches_balance(SessionLocal, user_id, 3)
+    assert successes == 3 - user.coins
+    assert user.streak_freezes == successes
+
+
+def test_idempotency_key_replays_purchase(tmp_path):
+    client, SessionLocal, user_id = _build_file_client(tmp_path, coins=10)
+    headers = {"Idempotency-Key": "tap-1"}
+
+    responses = _parallel(
+        8, lambda _: client.post("/game/store/buy", json={"item_key": "trail_fire"}, headers=headers)
+    )
+    ok = [r.json() for r in responses if r.status_code == 200]
+    assert ok and all(body == ok[0] for body in ok)
+    assert ok[0]["coins"] == 8
+
+    replay = client.post("/game/store/buy", json={"item_key": "trail_fire"}, headers=headers)
+    assert replay.status_code == 200
+    assert replay.json() == ok[0]
+
+    freeze = client.post("/game/buy-streak-freeze", headers={"Idempotency-Key": "freeze-1"})
+    again = client.post("/game/buy-streak-freeze", headers={"Idempotency-Key": "freeze-1"})
+    assert freeze.json() == again.json()
+
+    user = _assert_ledger_matches_balance(SessionLocal, user_id, 10)
+    assert user.coins == 7
+    assert user.streak_freezes == 1
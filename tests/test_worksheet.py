@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+
+from app.models.character import Character
+from app.models.progress import UserCharacterProgress
+from app.models.user import User
+from app.routes.dashboard import templates
+from app.services.worksheet import WORKSHEET_GAMES, build_worksheet
+
+
+def _render(sheet) -> str:
+    return "".join(templates.env.get_template("worksheet.html").stream(sheet=sheet))
+
+
+def test_sections_record_their_answer_key(db, sample_characters):
+    child = User(name="Reader", pin="0000", age=8, role="child")
+    db.add(child)
+    db.commit()
+    sheet = build_worksheet(db, child, 6, WORKSHEET_GAMES, seed=1)
+    items = {section.game_type: list(section) for section in sheet.sections}
+    assert [len(items[g]) for g in WORKSHEET_GAMES] == [6, 6, 6, 6]
+    for section in sheet.sections:
+        assert section.answers == [item.answer for item in items[section.game_type]]
+    for item in items["math"] + items["chinese"]:
+        assert "ABC".index(item.answer) < len(item.options)
+
+
+def test_chinese_items_follow_the_review_queue(db, sample_user, sample_characters):
+    today = date.today()
+    db.add_all([
+        UserCharacterProgress(user_id=sample_user.id, character_id=sample_characters[0].id,
+                              next_review_date=today + timedelta(days=30)),
+        UserCharacterProgress(user_id=sample_user.id, character_id=sample_characters[1].id,
+                              next_review_date=today - timedelta(days=2)),
+    ])
+    db.commit()
+    chinese = build_worksheet(db, sample_user, 10, ["chinese"], seed=1).sections[0]
+    prompts = [item.prompt for item in chinese]
+    assert prompts[0] == sample_characters[1].character   # overdue first
+    assert prompts[-1] == sample_characters[0].character  # not due for a month, last
+    # Pre-readers match pictures
+    assert all(item.images and len(set(item.options)) == 3 for item in chinese)
+
+
+def test_confusable_distractors_fall_back_to_the_whole_pool(db, sample_user):
+    # "dog" is confusable with "cat", leaving a single non-confusable distractor
+    db.add_all([
+        Character(character=char, pinyin=pinyin, meaning=meaning, difficulty=1,
+                  image_url=f"/static/images/chars/{meaning}.svg", target_users="all")
+        for char, pinyin, meaning in [("猫", "māo", "cat"), ("狗", "gǒu", "dog"), ("火", "huǒ", "fire")]
+    ])
+    db.commit()
+    items = list(build_worksheet(db, sample_user, 3, ["chinese"], seed=1).sections[0])
+    assert len(items) == 3
+    assert all(len(set(item.options)) == 3 for item in items)
+
+
+def test_five_hundred_questions_render(db, sample_characters):
+    child = User(name="Reader", pin="0000", age=9, role="child")
+    db.add(child)
+    db.commit()
+    html = _render(build_worksheet(db, child, 125, ["math", "logic", "english", "math"], seed=0))
+    assert html.count('<div class="num">') == 500